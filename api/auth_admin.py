@@ -1,27 +1,40 @@
-from fastapi import APIRouter, HTTPException, status, Request, Response
+from fastapi import APIRouter, HTTPException, status, Request, Response, Depends
 from schemas.auth import EmailRequest, CodeVerifyRequest, RegisterRequest
 from services.email_verification import email_service
 from services.admin import KeycloakAdminService
 from services.jwt_verification import token_verifier
+from services.rate_limit import send_code_rate_limit, verify_code_rate_limit
+from services.revocation import revocation_index
+from services.session_store import session_store
+from config.fastapi import SESSION_COOKIE_NAME
+from redis.exceptions import RedisError
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Auth Admin"])
 
 
-@router.post("/send-code", summary="Send verification code to email")
-def send_code(data: EmailRequest):
-    ttl = email_service.send_verification_code(data.email)
+@router.post(
+    "/send-code",
+    summary="Send verification code to email",
+    dependencies=[Depends(send_code_rate_limit)],
+)
+async def send_code(data: EmailRequest):
+    ttl = await email_service.send_verification_code_async(data.email)
     return {
         "message": f"A verification code has been sent to {data.email}.",
         "ttl_seconds": ttl,
     }
 
 
-@router.post("/verify-code", summary="Verify email code")
-def verify_code(data: CodeVerifyRequest):
-    success, remaining = email_service.verify_code(data.email, data.code)
+@router.post(
+    "/verify-code",
+    summary="Verify email code",
+    dependencies=[Depends(verify_code_rate_limit)],
+)
+async def verify_code(data: CodeVerifyRequest):
+    success, remaining = await email_service.verify_code_async(data.email, data.code)
 
     if success:
-        email_service.mark_verified(data.email)
+        await email_service.mark_verified_async(data.email)
         return {"message": "Email verification successful"}
 
     if remaining is None:
@@ -44,14 +57,14 @@ def verify_code(data: CodeVerifyRequest):
 
 
 @router.post("/register", summary="Register user (after email verification)")
-def register(data: RegisterRequest):
-    if not email_service.is_verified(data.email):
+async def register(data: RegisterRequest):
+    if not await email_service.is_verified_async(data.email):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="EMAIL_NOT_VERIFIED",
         )
 
-    user_id = KeycloakAdminService.create_user(
+    user_id = await KeycloakAdminService.create_user_async(
         username=data.username,
         email=data.email,
         password=data.password,
@@ -73,18 +86,33 @@ async def delete_user(username: str, request: Request, response: Response):
     payload = await token_verifier.get_valid_token_payload(request, response)
     current_username = payload.get("preferred_username")
 
-    # 2. 본인 확인
+    # 2. 본인 확인. 탈퇴는 기본 realm에서만 처리하므로 다른 realm의 토큰은 거부
+    if not token_verifier.is_default_realm(payload):
+        raise HTTPException(status_code=403, detail="REALM_NOT_ALLOWED")
     if current_username != username:
         raise HTTPException(status_code=403, detail="Can only delete your own account")
 
     try:
         # 3. Keycloak에서 사용자 삭제
-        KeycloakAdminService.delete_user_by_username(username)
-
-        # 4. 로그아웃 처리 (쿠키 삭제)
-        response.delete_cookie("access_token")
-        response.delete_cookie("refresh_token")
-
-        return {"status": "success", "message": f"User '{username}' deleted and logged out."}
+        await KeycloakAdminService.delete_user_by_username_async(username, user_id=payload["sub"])
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"USER_DELETE_FAILED: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"USER_DELETE_FAILED: {str(e)}")
+
+    # 4. 이미 발급된 토큰 무효화. 삭제는 끝났으므로 실패해도 응답은 성공 (이 워커에는 이미 반영됨)
+    try:
+        await revocation_index.revoke("sub", payload["sub"])
+    except RedisError as e:
+        print(f"[revoke after delete failed] {e}")
+
+    # 5. 로그아웃 처리 (세션, 쿠키 삭제)
+    session_id = request.cookies.get(SESSION_COOKIE_NAME)
+    if session_id:
+        try:
+            await session_store.delete(session_id)
+        except RedisError as e:
+            print(f"[session delete failed] {e}")
+        session_store.delete_cookie(response)
+    response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token")
+
+    return {"status": "success", "message": f"User '{username}' deleted and logged out."}
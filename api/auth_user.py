@@ -1,43 +1,71 @@
-from fastapi import APIRouter, HTTPException, status, Response, Request
+from fastapi import APIRouter, HTTPException, status, Response, Request, Depends
 from schemas.auth import LoginRequest
 from services.user import KeycloakUserService
+from services.rate_limit import login_rate_limit
+from services.revocation import revocation_index
+from services.session_store import session_store, session_mode_enabled
+from services.jwt_verification import token_verifier
+from config.fastapi import SESSION_COOKIE_NAME
+from services.resilience import CircuitOpenError
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Auth User"])
 
 
-@router.post("/login", summary="Login with username and password")
-def login(data: LoginRequest, response: Response):
+@router.post(
+    "/login",
+    summary="Login with username and password",
+    dependencies=[Depends(login_rate_limit)],
+)
+async def login(data: LoginRequest, response: Response):
     try:
-        token = KeycloakUserService.login(data.username, data.password)
-        # TODO Need to change secure and samesite settings when you publish
-        response.set_cookie(
-            key="access_token",
-            value=token["access_token"],
-            httponly=True,
-            secure=False,
-            samesite="Lax",
-            max_age=token["expires_in"],
-        )
-        response.set_cookie(
-            key="refresh_token",
-            value=token["refresh_token"],
-            httponly=True,
-            secure=False,
-            samesite="Lax",
-            max_age=token["refresh_expires_in"],
-        )
+        token = await KeycloakUserService.login_async(data.username, data.password)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"INVALID_CREDENTIALS {str(e)}",
         )
 
+    if session_mode_enabled():
+        # 세션 모드: JWT는 Redis 세션 저장소에 두고 쿠키에는 짧은 세션 ID만 저장
+        claims = await token_verifier.verify(token["access_token"])
+        session_id = await session_store.create(token, claims)
+        session_store.set_cookie(response, session_id, max_age=token["refresh_expires_in"])
+        return
+
+    # TODO Need to change secure and samesite settings when you publish
+    response.set_cookie(
+        key="access_token",
+        value=token["access_token"],
+        httponly=True,
+        secure=False,
+        samesite="Lax",
+        max_age=token["expires_in"],
+    )
+    response.set_cookie(
+        key="refresh_token",
+        value=token["refresh_token"],
+        httponly=True,
+        secure=False,
+        samesite="Lax",
+        max_age=token["refresh_expires_in"],
+    )
+
 
 @router.post("/logout", summary="Logout user by clearing tokens")
-def logout(response: Response, request: Request):
+async def logout(response: Response, request: Request):
     refresh_token = request.cookies.get("refresh_token")
+    session_id = request.cookies.get(SESSION_COOKIE_NAME)
+    if session_id:
+        record = await session_store.delete(session_id)
+        if record:
+            refresh_token = record["refresh_token"]
+        session_store.delete_cookie(response)
     if refresh_token:
-        KeycloakUserService.logout(refresh_token)
+        if await KeycloakUserService.logout_async(refresh_token):
+            # 아직 만료되지 않은 access token도 즉시 무효화
+            await revocation_index.revoke_refresh_token_session(refresh_token)
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     return {"status": "success", "message": "Logged out successfully"}
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Response, status
+from services.readiness import readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live", summary="Process liveness")
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", summary="Readiness including Keycloak warm-up")
+async def ready(response: Response):
+    result = readiness.status()
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
@@ -1,17 +1,35 @@
-from fastapi import APIRouter, Request, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException
 from services.oauth import KeycloakOAuthService
+from services.oauth_state import oauth_state_store
 from schemas.oauth import OAuthCallbackRequest
+from services.resilience import CircuitOpenError
 
-router = APIRouter()
+router = APIRouter(prefix="/api/v1/auth/oauth", tags=["OAuth"])
 oauth_service = KeycloakOAuthService()
 
 
-@router.post("/auth/oauth/callback")
+@router.get("/authorize", summary="Start OAuth login (state + PKCE)")
+async def oauth_authorize(redirect_uri: str, idp_hint: Optional[str] = None):
+    state = await oauth_state_store.create(redirect_uri)
+    return {
+        "authorization_url": oauth_service.authorization_url(state, idp_hint),
+        "state": state["state"],
+    }
+
+
+@router.post("/callback", summary="Complete OAuth login")
 async def oauth_callback(req: OAuthCallbackRequest):
+    # state는 한 번만 사용 가능, authorize 때와 같은 redirect_uri여야 함
+    state = await oauth_state_store.consume(req.state)
+    if state is None or state["redirect_uri"] != req.redirect_uri:
+        raise HTTPException(status_code=400, detail="INVALID_OAUTH_STATE")
+
     try:
-        token = oauth_service.exchange_code_for_token(req.code, req.redirect_uri)
-        user_info = oauth_service.get_user_info(token["access_token"])
-        # DB 처리 또는 세션 처리 등 추가 로직 필요
-        return {"access_token": token["access_token"], "user": user_info}
+        token, user_info = await oauth_service.complete_login_async(req.code, state)
+    except (HTTPException, CircuitOpenError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    # DB 처리 또는 세션 처리 등 추가 로직 필요
+    return {"access_token": token["access_token"], "user": user_info}
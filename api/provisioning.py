@@ -0,0 +1,54 @@
+import json
+from typing import AsyncIterator, Literal
+from fastapi import APIRouter, Request, Depends, Query
+from fastapi.responses import StreamingResponse
+from services.keycloak_api_key_verification import require_api_key
+from services.api_keys import SCOPE_USERS_PROVISION
+from services.provisioning import (
+    ProvisioningJob,
+    iter_lines,
+    parse_rows,
+    load_checkpoint,
+    MODE_USERS,
+)
+from config.fastapi import PROVISIONING_CONCURRENCY, PROVISIONING_MAX_CONCURRENCY
+
+router = APIRouter(prefix="/api/v1/provisioning", tags=["Provisioning"])
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    # 응답을 보내는 동안에도 요청 본문을 계속 읽으므로 disconnect 감시용 receive()를 호출하지 않음
+    # (연결이 끊기면 request.stream()에서 ClientDisconnect 발생)
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _ndjson(records: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for record in records:
+        yield json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+@router.post(
+    "/users",
+    summary="Bulk create users from an NDJSON or CSV stream",
+    dependencies=[Depends(require_api_key(SCOPE_USERS_PROVISION))],
+)
+async def provision_users(
+    request: Request,
+    mode: Literal["users", "partial-import"] = MODE_USERS,
+    on_conflict: Literal["skip", "overwrite", "fail"] = "skip",
+    concurrency: int = Query(PROVISIONING_CONCURRENCY, ge=1, le=PROVISIONING_MAX_CONCURRENCY),
+    skip: int | None = Query(None, ge=0),
+    job_id: str | None = Query(None, max_length=64, pattern=r"^[\w.-]+$"),
+):
+    # skip이 없으면 job_id로 저장된 체크포인트부터 재개
+    if skip is None:
+        skip = await load_checkpoint(job_id) if job_id else 0
+    fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    job = ProvisioningJob(
+        mode=mode, on_conflict=on_conflict, concurrency=concurrency, skip=skip, job_id=job_id
+    )
+    rows = parse_rows(iter_lines(request.stream()), fmt)
+    return DuplexStreamingResponse(_ndjson(job.run(rows)), media_type="application/x-ndjson")
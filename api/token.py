@@ -1,13 +1,24 @@
 from fastapi import APIRouter, HTTPException, Response, Request, Depends
 from services.jwt_verification import token_verifier
-from services.keycloak_api_key_verification import verify_api_key
+from services.keycloak_api_key_verification import require_api_key
+from services.api_keys import SCOPE_JWKS_READ, SCOPE_TOKEN_VERIFY, SCOPE_STATS_READ
+from services.token_cache import token_cache
+from services.session_store import session_mode_enabled
+from services.resilience import CircuitOpenError
+from schemas.token import TokenBatchVerifyRequest
 from typing import Optional
-from config.keycloak import settings
-import requests
+from config.fastapi import TOKEN_BATCH_MAX_SIZE, SESSION_COOKIE_NAME, JWKS_PUBLIC_MAX_AGE
+import httpx
 
 router = APIRouter(prefix="/api/v1/token", tags=["Token"])
 
 
+def realm_name(payload: dict) -> str | None:
+    # 다중 realm에서 같은 username을 구분할 수 있도록 issuer의 realm 이름도 반환
+    issuer = payload.get("iss")
+    return issuer.rsplit("/realms/", 1)[-1] if issuer else None
+
+
 @router.get("/verify", summary="Verify access token only")
 async def verify_token_only(
     request: Request,
@@ -18,6 +29,8 @@ async def verify_token_only(
         "status": "success",
         "preferred_username": payload.get("preferred_username"),
         "sub": payload.get("sub"),
+        "iss": payload.get("iss"),
+        "realm": realm_name(payload),
     }
 
 
@@ -33,18 +46,52 @@ async def verify_token_and_username(
         "status": "success",
         "verified_username": payload.get("preferred_username"),
         "sub": payload.get("sub"),
+        "iss": payload.get("iss"),
+        "realm": realm_name(payload),
+    }
+
+
+@router.post(
+    "/verify/batch",
+    summary="Verify multiple access tokens at once",
+    dependencies=[Depends(require_api_key(SCOPE_TOKEN_VERIFY))],
+)
+async def verify_tokens_batch(data: TokenBatchVerifyRequest):
+    if len(data.tokens) > TOKEN_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"BATCH_TOO_LARGE: max {TOKEN_BATCH_MAX_SIZE} tokens",
+        )
+
+    results = await token_verifier.verify_many(data.tokens, data.audience, data.parallel)
+    items = []
+    for index, result in enumerate(results):
+        if isinstance(result, HTTPException):
+            items.append({"index": index, "valid": False, "error": result.detail})
+        else:
+            items.append({"index": index, "valid": True, "claims": result})
+    return {
+        "status": "success",
+        "valid_count": sum(1 for item in items if item["valid"]),
+        "results": items,
     }
 
 
 @router.post("/refresh", summary="Issue new tokens with refresh token")
 async def refresh_tokens(request: Request):
+    session_id: Optional[str] = request.cookies.get(SESSION_COOKIE_NAME)
+    if session_mode_enabled() and session_id:
+        # 세션 모드: 토큰은 서버에만 두고 갱신 결과(만료 시각)만 반환
+        record = await token_verifier.refresh_session(session_id, force=True)
+        return {"status": "success", "expires_at": record["claims"].get("exp")}
+
     refresh_token: Optional[str] = request.cookies.get("refresh_token")
 
     if not refresh_token:
         raise HTTPException(status_code=401, detail="NO_REFRESH_TOKEN")
 
     try:
-        new_tokens = token_verifier.try_refresh(refresh_token)
+        new_tokens = await token_verifier.try_refresh(refresh_token)
         return {
             "status": "success",
             "access_token": new_tokens["access_token"],
@@ -52,23 +99,46 @@ async def refresh_tokens(request: Request):
         }
     except HTTPException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except CircuitOpenError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"UNKNOWN_ERROR: {str(e)}")
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교: W/ 접두사는 무시
+    candidates = (value.strip().removeprefix("W/") for value in if_none_match.split(","))
+    return etag in candidates
+
+
 @router.get(
     "/public-key",
     summary="Provide JWT public keys",
-    dependencies=[Depends(verify_api_key)],
+    dependencies=[Depends(require_api_key(SCOPE_JWKS_READ))],
 )
-def get_public_jwks():
+async def get_public_jwks(request: Request):
+    # Keycloak을 거치지 않고 TokenVerifier의 JWKS 캐시에서 미리 직렬화된 본문을 반환
     try:
-        response = requests.get(
-            f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/certs"
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException:
+        body, etag = await token_verifier.jwks_cache.get_serialized()
+    except (httpx.HTTPError, ValueError):
         raise HTTPException(
             status_code=502, detail="Failed to fetch JWKs from Keycloak"
         )
+
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={JWKS_PUBLIC_MAX_AGE}"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/cache/stats",
+    summary="Verified-token cache statistics",
+    dependencies=[Depends(require_api_key(SCOPE_STATS_READ))],
+)
+async def get_token_cache_stats():
+    return token_cache.stats()
@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+import uuid
+from urllib.parse import parse_qs, urlencode
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import RedirectResponse
+from jose import JWTError, jwt
+
+# 벤치마크용 Keycloak 대역: RS256 토큰 발급, JWKS, token/refresh/logout, 최소한의 admin API
+LATENCY_MS = float(os.getenv("FAKE_OIDC_LATENCY_MS", "0"))
+ACCESS_TOKEN_TTL = int(os.getenv("FAKE_OIDC_ACCESS_TOKEN_TTL", "300"))
+REFRESH_TOKEN_TTL = int(os.getenv("FAKE_OIDC_REFRESH_TOKEN_TTL", "1800"))
+KID = "fake-oidc-key"
+
+_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_public_key = _private_key.public_key()
+
+
+def _b64url(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64url_uint(value: int) -> str:
+    return _b64url(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+_HEADER = _b64url(json.dumps({"alg": "RS256", "kid": KID, "typ": "JWT"}).encode())
+
+
+_numbers = _public_key.public_numbers()
+JWKS = {
+    "keys": [
+        {
+            "kid": KID,
+            "kty": "RSA",
+            "alg": "RS256",
+            "use": "sig",
+            "n": _b64url_uint(_numbers.n),
+            "e": _b64url_uint(_numbers.e),
+        }
+    ]
+}
+
+app = FastAPI()
+users: dict[str, dict] = {}
+# authorization code -> authorize 요청 정보 (nonce, PKCE code_challenge 등)
+codes: dict[str, dict] = {}
+# 동시에 처리 중인 요청 수와 최댓값 (인증 서버가 Keycloak 호출을 몇 개까지 겹쳐 보내는지 확인용)
+inflight = {"current": 0, "peak": 0}
+
+
+@app.middleware("http")
+async def track_inflight(request: Request, call_next):
+    if request.url.path.startswith("/_bench"):
+        return await call_next(request)
+    inflight["current"] += 1
+    inflight["peak"] = max(inflight["peak"], inflight["current"])
+    try:
+        return await call_next(request)
+    finally:
+        inflight["current"] -= 1
+
+
+@app.post("/_bench/inflight/reset")
+async def reset_inflight():
+    # 최댓값을 돌려주고 0으로 초기화
+    peak, inflight["peak"] = inflight["peak"], inflight["current"]
+    return {"peak": peak}
+
+
+async def _delay() -> None:
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+
+
+def _issuer(request: Request, realm: str) -> str:
+    return f"{str(request.base_url).rstrip('/')}/realms/{realm}"
+
+
+# 키 객체로 직접 서명해 대역 서버가 병목이 되지 않도록 함
+def _sign(claims: dict) -> str:
+    signing_input = f"{_HEADER}.{_b64url(json.dumps(claims).encode())}"
+    signature = _private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{_b64url(signature)}"
+
+
+def _verify(token: str) -> dict:
+    signing_input, _, signature = token.rpartition(".")
+    _public_key.verify(
+        base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4)),
+        signing_input.encode(),
+        padding.PKCS1v15(),
+        hashes.SHA256(),
+    )
+    return jwt.get_unverified_claims(token)
+
+
+def _issue_tokens(
+    request: Request,
+    realm: str,
+    username: str,
+    sid: str | None = None,
+    client_id: str | None = None,
+    nonce: str | None = None,
+) -> dict:
+    now = int(time.time())
+    sid = sid or uuid.uuid4().hex
+    issuer = _issuer(request, realm)
+    common = {"iss": issuer, "sub": f"sub-{username}", "sid": sid, "iat": now}
+    access_token = _sign(
+        {
+            **common,
+            "jti": uuid.uuid4().hex,
+            "exp": now + ACCESS_TOKEN_TTL,
+            "aud": "account",
+            "typ": "Bearer",
+            "preferred_username": username,
+        }
+    )
+    refresh_token = _sign(
+        {
+            **common,
+            "jti": uuid.uuid4().hex,
+            "exp": now + REFRESH_TOKEN_TTL,
+            "aud": issuer,
+            "typ": "Refresh",
+            "preferred_username": username,
+        }
+    )
+    tokens = {
+        "access_token": access_token,
+        "expires_in": ACCESS_TOKEN_TTL,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": REFRESH_TOKEN_TTL,
+        "token_type": "Bearer",
+        "session_state": sid,
+        "scope": "openid profile email",
+    }
+    if client_id:
+        # scope=openid 요청에만 id_token 발급 (aud는 client_id)
+        id_claims = {
+            **common,
+            "exp": now + ACCESS_TOKEN_TTL,
+            "aud": client_id,
+            "typ": "ID",
+            "preferred_username": username,
+            "email": f"{username}@example.com",
+            "email_verified": True,
+        }
+        if nonce:
+            id_claims["nonce"] = nonce
+        tokens["id_token"] = _sign(id_claims)
+    return tokens
+
+
+@app.get("/realms/{realm}/protocol/openid-connect/certs")
+async def certs():
+    await _delay()
+    return JWKS
+
+
+@app.post("/realms/{realm}/protocol/openid-connect/token")
+async def token(realm: str, request: Request):
+    await _delay()
+    # python-multipart 없이 form 본문 파싱
+    form = {k: v[0] for k, v in parse_qs((await request.body()).decode()).items()}
+    grant_type = form.get("grant_type")
+    username = form.get("username")
+    refresh_token = form.get("refresh_token")
+    code = form.get("code")
+    if grant_type == "password":
+        client_id = form.get("client_id") if "openid" in form.get("scope", "") else None
+        return _issue_tokens(request, realm, username or "anonymous", client_id=client_id)
+    if grant_type == "refresh_token":
+        try:
+            claims = _verify(refresh_token or "")
+        except (InvalidSignature, JWTError, ValueError):
+            raise HTTPException(status_code=400, detail="invalid_grant")
+        return _issue_tokens(request, realm, claims["preferred_username"], claims["sid"])
+    if grant_type == "authorization_code":
+        grant = codes.pop(code or "", None)
+        if grant is None or grant["redirect_uri"] != form.get("redirect_uri"):
+            raise HTTPException(status_code=400, detail="invalid_grant")
+        if grant["code_challenge"]:
+            verifier = form.get("code_verifier", "")
+            challenge = _b64url(hashlib.sha256(verifier.encode()).digest())
+            if challenge != grant["code_challenge"]:
+                raise HTTPException(status_code=400, detail="invalid_grant")
+        client_id = form.get("client_id") if "openid" in grant["scope"] else None
+        return _issue_tokens(
+            request, realm, f"oauth-{code[:8]}", client_id=client_id, nonce=grant["nonce"]
+        )
+    raise HTTPException(status_code=400, detail="unsupported_grant_type")
+
+
+@app.get("/realms/{realm}/protocol/openid-connect/auth")
+async def authorize(request: Request):
+    # 로그인 화면 없이 바로 code를 붙여 redirect_uri로 돌려보냄
+    await _delay()
+    params = request.query_params
+    code = uuid.uuid4().hex
+    codes[code] = {
+        "redirect_uri": params.get("redirect_uri"),
+        "scope": params.get("scope", ""),
+        "nonce": params.get("nonce"),
+        "code_challenge": params.get("code_challenge"),
+    }
+    query = urlencode({"code": code, "state": params.get("state", "")})
+    return RedirectResponse(f"{params.get('redirect_uri')}?{query}", status_code=302)
+
+
+@app.post("/realms/{realm}/protocol/openid-connect/logout")
+async def logout():
+    await _delay()
+    return Response(status_code=204)
+
+
+@app.get("/realms/{realm}/protocol/openid-connect/userinfo")
+async def userinfo(request: Request):
+    await _delay()
+    token = request.headers.get("authorization", "").removeprefix("Bearer ")
+    claims = jwt.get_unverified_claims(token)
+    return {"sub": claims["sub"], "preferred_username": claims["preferred_username"]}
+
+
+@app.post("/admin/realms/{realm}/users")
+async def create_user(realm: str, request: Request):
+    await _delay()
+    data = await request.json()
+    if data["username"] in users:
+        raise HTTPException(status_code=409, detail="User exists with same username")
+    user_id = str(uuid.uuid4())
+    users[data["username"]] = {"id": user_id, **data}
+    return Response(
+        status_code=201,
+        headers={"Location": f"{str(request.base_url).rstrip('/')}/admin/realms/{realm}/users/{user_id}"},
+    )
+
+
+@app.get("/admin/realms/{realm}/users")
+async def get_users(username: str | None = None):
+    await _delay()
+    user = users.get(username or "")
+    return [{"id": user["id"], "username": username}] if user else []
+
+
+@app.put("/admin/realms/{realm}/users/{user_id}")
+async def update_user(user_id: str, request: Request):
+    await _delay()
+    data = await request.json()
+    for username, user in users.items():
+        if user["id"] == user_id:
+            user.update(data)
+            return Response(status_code=204)
+    raise HTTPException(status_code=404, detail="User not found")
+
+
+@app.post("/admin/realms/{realm}/partialImport")
+async def partial_import(request: Request):
+    await _delay()
+    data = await request.json()
+    policy = data.get("ifResourceExists", "FAIL")
+    results = []
+    for user in data.get("users", []):
+        username = user["username"].lower()
+        existing = users.get(username)
+        if existing and policy == "FAIL":
+            raise HTTPException(status_code=409, detail=f"User '{username}' already exists")
+        if existing and policy == "SKIP":
+            action = "SKIPPED"
+        else:
+            action = "OVERWRITTEN" if existing else "ADDED"
+            users[username] = {"id": existing["id"] if existing else str(uuid.uuid4()), **user}
+        results.append(
+            {"action": action, "resourceType": "USER", "resourceName": username, "id": users[username]["id"]}
+        )
+    counts = {action: sum(r["action"] == action for r in results) for action in ("ADDED", "SKIPPED", "OVERWRITTEN")}
+    return {
+        "added": counts["ADDED"],
+        "skipped": counts["SKIPPED"],
+        "overwritten": counts["OVERWRITTEN"],
+        "results": results,
+    }
+
+
+@app.delete("/admin/realms/{realm}/users/{user_id}")
+async def delete_user(user_id: str):
+    await _delay()
+    for username, user in list(users.items()):
+        if user["id"] == user_id:
+            del users[username]
+            return Response(status_code=204)
+    raise HTTPException(status_code=404, detail="User not found")
+
+
+@app.get("/admin/realms/{realm}/roles/{role_name}")
+async def get_role(role_name: str):
+    await _delay()
+    return {"id": f"role-{role_name}", "name": role_name, "composite": False}
+
+
+@app.post("/admin/realms/{realm}/users/{user_id}/role-mappings/realm")
+async def assign_roles(user_id: str):
+    await _delay()
+    return Response(status_code=204)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Keycloak OIDC server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8180)
+    args = parser.parse_args()
+    # uvicorn 기본값(5초)이면 auth server가 재사용하려던 유휴 연결(HTTP_KEEPALIVE_EXPIRY=30)을
+    # 먼저 닫아 재시도 없는 POST(token)가 간헐적으로 실패함. Keycloak은 유휴 연결을 더 오래 유지
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", timeout_keep_alive=75)
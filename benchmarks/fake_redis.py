@@ -0,0 +1,20 @@
+import argparse
+from fakeredis import TcpFakeServer
+
+# 부하 생성기와 같은 프로세스(GIL)를 쓰지 않도록 fakeredis TCP 서버를 따로 실행
+
+
+def main():
+    parser = argparse.ArgumentParser(description="fakeredis TCP server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    # socketserver 기본 listen backlog(5)로는 동시 접속이 몰릴 때 연결이 reset됨
+    TcpFakeServer.request_queue_size = 1024
+    server = TcpFakeServer((args.host, args.port), server_type="redis")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
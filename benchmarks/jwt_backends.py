@@ -0,0 +1,119 @@
+import argparse
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 벤치마크는 Keycloak 없이 로컬에서 실행되므로 설정값은 더미로 채움
+os.environ.setdefault("KEYCLOAK_URL", "http://localhost:8080")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "bench")
+os.environ.setdefault("KEYCLOAK_ADMIN_USERNAME", "bench")
+os.environ.setdefault("KEYCLOAK_ADMIN_PASSWORD", "bench")
+os.environ.setdefault("KEYCLOAK_API_KEY", "bench")
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+from services.jwt_verification import JWT_BACKENDS, validate_claims
+
+KID = "bench-key"
+ISSUER = "http://localhost:8080/realms/bench"
+AUDIENCE = "account"
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def build_fixture(token_count: int) -> tuple[dict, list[str]]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_numbers = private_key.public_key().public_numbers()
+    key_data = {
+        "kid": KID,
+        "kty": "RSA",
+        "alg": "RS256",
+        "use": "sig",
+        "n": _b64url_uint(public_numbers.n),
+        "e": _b64url_uint(public_numbers.e),
+    }
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+    now = int(time.time())
+    tokens = [
+        jwt.encode(
+            {
+                "sub": f"user-{i}",
+                "preferred_username": f"user{i}",
+                "aud": AUDIENCE,
+                "iss": ISSUER,
+                "iat": now,
+                "exp": now + 3600,
+            },
+            pem,
+            algorithm="RS256",
+            headers={"kid": KID},
+        )
+        for i in range(token_count)
+    ]
+    return key_data, tokens
+
+
+def run_backend(name: str, key_data: dict, tokens: list[str], duration: float) -> float:
+    backend = JWT_BACKENDS[name]()
+    key = backend.load_key(key_data)
+
+    verified = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            claims = backend.verify_signature(token, key)
+            validate_claims(claims, AUDIENCE, ISSUER)
+        verified += len(tokens)
+    elapsed = time.perf_counter() - started
+    return verified / elapsed
+
+
+def run_legacy(key_data: dict, tokens: list[str], duration: float) -> float:
+    # 이전 방식: 매 호출마다 JWKS dict 전체를 jose.jwt.decode에 전달
+    jwks = {"keys": [key_data]}
+
+    verified = 0
+    started = time.perf_counter()
+    deadline = started + duration
+    while time.perf_counter() < deadline:
+        for token in tokens:
+            jwt.decode(token, jwks, algorithms=["RS256"], audience=AUDIENCE, issuer=ISSUER)
+        verified += len(tokens)
+    elapsed = time.perf_counter() - started
+    return verified / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JWT verification backend micro-benchmark")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per backend")
+    parser.add_argument("--tokens", type=int, default=100, help="distinct tokens to cycle")
+    parser.add_argument("--backend", choices=sorted(JWT_BACKENDS), action="append")
+    args = parser.parse_args()
+
+    key_data, tokens = build_fixture(args.tokens)
+    print(f"RS256 / 2048-bit key, single thread, {args.duration:.1f}s per backend")
+    rate = run_legacy(key_data, tokens, args.duration)
+    print(f"{'jose (raw JWKS)':>14}: {rate:10,.0f} tokens/sec/core")
+    for name in args.backend or sorted(JWT_BACKENDS):
+        rate = run_backend(name, key_data, tokens, args.duration)
+        print(f"{name:>14}: {rate:10,.0f} tokens/sec/core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from urllib.parse import parse_qs, urlsplit
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+REALM = "bench"
+PASSWORD = "bench-password"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_redis(port: int, timeout: float = 30) -> None:
+    import redis
+
+    client = redis.Redis(host="127.0.0.1", port=port)
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            try:
+                client.ping()
+                return
+            except redis.ConnectionError:
+                time.sleep(0.2)
+    finally:
+        client.close()
+    raise RuntimeError(f"Timed out waiting for fakeredis on port {port}")
+
+
+def preload_scripts(port: int) -> None:
+    # fakeredis TCP 서버는 오류 응답 후 연결을 끊어 EVALSHA -> NOSCRIPT -> SCRIPT LOAD 재시도가 실패함.
+    # 서버 Lua 스크립트를 미리 등록해 NOSCRIPT가 발생하지 않도록 함
+    import redis
+
+    sys.path.insert(0, ROOT)
+    from services.email_dispatch import PROMOTE_DUE_SCRIPT, REQUEUE_SCRIPT
+    from services.email_verification import VERIFY_CODE_SCRIPT
+    from services.rate_limit import TOKEN_BUCKET_SCRIPT
+    from services.session_store import CLAIM_DUE_SCRIPT
+    from services.single_flight import RELEASE_LOCK_SCRIPT
+
+    client = redis.Redis(host="127.0.0.1", port=port)
+    for script in (
+        PROMOTE_DUE_SCRIPT,
+        REQUEUE_SCRIPT,
+        VERIFY_CODE_SCRIPT,
+        TOKEN_BUCKET_SCRIPT,
+        CLAIM_DUE_SCRIPT,
+        RELEASE_LOCK_SCRIPT,
+    ):
+        client.script_load(script)
+    client.close()
+
+
+def start_process(args: list[str], env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env={**os.environ, **env},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_for(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def cookie_header(cookies: dict) -> dict:
+    return {"Cookie": "; ".join(f"{name}={value}" for name, value in cookies.items())}
+
+
+async def login(client: httpx.AsyncClient, username: str) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login", json={"username": username, "password": PASSWORD}
+    )
+    response.raise_for_status()
+    # cookie 모드는 access/refresh 토큰, session 모드는 session_id 쿠키
+    return dict(response.cookies)
+
+
+async def setup_session(client: httpx.AsyncClient, worker: int, redis) -> dict:
+    return await login(client, f"bench-user-{worker}")
+
+
+async def setup_none(client: httpx.AsyncClient, worker: int, redis) -> dict:
+    return {}
+
+
+async def request_verify(client: httpx.AsyncClient, worker: int, state: dict, redis) -> bool:
+    response = await client.get("/api/v1/token/verify", headers=cookie_header(state))
+    return response.status_code == 200
+
+
+async def request_login(client: httpx.AsyncClient, worker: int, state: dict, redis) -> bool:
+    response = await client.post(
+        "/api/v1/auth/login", json={"username": f"bench-user-{worker}", "password": PASSWORD}
+    )
+    return response.status_code == 200
+
+
+async def request_refresh(client: httpx.AsyncClient, worker: int, state: dict, redis) -> bool:
+    response = await client.post("/api/v1/token/refresh", headers=cookie_header(state))
+    if response.status_code != 200:
+        return False
+    data = response.json()
+    for name in ("access_token", "refresh_token"):
+        if name in data:
+            state[name] = data[name]
+    return True
+
+
+async def prepare_register(client: httpx.AsyncClient, worker: int, state: dict, redis) -> None:
+    # 이메일 인증 단계는 측정 대상이 아니므로 Redis에 인증 완료 표시를 직접 기록
+    state["username"] = f"bench-{uuid.uuid4().hex[:12]}"
+    await redis.set(f"verified_email:{state['username']}@example.com", "true", ex=600)
+
+
+async def request_register(client: httpx.AsyncClient, worker: int, state: dict, redis) -> bool:
+    username = state["username"]
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": username,
+            "email": f"{username}@example.com",
+            "password": PASSWORD,
+            "first_name": "Bench",
+            "last_name": "User",
+        },
+    )
+    return response.status_code == 200
+
+
+async def prepare_oauth(client: httpx.AsyncClient, worker: int, state: dict, redis) -> None:
+    # authorize -> (fake) Keycloak 로그인 -> redirect의 code/state. 측정 대상은 callback만
+    redirect_uri = "http://127.0.0.1/bench/callback"
+    response = await client.get(
+        "/api/v1/auth/oauth/authorize", params={"redirect_uri": redirect_uri}
+    )
+    response.raise_for_status()
+    redirect = await client.get(response.json()["authorization_url"])
+    params = parse_qs(urlsplit(redirect.headers["location"]).query)
+    state.update(
+        redirect_uri=redirect_uri, code=params["code"][0], state=params["state"][0]
+    )
+
+
+async def request_oauth(client: httpx.AsyncClient, worker: int, state: dict, redis) -> bool:
+    response = await client.post(
+        "/api/v1/auth/oauth/callback",
+        json={"code": state["code"], "redirect_uri": state["redirect_uri"], "state": state["state"]},
+    )
+    return response.status_code == 200
+
+
+# 이름: (워커 준비, 측정 전 준비(시간 제외), 측정할 요청)
+SCENARIOS = {
+    "verify": (setup_session, None, request_verify),
+    "login": (setup_none, None, request_login),
+    "refresh": (setup_session, None, request_refresh),
+    "register": (setup_none, prepare_register, request_register),
+    "oauth": (setup_none, prepare_oauth, request_oauth),
+}
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def keycloak_peak_inflight(oidc_url: str) -> int:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{oidc_url}/_bench/inflight/reset")
+        return response.json()["peak"]
+
+
+async def run_scenario(
+    name: str,
+    base_url: str,
+    redis_url: str,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    oidc_url: str,
+) -> dict:
+    from redis.asyncio import Redis
+
+    setup, prepare, request = SCENARIOS[name]
+    redis = Redis.from_url(redis_url, decode_responses=True)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(n: int, client: httpx.AsyncClient, measure_from: float, deadline: float) -> None:
+        nonlocal errors
+        state = await setup(client, n, redis)
+        while time.perf_counter() < deadline:
+            if prepare is not None:
+                try:
+                    await prepare(client, n, state, redis)
+                except httpx.HTTPError:
+                    # 준비 단계 실패(keep-alive 연결 끊김 등)도 실패로 집계하고 계속 진행
+                    if time.perf_counter() >= measure_from:
+                        errors += 1
+                    continue
+            started = time.perf_counter()
+            try:
+                ok = await request(client, n, state, redis)
+            except httpx.HTTPError:
+                ok = False
+            # 워밍업 구간의 요청은 집계하지 않음
+            if started < measure_from:
+                continue
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    async def reset_peak() -> None:
+        # setup 단계(로그인 등)의 Keycloak 호출은 제외하고 측정 구간의 최대값만 집계
+        await asyncio.sleep(warmup)
+        await keycloak_peak_inflight(oidc_url)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        measure_from = time.perf_counter() + warmup
+        deadline = measure_from + duration
+        await asyncio.gather(
+            reset_peak(), *(worker(n, client, measure_from, deadline) for n in range(concurrency))
+        )
+        elapsed = time.perf_counter() - measure_from
+    await redis.aclose()
+    peak = await keycloak_peak_inflight(oidc_url)
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        # Keycloak에 동시에 걸려 있던 최대 요청 수. 스레드풀(기본 40)에 묶여 있으면 40을 넘지 못함
+        "keycloak_peak_inflight": peak,
+        "concurrency": concurrency,
+    }
+
+
+def summarize(runs: list[dict]) -> dict:
+    # 한 번의 실행은 값이 크게 흔들리므로 지표별 중앙값을 기준으로 삼음(짝수 회면 작은 쪽). 실패 요청 수는 합계
+    summary = {
+        field: statistics.median_low(run[field] for run in runs)
+        for field in ("requests", "rps", "p50_ms", "p95_ms", "p99_ms", "keycloak_peak_inflight")
+    }
+    summary["errors"] = sum(run["errors"] for run in runs)
+    summary["concurrency"] = runs[0]["concurrency"]
+    summary["runs"] = len(runs)
+    return summary
+
+
+def format_result(label: str, r: dict) -> str:
+    return (
+        f"{label:>9}: {r['rps']:>9.1f} rps  p50 {r['p50_ms']:>7.2f}ms  "
+        f"p95 {r['p95_ms']:>7.2f}ms  p99 {r['p99_ms']:>7.2f}ms  "
+        f"keycloak in-flight {r['keycloak_peak_inflight']:>4}  "
+        f"({r['requests']} requests, {r['errors']} errors)"
+    )
+
+
+def compare_with_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            # 기준값 없는 시나리오는 비교할 수 없으므로 실패로 처리 (--save-baseline으로 추가)
+            regressions.append(f"{name}: no baseline entry")
+            continue
+        if result["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {result['rps']} < baseline {expected['rps']}")
+        if result["p99_ms"] > expected["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {result['p99_ms']}ms > baseline {expected['p99_ms']}ms")
+        # 기준 실행에서 Keycloak 동시 호출이 concurrency까지 찼던 시나리오는 계속 차야 함.
+        # 못 미치면 스레드풀 등에 다시 묶였다는 뜻. 나머지는 CPU에 묶여 값이 흔들리므로 비교하지 않음
+        saturated = expected.get("keycloak_peak_inflight", 0) >= expected.get("concurrency", float("inf"))
+        if saturated and result["keycloak_peak_inflight"] < result["concurrency"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: keycloak in-flight {result['keycloak_peak_inflight']} "
+                f"< concurrency {result['concurrency']}"
+            )
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} failed requests")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test against a fake Keycloak")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--runs", type=int, default=3, help="runs per scenario; the median is reported")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the auth server")
+    parser.add_argument("--keycloak-latency-ms", type=float, default=5.0)
+    parser.add_argument("--session-mode", action="store_true", help="run the auth server with SESSION_MODE=session")
+    parser.add_argument("--redis-url", help="use this Redis instead of a fakeredis process")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    # 단일 코어에서 3회 중앙값의 rps/p99가 변경 없이도 최대 25% 정도 흔들림
+    parser.add_argument("--tolerance", type=float, default=0.35)
+    parser.add_argument("--check", action="store_true", help="exit 1 on regression against the baseline")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    processes = []
+    try:
+        if args.redis_url:
+            redis_url = args.redis_url
+        else:
+            redis_port = free_port()
+            processes.append(start_process(["benchmarks/fake_redis.py", "--port", str(redis_port)], {}))
+            wait_for_redis(redis_port)
+            preload_scripts(redis_port)
+            redis_url = f"redis://127.0.0.1:{redis_port}/0"
+        redis_host, redis_port = redis_url.split("://", 1)[1].split("/", 1)[0].split(":")
+
+        oidc_port, app_port = free_port(), free_port()
+        oidc_url = f"http://127.0.0.1:{oidc_port}"
+        app_url = f"http://127.0.0.1:{app_port}"
+
+        processes.append(
+            start_process(
+                ["benchmarks/fake_oidc.py", "--port", str(oidc_port)],
+                {"FAKE_OIDC_LATENCY_MS": str(args.keycloak_latency_ms)},
+            )
+        )
+        wait_for(f"{oidc_url}/realms/{REALM}/protocol/openid-connect/certs")
+
+        processes.append(
+            start_process(
+                [
+                    "-m", "uvicorn", "main:app",
+                    "--host", "127.0.0.1",
+                    "--port", str(app_port),
+                    "--workers", str(args.workers),
+                    "--log-level", "warning",
+                    # 부하 클라이언트의 keep-alive 연결을 서버가 먼저 닫지 않도록
+                    "--timeout-keep-alive", "75",
+                ],
+                {
+                    "KEYCLOAK_URL": oidc_url,
+                    "KEYCLOAK_REALM": REALM,
+                    "KEYCLOAK_CLIENT_ID": "bench",
+                    "KEYCLOAK_CLIENT_SECRET": "bench",
+                    "KEYCLOAK_ADMIN_USERNAME": "admin",
+                    "KEYCLOAK_ADMIN_PASSWORD": "admin",
+                    "KEYCLOAK_API_KEY": "bench",
+                    "REDIS_HOST": redis_host,
+                    "REDIS_PORT": redis_port,
+                    "RATE_LIMIT_ENABLED": "false",
+                    "EMAIL_WORKERS": "0",
+                    "SESSION_MODE": "session" if args.session_mode else "cookie",
+                },
+            )
+        )
+        wait_for(f"{app_url}/health/ready")
+
+        results = {}
+        for name in args.scenario or list(SCENARIOS):
+            runs = []
+            for run in range(args.runs):
+                runs.append(
+                    asyncio.run(
+                        run_scenario(
+                            name, app_url, redis_url, args.concurrency, args.duration, args.warmup, oidc_url
+                        )
+                    )
+                )
+                if args.runs > 1:
+                    print(format_result(f"#{run + 1}", runs[-1]))
+            results[name] = summarize(runs)
+            print(format_result(name, results[name]))
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    if args.save_baseline:
+        # 실행한 시나리오만 갱신하고 나머지 기준값은 유지
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"[REGRESSION] {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+from dotenv import load_dotenv
+from services.realm_bootstrap import load_spec, bootstrap
+
+dotenv_path = os.path.join(os.path.dirname(__file__), ".env.keycloak")
+load_dotenv(dotenv_path=dotenv_path, override=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create or update Keycloak realms, roles, clients and users from a JSON/YAML spec"
+    )
+    parser.add_argument("spec", help="realm spec file (.json, .yaml)")
+    parser.add_argument("--keycloak-url", default=os.getenv("KEYCLOAK_URL", "http://localhost:8080"))
+    parser.add_argument("--admin-user", default=os.getenv("KEYCLOAK_ADMIN"))
+    parser.add_argument("--admin-password", default=os.getenv("KEYCLOAK_ADMIN_PASSWORD"))
+    parser.add_argument("--plan", action="store_true", help="only print the changes")
+    parser.add_argument("--parallel", type=int, default=4, help="realms reconciled at the same time")
+    parser.add_argument("--secrets-out", help="write confidential client secrets to this JSON file")
+    args = parser.parse_args()
+
+    if not args.admin_user or not args.admin_password:
+        parser.error("master admin credentials are required (--admin-user/--admin-password or .env.keycloak)")
+
+    results = asyncio.run(
+        bootstrap(
+            load_spec(args.spec),
+            args.keycloak_url,
+            args.admin_user,
+            args.admin_password,
+            dry_run=args.plan,
+            with_secrets=bool(args.secrets_out),
+            parallel=args.parallel,
+        )
+    )
+
+    failed = False
+    for result in results:
+        if "error" in result:
+            failed = True
+            print(f"[!] Realm '{result['realm']}': {result['error']}")
+        elif not result["changes"]:
+            print(f"[i] Realm '{result['realm']}' is up to date.")
+        else:
+            verb = "would apply" if args.plan else "applied"
+            print(f"[✓] Realm '{result['realm']}': {verb} {len(result['changes'])} change(s)")
+            for change in result["changes"]:
+                print(f"    - {change}")
+
+    if args.secrets_out and not args.plan:
+        secrets = {r["realm"]: r["client_secrets"] for r in results if "client_secrets" in r}
+        with open(args.secrets_out, "w") as f:
+            json.dump(secrets, f, indent=2)
+        print(f"[✓] Client secrets written to {args.secrets_out}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,4 +15,171 @@ CORS_ALLOW_ORIGINS = [
 ]
 
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-REDIS_PORT = os.getenv("REDIS_PORT", "6379")
\ No newline at end of file
+REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+# 풀의 연결이 모두 사용 중일 때 빈 연결을 기다리는 최대 시간 (초)
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "2"))
+
+# Keycloak 호출용 공유 HTTP 클라이언트 (httpx.AsyncClient)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+
+# JWKS 캐시 (키 회전 대응)
+JWKS_DEFAULT_TTL = int(os.getenv("JWKS_DEFAULT_TTL", "300"))
+JWKS_MIN_TTL = int(os.getenv("JWKS_MIN_TTL", "30"))
+JWKS_MAX_TTL = int(os.getenv("JWKS_MAX_TTL", "3600"))
+JWKS_REFRESH_CHECK_INTERVAL = int(os.getenv("JWKS_REFRESH_CHECK_INTERVAL", "15"))
+JWKS_MIN_REFETCH_INTERVAL = float(os.getenv("JWKS_MIN_REFETCH_INTERVAL", "10"))
+# /public-key 응답의 Cache-Control max-age
+JWKS_PUBLIC_MAX_AGE = int(os.getenv("JWKS_PUBLIC_MAX_AGE", "300"))
+
+# 다중 realm 토큰 검증: 기본 realm 외에 허용할 issuer (realm 이름 또는 issuer URL, 쉼표 구분)
+KEYCLOAK_TRUSTED_ISSUERS = [
+    issuer.strip().rstrip("/")
+    for issuer in os.getenv("KEYCLOAK_TRUSTED_ISSUERS", "").split(",")
+    if issuer.strip()
+]
+# 허용 realm별 token/logout용 client (bootstrap_realms.py --secrets-out 파일). 없는 realm은 기본 client 사용
+KEYCLOAK_REALM_CLIENTS_FILE = os.getenv("KEYCLOAK_REALM_CLIENTS_FILE", "")
+# 동시에 메모리에 유지할 realm별 JWKS 캐시 수 (LRU)
+KEYCLOAK_MAX_REALMS = int(os.getenv("KEYCLOAK_MAX_REALMS", "64"))
+
+# 검증된 토큰 결과 캐시 (LRU)
+TOKEN_CACHE_ENABLED = os.getenv("TOKEN_CACHE_ENABLED", "true").lower() == "true"
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+# JWT 검증 백엔드 ("jose" 또는 "cryptography")
+JWT_BACKEND = os.getenv("JWT_BACKEND", "cryptography")
+# 허용 서명 알고리즘 (두 백엔드 공통, RS256/RS384/RS512 중에서 선택)
+JWT_ALGORITHMS = [
+    alg.strip() for alg in os.getenv("JWT_ALGORITHMS", "RS256").split(",") if alg.strip()
+]
+JWT_LEEWAY = int(os.getenv("JWT_LEEWAY", "0"))
+JWT_VERIFY_ISSUER = os.getenv("JWT_VERIFY_ISSUER", "true").lower() == "true"
+JWT_EXPECTED_ISSUER = os.getenv("JWT_EXPECTED_ISSUER", "")
+
+# 동일 refresh token 동시 갱신 요청 합치기 (single-flight)
+REFRESH_COALESCE_GRACE = float(os.getenv("REFRESH_COALESCE_GRACE", "10"))
+REFRESH_COALESCE_REDIS = os.getenv("REFRESH_COALESCE_REDIS", "false").lower() == "true"
+REFRESH_COALESCE_LOCK_TTL = float(os.getenv("REFRESH_COALESCE_LOCK_TTL", "10"))
+REFRESH_COALESCE_WAIT_TIMEOUT = float(os.getenv("REFRESH_COALESCE_WAIT_TIMEOUT", "5"))
+
+# 이메일 발송 큐 ("console", "file", "smtp")
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND", "console")
+EMAIL_FROM = os.getenv("EMAIL_FROM", "no-reply@localhost")
+EMAIL_FILE_PATH = os.getenv("EMAIL_FILE_PATH", "sent_emails.log")
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", "5"))
+EMAIL_RETRY_BASE_DELAY = float(os.getenv("EMAIL_RETRY_BASE_DELAY", "2"))
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+# 요청 빈도 제한 ("횟수/초", 예: "20/60")
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+RATE_LIMIT_LOGIN_IP = os.getenv("RATE_LIMIT_LOGIN_IP", "30/60")
+RATE_LIMIT_LOGIN_USERNAME = os.getenv("RATE_LIMIT_LOGIN_USERNAME", "10/300")
+RATE_LIMIT_SEND_CODE_IP = os.getenv("RATE_LIMIT_SEND_CODE_IP", "10/60")
+RATE_LIMIT_SEND_CODE_EMAIL = os.getenv("RATE_LIMIT_SEND_CODE_EMAIL", "3/300")
+RATE_LIMIT_VERIFY_CODE_IP = os.getenv("RATE_LIMIT_VERIFY_CODE_IP", "30/60")
+RATE_LIMIT_VERIFY_CODE_EMAIL = os.getenv("RATE_LIMIT_VERIFY_CODE_EMAIL", "10/300")
+
+# 로그아웃/탈퇴된 세션 로컬 차단 목록
+REVOCATION_DEFAULT_TTL = int(os.getenv("REVOCATION_DEFAULT_TTL", "86400"))
+REVOCATION_SYNC_INTERVAL = int(os.getenv("REVOCATION_SYNC_INTERVAL", "60"))
+
+# 토큰 일괄 검증
+TOKEN_BATCH_MAX_SIZE = int(os.getenv("TOKEN_BATCH_MAX_SIZE", "500"))
+TOKEN_BATCH_WORKERS = int(os.getenv("TOKEN_BATCH_WORKERS", "4"))
+TOKEN_BATCH_PARALLEL_THRESHOLD = int(os.getenv("TOKEN_BATCH_PARALLEL_THRESHOLD", "8"))
+
+# Admin API 토큰 만료 몇 초 전에 미리 갱신할지
+KEYCLOAK_ADMIN_TOKEN_REFRESH_MARGIN = int(os.getenv("KEYCLOAK_ADMIN_TOKEN_REFRESH_MARGIN", "30"))
+
+# 워커 기동 시간 목표 (ms), 초과 시 경고 출력
+STARTUP_TIME_BUDGET_MS = int(os.getenv("STARTUP_TIME_BUDGET_MS", "1000"))
+KEYCLOAK_WARMUP_MAX_DELAY = float(os.getenv("KEYCLOAK_WARMUP_MAX_DELAY", "30"))
+
+# 세션 모드: "cookie"(JWT를 쿠키에 저장, 기존 방식) 또는 "session"(불투명 세션 ID 쿠키 + Redis 세션 저장소)
+SESSION_MODE = os.getenv("SESSION_MODE", "cookie").lower()
+SESSION_COOKIE_NAME = os.getenv("SESSION_COOKIE_NAME", "session_id")
+SESSION_IDLE_TTL = int(os.getenv("SESSION_IDLE_TTL", "1800"))
+SESSION_LOCAL_CACHE_SIZE = int(os.getenv("SESSION_LOCAL_CACHE_SIZE", "10000"))
+SESSION_LOCAL_CACHE_TTL = float(os.getenv("SESSION_LOCAL_CACHE_TTL", "5"))
+
+# 만료 전 미리 토큰 갱신 (refresh-ahead)
+REFRESH_AHEAD_ENABLED = os.getenv("REFRESH_AHEAD_ENABLED", "true").lower() == "true"
+REFRESH_AHEAD_WINDOW = int(os.getenv("REFRESH_AHEAD_WINDOW", "60"))
+REFRESH_AHEAD_INTERVAL = int(os.getenv("REFRESH_AHEAD_INTERVAL", "10"))
+REFRESH_AHEAD_BATCH_SIZE = int(os.getenv("REFRESH_AHEAD_BATCH_SIZE", "100"))
+# 쿠키 모드의 미리 받은 토큰 보관 시간. 기본은 이전 refresh token 만료까지, exp가 없을 때만 사용
+REFRESH_AHEAD_PENDING_TTL = int(os.getenv("REFRESH_AHEAD_PENDING_TTL", "120"))
+
+# Keycloak 호출 보호: 엔드포인트별 timeout(초), 멱등 호출 재시도, hedging, circuit breaker
+KEYCLOAK_ENDPOINT_TIMEOUTS = {
+    name.strip(): float(value)
+    for name, _, value in (
+        item.partition("=")
+        for item in os.getenv(
+            "KEYCLOAK_ENDPOINT_TIMEOUTS",
+            "certs=2,token=5,refresh=5,logout=3,userinfo=2,admin=10,admin_token=5",
+        ).split(",")
+    )
+    if name.strip() and value.strip()
+}
+KEYCLOAK_DEFAULT_TIMEOUT = float(os.getenv("KEYCLOAK_DEFAULT_TIMEOUT", "5"))
+KEYCLOAK_RETRY_MAX = int(os.getenv("KEYCLOAK_RETRY_MAX", "2"))
+KEYCLOAK_RETRY_BASE_DELAY = float(os.getenv("KEYCLOAK_RETRY_BASE_DELAY", "0.1"))
+KEYCLOAK_RETRY_MAX_DELAY = float(os.getenv("KEYCLOAK_RETRY_MAX_DELAY", "1"))
+KEYCLOAK_HEDGE_ENDPOINTS = [
+    endpoint.strip()
+    for endpoint in os.getenv("KEYCLOAK_HEDGE_ENDPOINTS", "certs,userinfo").split(",")
+    if endpoint.strip()
+]
+# 0이면 hedging 비활성화
+KEYCLOAK_HEDGE_DELAY = float(os.getenv("KEYCLOAK_HEDGE_DELAY", "0"))
+KEYCLOAK_BREAKER_FAILURE_THRESHOLD = int(os.getenv("KEYCLOAK_BREAKER_FAILURE_THRESHOLD", "5"))
+KEYCLOAK_BREAKER_RECOVERY_TIMEOUT = float(os.getenv("KEYCLOAK_BREAKER_RECOVERY_TIMEOUT", "30"))
+KEYCLOAK_BREAKER_HALF_OPEN_CALLS = int(os.getenv("KEYCLOAK_BREAKER_HALF_OPEN_CALLS", "1"))
+
+# API 키 레지스트리: 전체 재동기화 주기, 사용량 카운터 flush 주기(초)
+API_KEY_SYNC_INTERVAL = int(os.getenv("API_KEY_SYNC_INTERVAL", "60"))
+API_KEY_USAGE_FLUSH_INTERVAL = int(os.getenv("API_KEY_USAGE_FLUSH_INTERVAL", "5"))
+
+# 대량 사용자 등록 (NDJSON/CSV 스트리밍)
+PROVISIONING_CONCURRENCY = int(os.getenv("PROVISIONING_CONCURRENCY", "16"))
+PROVISIONING_MAX_CONCURRENCY = int(os.getenv("PROVISIONING_MAX_CONCURRENCY", "64"))
+# partial-import 모드에서 한 번에 보내는 사용자 수
+PROVISIONING_BATCH_SIZE = int(os.getenv("PROVISIONING_BATCH_SIZE", "500"))
+PROVISIONING_CHECKPOINT_EVERY = int(os.getenv("PROVISIONING_CHECKPOINT_EVERY", "1000"))
+PROVISIONING_CHECKPOINT_TTL = int(os.getenv("PROVISIONING_CHECKPOINT_TTL", "604800"))
+PROVISIONING_DEFAULT_ROLES = [
+    role.strip()
+    for role in os.getenv("PROVISIONING_DEFAULT_ROLES", "user").split(",")
+    if role.strip()
+]
+
+# username -> user id 인덱스 (Redis). 없는 이름은 짧게 캐시
+ADMIN_INDEX_TTL = int(os.getenv("ADMIN_INDEX_TTL", "86400"))
+ADMIN_INDEX_NEGATIVE_TTL = int(os.getenv("ADMIN_INDEX_NEGATIVE_TTL", "60"))
+
+# OAuth(소셜) 로그인: state/PKCE 보관 시간(초)
+OAUTH_STATE_TTL = int(os.getenv("OAUTH_STATE_TTL", "300"))
+# 사용자 프로필 출처: "id_token"(로컬 서명 검증) 또는 "userinfo"(Keycloak 호출)
+OAUTH_PROFILE_SOURCE = os.getenv("OAUTH_PROFILE_SOURCE", "id_token").lower()
+# id_token에 없어 userinfo에서 추가로 가져올 claim (쉼표 구분). 비어 있으면 userinfo 호출 안 함
+OAUTH_EXTRA_USERINFO_CLAIMS = [
+    claim.strip()
+    for claim in os.getenv("OAUTH_EXTRA_USERINFO_CLAIMS", "").split(",")
+    if claim.strip()
+]
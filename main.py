@@ -1,16 +1,101 @@
-from fastapi import FastAPI
-from api import auth_admin, auth_user, token
+from services.readiness import readiness
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from api import auth_admin, auth_user, oauth, token, health, metrics, provisioning
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from config.fastapi import CORS_ALLOW_ORIGINS
+from config.fastapi import (
+    CORS_ALLOW_ORIGINS,
+    JWKS_REFRESH_CHECK_INTERVAL,
+    REVOCATION_SYNC_INTERVAL,
+    REFRESH_AHEAD_ENABLED,
+    REFRESH_AHEAD_INTERVAL,
+    API_KEY_SYNC_INTERVAL,
+    API_KEY_USAGE_FLUSH_INTERVAL,
+)
+from services.keycloak_http import keycloak_http
+from services.scheduler import scheduler
+from services.redis_client import close_async_redis
+from services.email_dispatch import email_dispatcher
+from services.revocation import revocation_index
+from services.refresh_ahead import refresh_ahead
+from services.session_store import session_mode_enabled
+from services.api_keys import api_key_registry
+from services.jwt_verification import token_verifier
+from services.keycloak_admin_client import keycloak_admin_async
+from services.metrics import MetricsMiddleware
+from services.resilience import CircuitOpenError
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await keycloak_http.start()
+    scheduler.add_job(
+        token_verifier.refresh_stale_keys,
+        "interval",
+        seconds=JWKS_REFRESH_CHECK_INTERVAL,
+        id="jwks_refresh",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        revocation_index.sync_quietly,
+        "interval",
+        seconds=REVOCATION_SYNC_INTERVAL,
+        id="revocation_sync",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        api_key_registry.load_quietly,
+        "interval",
+        seconds=API_KEY_SYNC_INTERVAL,
+        id="api_key_sync",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        api_key_registry.flush_usage,
+        "interval",
+        seconds=API_KEY_USAGE_FLUSH_INTERVAL,
+        id="api_key_usage_flush",
+        replace_existing=True,
+    )
+    if REFRESH_AHEAD_ENABLED and session_mode_enabled():
+        scheduler.add_job(
+            token_verifier.refresh_due_sessions,
+            "interval",
+            seconds=REFRESH_AHEAD_INTERVAL,
+            id="refresh_ahead",
+            replace_existing=True,
+            max_instances=1,
+        )
+    scheduler.start()
+    await email_dispatcher.start()
+    await revocation_index.start()
+    await api_key_registry.start()
+    readiness.start_warmup(token_verifier.get_jwks, keycloak_admin_async.get_access_token)
+    readiness.mark_started()
     yield
+    await readiness.stop()
+    await refresh_ahead.stop()
+    await api_key_registry.stop()
+    await revocation_index.stop()
+    await email_dispatcher.stop()
+    scheduler.shutdown(wait=False)
+    await keycloak_http.close()
+    await close_async_redis()
 
 app = FastAPI(lifespan=lifespan)
 
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    # Keycloak 장애 중에는 기다리지 않고 바로 503 반환
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "KEYCLOAK_UNAVAILABLE"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after + 0.5)))},
+    )
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=CORS_ALLOW_ORIGINS,
@@ -18,7 +103,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth_admin.router)
 app.include_router(auth_user.router)
-app.include_router(token.router)
\ No newline at end of file
+app.include_router(oauth.router)
+app.include_router(token.router)
+app.include_router(provisioning.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import argparse
+from services.api_keys import (
+    create_api_key,
+    list_api_keys,
+    find_api_key_hash,
+    find_api_key_hashes_by_name,
+    revoke_api_keys,
+    rotate_api_key,
+    SCOPE_ALL,
+    SCOPE_JWKS_READ,
+    SCOPE_TOKEN_VERIFY,
+    SCOPE_STATS_READ,
+    SCOPE_USERS_PROVISION,
+)
+
+KNOWN_SCOPES = [
+    SCOPE_ALL,
+    SCOPE_JWKS_READ,
+    SCOPE_TOKEN_VERIFY,
+    SCOPE_STATS_READ,
+    SCOPE_USERS_PROVISION,
+]
+
+
+def cmd_create(args):
+    unknown = set(args.scope) - set(KNOWN_SCOPES)
+    if unknown:
+        print(f"[!] Unknown scope(s): {', '.join(sorted(unknown))}")
+    api_key = create_api_key(args.name, args.scope, args.quota)
+    print(f"[✓] API key '{args.name}' created. It is shown only once:")
+    print(api_key)
+
+
+def cmd_list(args):
+    keys = list_api_keys()
+    if not keys:
+        print("[i] No API keys registered.")
+        return
+    for key in keys:
+        print(
+            f"{key['id']}  {key['name']:<24} scopes={','.join(key.get('scopes', [])) or '-'}"
+            f"  quota={key.get('quota') or '-'}  usage={key['usage']}"
+        )
+
+
+def cmd_revoke(args):
+    try:
+        key_hash = find_api_key_hash(args.key)
+    except ValueError as e:
+        print(f"[!] {e}")
+        return
+    if key_hash and revoke_api_keys([key_hash]):
+        print(f"[✓] Revoked API key {key_hash[:12]} matching '{args.key}'.")
+    else:
+        print(f"[!] No API key matches '{args.key}'.")
+
+
+def cmd_rotate(args):
+    if args.keep_old:
+        # 새 키로 전환이 끝난 뒤 revoke <id>로 기존 키를 폐기
+        old_hashes = find_api_key_hashes_by_name(args.name)
+        if not old_hashes:
+            print(f"[!] No API key named '{args.name}'.")
+            return
+        keys = {key["id"]: key for key in list_api_keys()}
+        old = keys[old_hashes[0][:12]]
+        api_key = create_api_key(args.name, old.get("scopes", []), old.get("quota"))
+        print(f"[✓] New key for '{args.name}' created; old key(s) kept: {', '.join(h[:12] for h in old_hashes)}")
+    else:
+        api_key = rotate_api_key(args.name)
+        if api_key is None:
+            print(f"[!] No API key named '{args.name}'.")
+            return
+        print(f"[✓] API key '{args.name}' rotated; old key(s) revoked.")
+    print(api_key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage API keys stored in Redis")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create = subparsers.add_parser("create", help="Create a new API key")
+    create.add_argument("name")
+    create.add_argument(
+        "--scope",
+        action="append",
+        default=[],
+        help=f"repeatable; one of {', '.join(KNOWN_SCOPES)}",
+    )
+    create.add_argument("--quota", help="requests per window, e.g. 1000/60")
+    create.set_defaults(func=cmd_create)
+
+    subparsers.add_parser("list", help="List API keys and usage").set_defaults(func=cmd_list)
+
+    revoke = subparsers.add_parser("revoke", help="Revoke a key by its id (from list) or exact name")
+    revoke.add_argument("key")
+    revoke.set_defaults(func=cmd_revoke)
+
+    rotate = subparsers.add_parser("rotate", help="Issue a new key with the same scopes and quota")
+    rotate.add_argument("name")
+    rotate.add_argument("--keep-old", action="store_true", help="do not revoke the current key yet")
+    rotate.set_defaults(func=cmd_rotate)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from services.provisioning import ProvisioningJob, iter_lines, parse_rows, MODE_USERS, MODE_PARTIAL_IMPORT
+from services.keycloak_http import keycloak_http
+from config.fastapi import PROVISIONING_CONCURRENCY
+
+
+async def read_chunks(path: str, size: int = 65536):
+    with open(path, "rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def read_checkpoint(path: str | None) -> int:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return int(f.read().strip() or 0)
+    return 0
+
+
+def write_checkpoint(path: str | None, checkpoint: int) -> None:
+    if path:
+        with open(path, "w") as f:
+            f.write(str(checkpoint))
+
+
+async def run(args) -> int:
+    fmt = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+    skip = args.skip if args.skip is not None else read_checkpoint(args.checkpoint_file)
+    if skip:
+        print(f"[i] Resuming after row {skip}.", file=sys.stderr)
+
+    job = ProvisioningJob(
+        mode=args.mode, on_conflict=args.on_conflict, concurrency=args.concurrency, skip=skip
+    )
+    output = open(args.output, "a") if args.output else sys.stdout
+    started = time.perf_counter()
+    summary = {}
+    try:
+        async for record in job.run(parse_rows(iter_lines(read_chunks(args.file)), fmt)):
+            if "checkpoint" in record:
+                write_checkpoint(args.checkpoint_file, record["checkpoint"])
+                print(f"[i] Checkpoint: {record['checkpoint']} rows", file=sys.stderr)
+            elif "summary" in record:
+                summary = record["summary"]
+            else:
+                output.write(json.dumps(record) + "\n")
+    finally:
+        # 중단(Ctrl+C 등)되어도 마지막 체크포인트 저장
+        write_checkpoint(args.checkpoint_file, job.checkpoint)
+        if output is not sys.stdout:
+            output.close()
+        await keycloak_http.close()
+
+    elapsed = time.perf_counter() - started
+    processed = sum(count for status, count in summary.items() if status not in ("skipped", "checkpoint", "aborted"))
+    print(
+        f"[✓] {processed} rows in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.0f} rows/s): "
+        + ", ".join(f"{status}={count}" for status, count in summary.items()),
+        file=sys.stderr,
+    )
+    if summary.get("aborted"):
+        print("[!] Aborted: Keycloak unavailable. Re-run with the same checkpoint file to resume.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk create Keycloak users from an NDJSON or CSV file")
+    parser.add_argument("file", help="NDJSON (one user object per line) or CSV with a header row")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="default: from the file extension")
+    parser.add_argument("--mode", choices=[MODE_USERS, MODE_PARTIAL_IMPORT], default=MODE_USERS)
+    parser.add_argument("--on-conflict", choices=["skip", "overwrite", "fail"], default="skip")
+    parser.add_argument("--concurrency", type=int, default=PROVISIONING_CONCURRENCY)
+    parser.add_argument("--skip", type=int, help="rows to skip; overrides the checkpoint file")
+    parser.add_argument("--checkpoint-file", help="read the resume point from and save progress to this file")
+    parser.add_argument("--output", help="append per-row results here instead of stdout")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,4 @@ from pydantic import BaseModel
 class OAuthCallbackRequest(BaseModel):
     code: str
     redirect_uri: str
+    state: str
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, EmailStr, field_validator
+
+
+class ProvisionUserRow(BaseModel):
+    username: str
+    email: EmailStr | None = None
+    password: str | None = None
+    first_name: str = ""
+    last_name: str = ""
+    roles: list[str] = []
+    enabled: bool = True
+    email_verified: bool = True
+
+    @field_validator("email", "password", mode="before")
+    @classmethod
+    def empty_to_none(cls, value):
+        # CSV의 빈 칸은 값 없음으로 처리
+        return value or None
+
+    @field_validator("enabled", "email_verified", mode="before")
+    @classmethod
+    def empty_to_default(cls, value):
+        return True if value == "" else value
+
+    @field_validator("roles", mode="before")
+    @classmethod
+    def split_roles(cls, value):
+        # CSV에서는 "admin;editor" 형태
+        if isinstance(value, str):
+            return [role.strip() for role in value.split(";") if role.strip()]
+        return value or []
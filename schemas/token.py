@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class TokenBatchVerifyRequest(BaseModel):
+    tokens: list[str] = Field(..., min_length=1)
+    audience: str = "account"
+    parallel: bool = True
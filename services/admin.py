@@ -1,15 +1,17 @@
-from config.keycloak import keycloak_admin
 from jose import jwt, JWTError
+import httpx
 import requests
-import traceback
+from services.keycloak_admin_client import keycloak_admin_async, KeycloakAdminError
+from services.resilience import CircuitOpenError
+from services.admin_index import admin_id_index, USER
 
 
 class KeycloakAdminService:
     @staticmethod
-    def create_user(
+    def _user_payload(
         username: str, email: str, password: str, first_name: str, last_name: str
-    ):
-        user = {
+    ) -> dict:
+        return {
             "username": username,
             "email": email,
             "firstName": first_name,
@@ -26,29 +28,52 @@ class KeycloakAdminService:
             ],
         }
 
-        try:
-            user_id = keycloak_admin.create_user(user)
-
-            if user_id:
-                try:
-                    role = keycloak_admin.get_realm_role("user")
-                    keycloak_admin.assign_realm_roles(user_id=user_id, roles=[role])
-                except Exception as e:
-                    print(f"[역할 할당 실패] {e}")
-                    traceback.print_exc()
-
-                return user_id
+    @staticmethod
+    async def create_user_async(
+        username: str, email: str, password: str, first_name: str, last_name: str
+    ):
+        user = KeycloakAdminService._user_payload(
+            username, email, password, first_name, last_name
+        )
 
-        except Exception as e:
+        try:
+            user_id = await keycloak_admin_async.create_user(user)
+        except (KeycloakAdminError, httpx.HTTPError) as e:
             print(f"[사용자 생성 중 예외 발생] {e}")
-            traceback.print_exc()
             return None
 
+        await admin_id_index.remember_async(USER, {username: user_id})
+        try:
+            role = await keycloak_admin_async.get_realm_role("user")
+            await keycloak_admin_async.assign_realm_roles(user_id=user_id, roles=[role])
+        except (KeycloakAdminError, httpx.HTTPError, CircuitOpenError) as e:
+            print(f"[역할 할당 실패] {e}")
+
+        return user_id
+
     @staticmethod
-    def delete_user_by_username(username: str):
-        users = keycloak_admin.get_users({"username": username})
-        if not users:
+    async def delete_user_by_username_async(username: str, user_id: str | None = None):
+        # user_id(토큰의 sub)를 알면 조회 없이 바로 삭제. 그 ID가 없으면 다른 사용자로 대체하지 않음
+        from_index = user_id is None
+        if from_index:
+            user_id = await admin_id_index.resolve_async(
+                USER, username, lambda: keycloak_admin_async.find_user_id(username)
+            )
+        if not user_id:
             raise ValueError("User not found")
 
-        user_id = users[0]["id"]
-        keycloak_admin.delete_user(user_id)
\ No newline at end of file
+        try:
+            await keycloak_admin_async.delete_user(user_id)
+        except KeycloakAdminError as e:
+            if e.status_code != 404:
+                raise
+            await admin_id_index.forget_async(USER, username)
+            if not from_index:
+                raise ValueError("User not found")
+            # 인덱스의 ID가 오래된 경우(Keycloak에서 직접 삭제 후 재생성 등) 다시 조회
+            user_id = await keycloak_admin_async.find_user_id(username)
+            if not user_id:
+                await admin_id_index.remember_async(USER, {username: None})
+                raise ValueError("User not found")
+            await keycloak_admin_async.delete_user(user_id)
+        await admin_id_index.remember_async(USER, {username: None})
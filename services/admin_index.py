@@ -0,0 +1,75 @@
+from typing import Awaitable, Callable
+from redis.exceptions import RedisError
+from config.keycloak import settings
+from config.fastapi import ADMIN_INDEX_TTL, ADMIN_INDEX_NEGATIVE_TTL
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+USER = "user"
+
+# 존재하지 않는 이름 표시 (Keycloak ID는 UUID라 겹치지 않음)
+NEGATIVE = "-"
+
+
+class AdminIdIndex:
+    def __init__(
+        self,
+        realm: str = settings.KEYCLOAK_REALM,
+        ttl: int = ADMIN_INDEX_TTL,
+        negative_ttl: int = ADMIN_INDEX_NEGATIVE_TTL,
+    ):
+        self.realm = realm
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def _key(self, kind: str, name: str) -> str:
+        # Keycloak은 username을 소문자로 저장
+        if kind == USER:
+            name = name.lower()
+        return f"admin_index:{self.realm}:{kind}:{name}"
+
+    def _entry(self, resource_id: str | None) -> tuple[str, int]:
+        if resource_id is None:
+            return NEGATIVE, self.negative_ttl
+        return resource_id, self.ttl
+
+    async def resolve_async(
+        self, kind: str, name: str, fetch: Callable[[], Awaitable[str | None]]
+    ) -> str | None:
+        # 캐시에 없을 때만 Keycloak 정확 일치 검색(fetch) 호출
+        try:
+            with observe_redis("admin_index_get"):
+                cached = await async_redis.get(self._key(kind, name))
+        except RedisError as e:
+            print(f"[admin index redis unavailable] {e}")
+            return await fetch()
+        if cached is not None:
+            return None if cached == NEGATIVE else cached
+
+        resource_id = await fetch()
+        await self.remember_async(kind, {name: resource_id})
+        return resource_id
+
+    async def remember_async(self, kind: str, entries: dict[str, str | None]) -> None:
+        # None은 "없음"으로 기록 (삭제 시에도 사용)
+        if not entries:
+            return
+        try:
+            async with async_redis.pipeline(transaction=False) as pipe:
+                for name, resource_id in entries.items():
+                    value, ttl = self._entry(resource_id)
+                    pipe.set(self._key(kind, name), value, ex=ttl)
+                with observe_redis("admin_index_set"):
+                    await pipe.execute()
+        except RedisError as e:
+            print(f"[admin index redis unavailable] {e}")
+
+    async def forget_async(self, kind: str, name: str) -> None:
+        try:
+            with observe_redis("admin_index_delete"):
+                await async_redis.delete(self._key(kind, name))
+        except RedisError as e:
+            print(f"[admin index redis unavailable] {e}")
+
+
+admin_id_index = AdminIdIndex()
@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from typing import NamedTuple
+from redis.exceptions import RedisError
+from services.redis_client import redis_client, async_redis
+from services.rate_limit import RateLimitPolicy, parse_policy
+from services.metrics import observe_redis
+
+API_KEYS_KEY = "api_keys"
+API_KEYS_CHANNEL = "api_keys"
+API_KEY_USAGE_KEY = "api_keys:usage"
+RELOAD_ALL = "*"
+# list에 표시되는 키 id(해시 앞부분) 길이
+API_KEY_ID_LENGTH = 12
+
+SCOPE_ALL = "*"
+SCOPE_JWKS_READ = "jwks:read"
+SCOPE_TOKEN_VERIFY = "tokens:verify"
+SCOPE_STATS_READ = "stats:read"
+SCOPE_USERS_PROVISION = "users:provision"
+
+
+def hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+class ApiKey(NamedTuple):
+    key_hash: str
+    name: str
+    scopes: frozenset[str]
+    quota: RateLimitPolicy | None
+
+    def allows(self, scope: str | None) -> bool:
+        return scope is None or SCOPE_ALL in self.scopes or scope in self.scopes
+
+
+def parse_api_key(key_hash: str, raw: str) -> ApiKey:
+    data = json.loads(raw)
+    quota = data.get("quota")
+    return ApiKey(
+        key_hash=key_hash,
+        name=data["name"],
+        scopes=frozenset(data.get("scopes", [])),
+        quota=parse_policy(data["name"], quota) if quota else None,
+    )
+
+
+def _quota_key(key_hash: str, window: int) -> str:
+    return f"api_keys:quota:{key_hash}:{window}"
+
+
+class ApiKeyRegistry:
+    def __init__(self):
+        # 키 해시 -> ApiKey. 검증 경로에서는 이 dict만 조회
+        self._keys: dict[str, ApiKey] = {}
+        # 아직 Redis에 반영하지 않은 사용량
+        self._pending_usage: dict[str, int] = {}
+        # 키 해시 -> [윈도우 번호, 마지막 flush 시점의 전체 사용량, 이후 로컬 사용량]
+        self._quota_windows: dict[str, list[int]] = {}
+        self._listener: asyncio.Task | None = None
+
+    def lookup(self, api_key: str) -> ApiKey | None:
+        key_hash = hash_api_key(api_key)
+        record = self._keys.get(key_hash)
+        if record is not None and hmac.compare_digest(record.key_hash, key_hash):
+            return record
+        return None
+
+    def record_usage(self, record: ApiKey) -> float:
+        # 네트워크 없이 로컬 카운터만 증가. 할당량 초과 시 재시도까지 남은 초를 반환
+        if record.quota is not None:
+            now = time.time()
+            window = int(now // record.quota.window)
+            state = self._quota_windows.get(record.key_hash)
+            if state is None or state[0] != window:
+                state = self._quota_windows[record.key_hash] = [window, 0, 0]
+            if state[1] + state[2] >= record.quota.limit:
+                return (window + 1) * record.quota.window - now
+            state[2] += 1
+
+        self._pending_usage[record.key_hash] = self._pending_usage.get(record.key_hash, 0) + 1
+        return 0
+
+    async def flush_usage(self) -> None:
+        usage, self._pending_usage = self._pending_usage, {}
+        quota_deltas = []
+        for key_hash, state in self._quota_windows.items():
+            if state[2]:
+                quota_deltas.append((key_hash, state[0], state[2]))
+                state[2] = 0
+        if not usage and not quota_deltas:
+            return
+
+        try:
+            async with async_redis.pipeline(transaction=False) as pipe:
+                for key_hash, count in usage.items():
+                    pipe.hincrby(API_KEY_USAGE_KEY, key_hash, count)
+                for key_hash, window, count in quota_deltas:
+                    record = self._keys.get(key_hash)
+                    ttl = record.quota.window * 2 if record and record.quota else 3600
+                    pipe.incrby(_quota_key(key_hash, window), count)
+                    pipe.expire(_quota_key(key_hash, window), ttl)
+                with observe_redis("api_key_flush"):
+                    results = await pipe.execute()
+        except RedisError as e:
+            print(f"[api key usage flush failed] {e}")
+            # 다음 flush에서 다시 반영
+            for key_hash, count in usage.items():
+                self._pending_usage[key_hash] = self._pending_usage.get(key_hash, 0) + count
+            for key_hash, window, count in quota_deltas:
+                state = self._quota_windows.get(key_hash)
+                if state is not None and state[0] == window:
+                    state[2] += count
+            return
+
+        # 다른 워커의 사용량까지 포함한 전체 값으로 갱신
+        totals = results[len(usage)::2]
+        for (key_hash, window, _), total in zip(quota_deltas, totals):
+            state = self._quota_windows.get(key_hash)
+            if state is not None and state[0] == window:
+                state[1] = total
+
+    async def load(self) -> None:
+        with observe_redis("api_key_load"):
+            entries = await async_redis.hgetall(API_KEYS_KEY)
+        keys = {}
+        for key_hash, raw in entries.items():
+            try:
+                keys[key_hash] = parse_api_key(key_hash, raw)
+            except (ValueError, KeyError) as e:
+                print(f"[api key parse failed] {key_hash[:12]}: {e}")
+        self._keys = keys
+
+    async def load_quietly(self) -> None:
+        try:
+            await self.load()
+        except RedisError as e:
+            print(f"[api key sync failed] {e}")
+
+    async def _apply_message(self, key_hash: str) -> None:
+        if key_hash == RELOAD_ALL:
+            await self.load()
+            return
+        raw = await async_redis.hget(API_KEYS_KEY, key_hash)
+        if raw is None:
+            self._keys.pop(key_hash, None)
+        else:
+            try:
+                self._keys[key_hash] = parse_api_key(key_hash, raw)
+            except (ValueError, KeyError):
+                # 읽을 수 없는 레코드의 이전 값으로 계속 인증하지 않음
+                self._keys.pop(key_hash, None)
+                raise
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with async_redis.pubsub() as pubsub:
+                    await pubsub.subscribe(API_KEYS_CHANNEL)
+                    # 구독 이후 전체 로드해서 끊겨 있던 동안의 변경을 놓치지 않음
+                    await self.load()
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is None:
+                            continue
+                        try:
+                            await self._apply_message(message["data"])
+                        except (ValueError, KeyError, TypeError) as e:
+                            # 잘못된 메시지 하나 때문에 이후의 폐기/변경을 놓치지 않도록 건너뜀
+                            print(f"[api key message ignored] {message.get('data')!r}: {e}")
+            except RedisError as e:
+                print(f"[api key listener error] {e}")
+                await asyncio.sleep(1)
+            except Exception as e:
+                # 예상 못 한 오류에도 리스너를 다시 시작 (재구독 후 전체 로드)
+                print(f"[api key listener crashed] {e!r}")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.flush_usage()
+
+
+# 관리 CLI(manage_api_keys.py)용 동기 함수. 변경 후 pub/sub으로 각 워커의 캐시를 무효화
+def create_api_key(name: str, scopes: list[str], quota: str | None = None) -> str:
+    if quota:
+        parse_policy(name, quota)
+    api_key = secrets.token_urlsafe(32)
+    key_hash = hash_api_key(api_key)
+    record = {"name": name, "scopes": sorted(set(scopes)), "quota": quota, "created_at": int(time.time())}
+    with redis_client.pipeline() as pipe:
+        pipe.hset(API_KEYS_KEY, key_hash, json.dumps(record))
+        pipe.publish(API_KEYS_CHANNEL, key_hash)
+        pipe.execute()
+    return api_key
+
+
+def list_api_keys() -> list[dict]:
+    entries = redis_client.hgetall(API_KEYS_KEY)
+    usage = redis_client.hgetall(API_KEY_USAGE_KEY)
+    keys = []
+    for key_hash, raw in entries.items():
+        data = json.loads(raw)
+        keys.append({"id": key_hash[:API_KEY_ID_LENGTH], "usage": int(usage.get(key_hash, 0)), **data})
+    return sorted(keys, key=lambda item: (item["name"], item.get("created_at", 0)))
+
+
+def find_api_key_hash(name_or_id: str) -> str | None:
+    # list가 보여주는 id 전체 또는 이름이 정확히 같은 키 하나만 허용
+    if not name_or_id:
+        raise ValueError("API key name or id is required")
+    entries = redis_client.hgetall(API_KEYS_KEY)
+    matches = [
+        key_hash
+        for key_hash, raw in entries.items()
+        if (len(name_or_id) == API_KEY_ID_LENGTH and key_hash[:API_KEY_ID_LENGTH] == name_or_id)
+        or json.loads(raw)["name"] == name_or_id
+    ]
+    if len(matches) > 1:
+        ids = ", ".join(key_hash[:API_KEY_ID_LENGTH] for key_hash in matches)
+        raise ValueError(f"'{name_or_id}' matches {len(matches)} keys ({ids}); revoke them by id")
+    return matches[0] if matches else None
+
+
+def find_api_key_hashes_by_name(name: str) -> list[str]:
+    return [
+        key_hash
+        for key_hash, raw in redis_client.hgetall(API_KEYS_KEY).items()
+        if json.loads(raw)["name"] == name
+    ]
+
+
+def revoke_api_keys(key_hashes: list[str]) -> int:
+    if not key_hashes:
+        return 0
+    with redis_client.pipeline() as pipe:
+        pipe.hdel(API_KEYS_KEY, *key_hashes)
+        pipe.hdel(API_KEY_USAGE_KEY, *key_hashes)
+        for key_hash in key_hashes:
+            pipe.publish(API_KEYS_CHANNEL, key_hash)
+        removed = pipe.execute()[0]
+    return removed
+
+
+def rotate_api_key(name: str) -> str | None:
+    # 같은 이름/scope/할당량으로 새 키를 만든 뒤 기존 키 폐기
+    old_hashes = find_api_key_hashes_by_name(name)
+    if not old_hashes:
+        return None
+    data = json.loads(redis_client.hget(API_KEYS_KEY, old_hashes[0]))
+    api_key = create_api_key(name, data.get("scopes", []), data.get("quota"))
+    revoke_api_keys(old_hashes)
+    return api_key
+
+
+api_key_registry = ApiKeyRegistry()
@@ -0,0 +1,353 @@
+import asyncio
+import json
+import random
+import smtplib
+import threading
+import time
+import uuid
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from redis.exceptions import RedisError
+from config.fastapi import (
+    EMAIL_BACKEND,
+    EMAIL_FROM,
+    EMAIL_FILE_PATH,
+    EMAIL_WORKERS,
+    EMAIL_BATCH_SIZE,
+    EMAIL_MAX_RETRIES,
+    EMAIL_RETRY_BASE_DELAY,
+    SMTP_HOST,
+    SMTP_PORT,
+    SMTP_USERNAME,
+    SMTP_PASSWORD,
+    SMTP_STARTTLS,
+    SMTP_TIMEOUT,
+)
+from services.redis_client import async_redis
+
+QUEUE_KEY = "email:queue"
+RETRY_KEY = "email:retry"
+DEAD_LETTER_KEY = "email:dead"
+# 워커가 꺼내서 발송 중인 메시지 목록들. 발송 결과를 기록한 뒤에만 목록에서 제거
+PROCESSING_SET_KEY = "email:processing"
+PROCESSING_KEY = "email:processing:{dispatcher}:{worker}"
+HEARTBEAT_KEY = "email:dispatcher:{dispatcher}"
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TTL = 30
+# 종료 시 진행 중인 배치를 마칠 때까지 기다리는 시간(초). 넘으면 취소하고 처리 중 메시지는 큐로 되돌림
+STOP_TIMEOUT = 10
+REQUIRED_FIELDS = ("to", "subject", "body")
+
+# 재시도 시각이 지난 메시지를 큐로 옮김
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    redis.call('LPUSH', KEYS[2], unpack(due))
+end
+return #due
+"""
+
+# 처리 중 목록의 메시지를 모두 큐의 소비 쪽(오른쪽)으로 되돌림
+REQUEUE_SCRIPT = """
+local moved = 0
+while redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'RIGHT') do
+    moved = moved + 1
+end
+return moved
+"""
+
+
+def _to_mime(message: dict) -> EmailMessage:
+    mime = EmailMessage()
+    mime["From"] = EMAIL_FROM
+    mime["To"] = message["to"]
+    mime["Subject"] = message["subject"]
+    mime["Date"] = formatdate(localtime=True)
+    mime["Message-ID"] = make_msgid()
+    mime.set_content(message["body"])
+    return mime
+
+
+class EmailSender:
+    def send_batch(self, messages: list[dict]) -> list[Exception | None]:
+        results = []
+        for message in messages:
+            try:
+                self.send(message)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def send(self, message: dict) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class ConsoleSender(EmailSender):
+    def send(self, message: dict) -> None:
+        print(f"[DEBUG] Sent to {message['to']}: {message['subject']}\n{message['body']}")
+
+
+class FileSender(EmailSender):
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = EMAIL_FILE_PATH):
+        self.path = path
+
+    def send_batch(self, messages: list[dict]) -> list[Exception | None]:
+        try:
+            data = "".join(f"{_to_mime(m).as_string()}\n\n" for m in messages)
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+            return [None] * len(messages)
+        except OSError as e:
+            return [e] * len(messages)
+
+    def send(self, message: dict) -> None:
+        error = self.send_batch([message])[0]
+        if error:
+            raise error
+
+
+class SMTPSender(EmailSender):
+    def __init__(self):
+        self._smtp: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SMTP_USERNAME:
+            smtp.login(SMTP_USERNAME, SMTP_PASSWORD)
+        return smtp
+
+    def send(self, message: dict) -> None:
+        # 연결은 워커마다 유지하고, 끊겼을 때만 한 번 재연결
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(_to_mime(message))
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = self._connect()
+            self._smtp.send_message(_to_mime(message))
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+EMAIL_SENDERS = {
+    "console": ConsoleSender,
+    "file": FileSender,
+    "smtp": SMTPSender,
+}
+
+
+def create_sender(name: str = EMAIL_BACKEND) -> EmailSender:
+    if name not in EMAIL_SENDERS:
+        raise ValueError(f"Unknown email backend: {name}")
+    return EMAIL_SENDERS[name]()
+
+
+class EmailDispatcher:
+    PROMOTE_INTERVAL = 1.0
+
+    def __init__(self, workers: int = EMAIL_WORKERS, batch_size: int = EMAIL_BATCH_SIZE):
+        self.workers = workers
+        self.batch_size = max(batch_size, 1)
+        # 프로세스마다 다른 ID. 하트비트가 끊긴 dispatcher의 처리 중 목록은 다른 프로세스가 큐로 되돌림
+        self.dispatcher_id = uuid.uuid4().hex[:12]
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+        self._promote_script = async_redis.register_script(PROMOTE_DUE_SCRIPT)
+        self._requeue_script = async_redis.register_script(REQUEUE_SCRIPT)
+        self._last_promote = 0.0
+
+    def build_message(self, to: str, subject: str, body: str) -> str:
+        return json.dumps(
+            {"id": uuid.uuid4().hex, "to": to, "subject": subject, "body": body, "attempts": 0}
+        )
+
+    def queue(self, pipe, to: str, subject: str, body: str) -> None:
+        # 호출하는 쪽의 pipeline에 얹어서 별도 왕복 없이 큐에 넣음
+        pipe.lpush(QUEUE_KEY, self.build_message(to, subject, body))
+
+    def _processing_key(self, n: int) -> str:
+        return PROCESSING_KEY.format(dispatcher=self.dispatcher_id, worker=n)
+
+    async def start(self) -> None:
+        if not self.workers:
+            return
+        self._stopping.clear()
+        try:
+            await self._heartbeat()
+            await self.recover_abandoned()
+        except RedisError as e:
+            print(f"[email recovery failed] {e}")
+        self._tasks.append(asyncio.create_task(self._keep_alive()))
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(n)))
+
+    async def stop(self) -> None:
+        # Redis 호출 도중 취소하지 않도록 먼저 종료를 알리고 현재 배치가 끝나길 기다림
+        self._stopping.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=STOP_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _heartbeat(self) -> None:
+        await async_redis.set(
+            HEARTBEAT_KEY.format(dispatcher=self.dispatcher_id), "1", ex=HEARTBEAT_TTL
+        )
+
+    async def _keep_alive(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), HEARTBEAT_INTERVAL)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self._heartbeat()
+                await self.recover_abandoned()
+            except RedisError as e:
+                print(f"[email heartbeat failed] {e}")
+
+    async def _requeue(self, processing_key: str) -> int:
+        return await self._requeue_script(keys=[processing_key, QUEUE_KEY])
+
+    async def recover_abandoned(self) -> None:
+        # 종료/장애로 하트비트가 끊긴 dispatcher가 남긴 처리 중 메시지를 큐로 되돌림
+        for processing_key in await async_redis.smembers(PROCESSING_SET_KEY):
+            dispatcher = processing_key.split(":")[2]
+            if await async_redis.exists(HEARTBEAT_KEY.format(dispatcher=dispatcher)):
+                continue
+            moved = await self._requeue(processing_key)
+            await async_redis.srem(PROCESSING_SET_KEY, processing_key)
+            if moved:
+                print(f"[email recovered] {moved} message(s) from {processing_key}")
+
+    async def _promote_due_retries(self) -> None:
+        now = time.time()
+        if now - self._last_promote < self.PROMOTE_INTERVAL:
+            return
+        self._last_promote = now
+        await self._promote_script(keys=[RETRY_KEY, QUEUE_KEY], args=[now, self.batch_size])
+
+    async def _next_batch(self, processing_key: str) -> list[str]:
+        # 큐에서 바로 지우지 않고 처리 중 목록으로 옮김 (BLMOVE/LMOVE)
+        await self._promote_due_retries()
+        item = await async_redis.blmove(QUEUE_KEY, processing_key, 1, "RIGHT", "LEFT")
+        if item is None:
+            return []
+        batch = [item]
+        if self.batch_size > 1:
+            async with async_redis.pipeline(transaction=False) as pipe:
+                for _ in range(self.batch_size - 1):
+                    pipe.lmove(QUEUE_KEY, processing_key, "RIGHT", "LEFT")
+                batch.extend(payload for payload in await pipe.execute() if payload is not None)
+        return batch
+
+    def _handle_failure(self, pipe, message: dict, error: Exception) -> None:
+        message["attempts"] += 1
+        message["last_error"] = str(error)
+        if message["attempts"] > EMAIL_MAX_RETRIES:
+            print(f"[email dead-lettered] to={message['to']}: {error}")
+            pipe.lpush(DEAD_LETTER_KEY, json.dumps(message))
+            return
+
+        delay = EMAIL_RETRY_BASE_DELAY * 2 ** (message["attempts"] - 1)
+        retry_at = time.time() + delay * random.uniform(0.5, 1.5)
+        pipe.zadd(RETRY_KEY, {json.dumps(message): retry_at})
+
+    def _parse(self, payload: str) -> dict:
+        message = json.loads(payload)
+        if not isinstance(message, dict) or any(field not in message for field in REQUIRED_FIELDS):
+            raise ValueError("missing to/subject/body")
+        message.setdefault("attempts", 0)
+        return message
+
+    async def _deliver(self, sender: EmailSender, processing_key: str, batch: list[str]) -> None:
+        parsed, malformed = [], []
+        for payload in batch:
+            try:
+                parsed.append((payload, self._parse(payload)))
+            except ValueError as e:
+                malformed.append((payload, e))
+
+        messages = [message for _, message in parsed]
+        try:
+            results = await asyncio.to_thread(sender.send_batch, messages) if messages else []
+        except Exception as e:
+            # 메시지별 처리 밖에서 난 오류는 배치 전체를 재시도 대상으로
+            results = [e] * len(messages)
+
+        # 결과 기록과 처리 중 목록에서의 제거를 한 트랜잭션으로
+        async with async_redis.pipeline(transaction=True) as pipe:
+            for payload, error in malformed:
+                print(f"[email dead-lettered] malformed payload: {error}")
+                pipe.lpush(DEAD_LETTER_KEY, json.dumps({"payload": payload, "last_error": str(error)}))
+                pipe.lrem(processing_key, 1, payload)
+            for (payload, message), error in zip(parsed, results):
+                if error is not None:
+                    self._handle_failure(pipe, message, error)
+                pipe.lrem(processing_key, 1, payload)
+            await pipe.execute()
+
+    async def _worker(self, n: int) -> None:
+        sender = create_sender()
+        processing_key = self._processing_key(n)
+        dirty = False
+        try:
+            await async_redis.sadd(PROCESSING_SET_KEY, processing_key)
+            while not self._stopping.is_set():
+                try:
+                    if dirty:
+                        # 이전 배치가 결과 기록 전에 실패했으면 남은 메시지를 큐로 되돌림
+                        await self._requeue(processing_key)
+                        dirty = False
+                    batch = await self._next_batch(processing_key)
+                    if batch:
+                        dirty = True
+                        await self._deliver(sender, processing_key, batch)
+                        dirty = False
+                except RedisError as e:
+                    print(f"[email worker {n}] redis error: {e}")
+                    await asyncio.sleep(1)
+                except Exception as e:
+                    print(f"[email worker {n}] unexpected error: {e!r}")
+                    await asyncio.sleep(1)
+        finally:
+            # 종료 시 발송 결과를 기록하지 못한 메시지는 큐로 되돌림 (중복 발송 가능, 유실 없음)
+            try:
+                await self._requeue(processing_key)
+                await async_redis.srem(PROCESSING_SET_KEY, processing_key)
+            except RedisError as e:
+                print(f"[email worker {n}] requeue on shutdown failed: {e}")
+            await asyncio.to_thread(sender.close)
+
+    async def run_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+
+email_dispatcher = EmailDispatcher()
+
+
+if __name__ == "__main__":
+    # API 서버와 분리된 전용 발송 워커로 실행: python -m services.email_dispatch
+    asyncio.run(email_dispatcher.run_forever())
@@ -1,8 +1,28 @@
 import random
 import string
-from redis import Redis
 from datetime import timedelta
-from config.fastapi import REDIS_HOST, REDIS_PORT
+from services.redis_client import async_redis
+from services.email_dispatch import email_dispatcher
+from services.metrics import observe_redis
+
+# 코드 확인, 시도 횟수 차감, 키 삭제를 한 번의 왕복으로 원자적으로 처리
+# 반환값: {성공 여부(1/0), 남은 시도 횟수(-1은 None)}
+VERIFY_CODE_SCRIPT = """
+local attempts = redis.call('GET', KEYS[2])
+if not attempts then
+    return {0, -1}
+end
+attempts = tonumber(attempts)
+if attempts <= 0 then
+    return {0, 0}
+end
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return {0, redis.call('DECR', KEYS[2])}
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+return {1, -1}
+"""
+
 
 class EmailVerificationService:
     CODE_TTL = 300
@@ -14,11 +34,8 @@ class EmailVerificationService:
     KEY_VERIFIED = "verified_email:{}"
 
     def __init__(self):
-        self.r = Redis(
-            host=REDIS_HOST,
-            port=REDIS_PORT,
-            decode_responses=True,
-        )
+        self.ar = async_redis
+        self._verify_script_async = self.ar.register_script(VERIFY_CODE_SCRIPT)
 
     def _key_code(self, email: str) -> str:
         return self.KEY_CODE.format(email)
@@ -32,44 +49,48 @@ class EmailVerificationService:
     def _generate_code(self, length=6) -> str:
         return "".join(random.choices(string.digits, k=length))
 
-    def send_verification_code(self, email: str) -> int:
-        code = self._generate_code()
-        self.r.setex(self._key_code(email), timedelta(seconds=self.CODE_TTL), code)
-        self.r.setex(
+    def _queue_code(self, pipe, email: str, code: str) -> None:
+        pipe.setex(self._key_code(email), timedelta(seconds=self.CODE_TTL), code)
+        pipe.setex(
             self._key_attempts(email),
             timedelta(seconds=self.CODE_TTL),
             self.ATTEMPT_LIMIT,
         )
+        # 실제 발송은 백그라운드 워커가 처리
+        email_dispatcher.queue(
+            pipe,
+            to=email,
+            subject="Your verification code",
+            body=(
+                f"Your verification code is {code}.\n"
+                f"It expires in {self.CODE_TTL // 60} minutes."
+            ),
+        )
 
-        # TODO 실제 인증 이메일 보내도록
-        print(f"[DEBUG] Sent to {email}: code = {code}")
-        return self.CODE_TTL
-
-    def verify_code(self, email: str, code: str) -> tuple[bool, int | None]:
-        attempts_key = self._key_attempts(email)
-        stored_code = self.r.get(self._key_code(email))
-        attempts = self.r.get(attempts_key)
-
-        if attempts is None:
-            return False, None
-
-        attempts_left = int(attempts)
-        if attempts_left <= 0:
-            return False, 0
+    def _parse_verify_result(self, result: list) -> tuple[bool, int | None]:
+        success, remaining = int(result[0]), int(result[1])
+        return success == 1, None if remaining < 0 else remaining
 
-        if code != stored_code:
-            self.r.decr(attempts_key)
-            return False, attempts_left - 1
+    async def send_verification_code_async(self, email: str) -> int:
+        code = self._generate_code()
+        async with self.ar.pipeline() as pipe:
+            self._queue_code(pipe, email, code)
+            with observe_redis("send_code"):
+                await pipe.execute()
+        return self.CODE_TTL
 
-        self.r.delete(self._key_code(email))
-        self.r.delete(attempts_key)
-        return True, None
+    async def verify_code_async(self, email: str, code: str) -> tuple[bool, int | None]:
+        with observe_redis("verify_code"):
+            result = await self._verify_script_async(
+                keys=[self._key_code(email), self._key_attempts(email)], args=[code]
+            )
+        return self._parse_verify_result(result)
 
-    def mark_verified(self, email: str) -> None:
-        self.r.set(self._key_verified(email), "true", ex=self.VERIFIED_TTL)
+    async def mark_verified_async(self, email: str) -> None:
+        await self.ar.set(self._key_verified(email), "true", ex=self.VERIFIED_TTL)
 
-    def is_verified(self, email: str) -> bool:
-        return self.r.get(self._key_verified(email)) == "true"
+    async def is_verified_async(self, email: str) -> bool:
+        return await self.ar.get(self._key_verified(email)) == "true"
 
 
 email_service = EmailVerificationService()
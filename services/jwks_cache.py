@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import Callable
+import httpx
+from jose.exceptions import JWKError
+from config.fastapi import (
+    JWKS_DEFAULT_TTL,
+    JWKS_MIN_TTL,
+    JWKS_MAX_TTL,
+    JWKS_MIN_REFETCH_INTERVAL,
+)
+from services.keycloak_http import keycloak_http
+from services.resilience import CircuitOpenError
+from services.metrics import JWKS_CACHE_HIT, JWKS_CACHE_MISS
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+
+class JWKSCache:
+    def __init__(self, jwks_url: str, key_loader: Callable[[dict], object]):
+        self.jwks_url = jwks_url
+        self.key_loader = key_loader
+        self.jwks: dict | None = None
+        self.keys: dict[str, object] = {}
+        # /public-key 응답용으로 미리 직렬화한 본문과 ETag
+        self.body: bytes = b""
+        self.etag: str = ""
+        self.expires_at = 0.0
+        self._last_fetch_attempt = 0.0
+        self._inflight: asyncio.Future | None = None
+
+    def _ttl_from_headers(self, headers: httpx.Headers) -> int:
+        cache_control = headers.get("cache-control", "")
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return JWKS_DEFAULT_TTL
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if not match:
+            return JWKS_DEFAULT_TTL
+        return min(max(int(match.group(1)), JWKS_MIN_TTL), JWKS_MAX_TTL)
+
+    def _parse_keys(self, jwks: dict) -> dict[str, object]:
+        keys = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid or key_data.get("use", "sig") != "sig":
+                continue
+            try:
+                keys[kid] = self.key_loader(key_data)
+            except (JWKError, KeyError, ValueError) as e:
+                print(f"[JWKS key parse failed] kid={kid}: {e}")
+        return keys
+
+    async def _fetch(self) -> None:
+        self._last_fetch_attempt = time.monotonic()
+        response = await keycloak_http.request("certs", "GET", self.jwks_url)
+        response.raise_for_status()
+        jwks = response.json()
+
+        # 파싱이 끝난 뒤 한 번에 교체해서 읽는 쪽이 중간 상태를 보지 않도록 함
+        keys = self._parse_keys(jwks)
+        body = json.dumps(jwks, separators=(",", ":"), sort_keys=True).encode()
+        self.keys = keys
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        self.jwks = jwks
+        self.expires_at = time.monotonic() + self._ttl_from_headers(response.headers)
+
+    def _clear_inflight(self, _future: asyncio.Future) -> None:
+        self._inflight = None
+
+    async def refresh(self) -> None:
+        # 동시에 들어온 갱신 요청은 하나의 fetch로 합침
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._clear_inflight)
+        await asyncio.shield(self._inflight)
+
+    def is_stale(self) -> bool:
+        return self.jwks is None or time.monotonic() >= self.expires_at
+
+    async def refresh_if_stale(self) -> None:
+        if not self.is_stale():
+            return
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError, CircuitOpenError) as e:
+            print(f"[JWKS refresh failed] {e}")
+
+    async def get_jwks(self) -> dict:
+        if self.jwks is None:
+            await self.refresh()
+        return self.jwks
+
+    async def get_serialized(self) -> tuple[bytes, str]:
+        # 만료된 캐시도 그대로 제공하고 갱신은 스케줄러(refresh_if_stale)에 맡김
+        if self.jwks is None:
+            await self.refresh()
+        return self.body, self.etag
+
+    async def get_key(self, kid: str):
+        key = self.keys.get(kid)
+        if key is not None:
+            JWKS_CACHE_HIT.inc()
+            return key
+        JWKS_CACHE_MISS.inc()
+
+        if self.jwks is None:
+            await self.refresh()
+            return self.keys.get(kid)
+
+        # 알 수 없는 kid: 키 회전 가능성이 있으므로 재조회하되 빈도 제한
+        if self._inflight is None and (
+            time.monotonic() - self._last_fetch_attempt < JWKS_MIN_REFETCH_INTERVAL
+        ):
+            return None
+        try:
+            await self.refresh()
+        except (httpx.HTTPError, ValueError, CircuitOpenError) as e:
+            print(f"[JWKS refetch on unknown kid failed] {e}")
+            return None
+        return self.keys.get(kid)
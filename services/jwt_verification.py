@@ -1,45 +1,455 @@
+import asyncio
+import base64
+import binascii
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import Request, Response, HTTPException
-from jose import jwt, JWTError
+from jose import jwk, jws
+from jose.exceptions import JOSEError
 from typing import Optional
-import requests
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
 from config.keycloak import settings
+from config.fastapi import (
+    JWT_BACKEND,
+    JWT_ALGORITHMS,
+    JWT_LEEWAY,
+    JWT_VERIFY_ISSUER,
+    JWT_EXPECTED_ISSUER,
+    REFRESH_COALESCE_GRACE,
+    REFRESH_COALESCE_REDIS,
+    REFRESH_COALESCE_LOCK_TTL,
+    REFRESH_COALESCE_WAIT_TIMEOUT,
+    TOKEN_BATCH_WORKERS,
+    TOKEN_BATCH_PARALLEL_THRESHOLD,
+    KEYCLOAK_TRUSTED_ISSUERS,
+    KEYCLOAK_MAX_REALMS,
+    KEYCLOAK_REALM_CLIENTS_FILE,
+)
+from services.keycloak_http import keycloak_http
+from services.jwks_cache import JWKSCache
+from services.token_cache import token_cache
+from services.single_flight import SingleFlight
+from services.revocation import revocation_index
+from services.session_store import session_store, session_mode_enabled
+from services.refresh_ahead import refresh_ahead
+from config.fastapi import SESSION_COOKIE_NAME, REFRESH_AHEAD_BATCH_SIZE
+from redis.exceptions import RedisError
+from services.metrics import JWT_DECODE_DURATION, TOKEN_REFRESH_REQUESTS
 
 
-class TokenVerifier:
-    def __init__(self):
-        self.jwks = None
+class TokenValidationError(Exception):
+    pass
+
+
+def _b64url_decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+class JWTBackend:
+    name = ""
+    SUPPORTED_ALGORITHMS = ("RS256", "RS384", "RS512")
+
+    def __init__(self, algorithms: list[str] = JWT_ALGORITHMS):
+        unsupported = set(algorithms) - set(self.SUPPORTED_ALGORITHMS)
+        if unsupported:
+            raise ValueError(f"Unsupported JWT algorithms: {sorted(unsupported)}")
+        self.algorithms = list(algorithms)
+
+    def key_algorithms(self, key_data: dict) -> list[str]:
+        # JWK에 alg가 명시돼 있으면 그 알고리즘으로만 검증
+        alg = key_data.get("alg")
+        if alg is None:
+            return list(self.algorithms)
+        return [alg] if alg in self.algorithms else []
+
+    def select_key(self, alg, keys: dict):
+        # keys: load_key가 만든 {alg: key}. 헤더의 alg가 허용 목록과 JWK 모두에 맞아야 함
+        if alg not in keys:
+            raise TokenValidationError("The specified alg value is not allowed")
+        return keys[alg]
+
+    def load_key(self, key_data: dict) -> dict:
+        raise NotImplementedError
+
+    def verify_signature(self, token: str, keys: dict) -> dict:
+        raise NotImplementedError
+
+    def get_unverified_header(self, token: str) -> dict:
+        try:
+            header = json.loads(_b64url_decode(token.split(".", 1)[0]))
+        except (ValueError, binascii.Error) as e:
+            raise TokenValidationError(f"Error decoding token headers. {e}")
+        if not isinstance(header, dict):
+            raise TokenValidationError("Invalid header string")
+        return header
+
+
+class JoseBackend(JWTBackend):
+    name = "jose"
+
+    def load_key(self, key_data: dict) -> dict:
+        return {alg: jwk.construct(key_data, alg) for alg in self.key_algorithms(key_data)}
+
+    def verify_signature(self, token: str, keys: dict) -> dict:
+        alg = self.get_unverified_header(token).get("alg")
+        key = self.select_key(alg, keys)
+        try:
+            payload = jws.verify(token, key, algorithms=[alg])
+            return json.loads(payload)
+        except (JOSEError, ValueError) as e:
+            raise TokenValidationError(str(e))
+
+
+class CryptographyBackend(JWTBackend):
+    name = "cryptography"
+    HASHES = {
+        "RS256": hashes.SHA256,
+        "RS384": hashes.SHA384,
+        "RS512": hashes.SHA512,
+    }
+
+    def load_key(self, key_data: dict) -> dict:
+        if key_data.get("kty") != "RSA":
+            raise ValueError(f"Unsupported key type: {key_data.get('kty')}")
+        n = int.from_bytes(_b64url_decode(key_data["n"]), "big")
+        e = int.from_bytes(_b64url_decode(key_data["e"]), "big")
+        key = rsa.RSAPublicNumbers(e, n).public_key()
+        return {alg: key for alg in self.key_algorithms(key_data)}
+
+    def verify_signature(self, token: str, keys: dict) -> dict:
+        # 세그먼트에 ASCII 이외 문자가 있으면 encode/base64 단계에서 ValueError(UnicodeEncodeError 포함)
+        try:
+            signing_input, signature_b64 = token.rsplit(".", 1)
+            header_b64, payload_b64 = signing_input.split(".", 1)
+            message = signing_input.encode("ascii")
+            header = json.loads(_b64url_decode(header_b64))
+            signature = _b64url_decode(signature_b64)
+        except (ValueError, binascii.Error) as e:
+            raise TokenValidationError(f"Error decoding token. {e}")
+        if not isinstance(header, dict):
+            raise TokenValidationError("Invalid header string")
+
+        alg = header.get("alg")
+        key = self.select_key(alg, keys)
+
+        try:
+            key.verify(signature, message, padding.PKCS1v15(), self.HASHES[alg]())
+        except InvalidSignature:
+            raise TokenValidationError("Signature verification failed.")
+
+        try:
+            payload = json.loads(_b64url_decode(payload_b64))
+        except (ValueError, binascii.Error) as e:
+            raise TokenValidationError(f"Invalid payload string. {e}")
+        if not isinstance(payload, dict):
+            raise TokenValidationError("Invalid payload string")
+        return payload
+
+
+JWT_BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    CryptographyBackend.name: CryptographyBackend,
+}
+
+
+def get_jwt_backend(name: str = JWT_BACKEND) -> JWTBackend:
+    if name not in JWT_BACKENDS:
+        raise ValueError(f"Unknown JWT backend: {name}")
+    return JWT_BACKENDS[name]()
+
+
+def validate_claims(
+    claims: dict, audience: str | None, issuer: str | None, leeway: int = JWT_LEEWAY
+) -> None:
+    if not isinstance(claims, dict):
+        raise TokenValidationError("Invalid payload string: must be a json object")
+
+    now = time.time()
+    exp = claims.get("exp")
+    if not isinstance(exp, (int, float)):
+        raise TokenValidationError("Expiration Time claim (exp) must be an integer.")
+    if exp <= now - leeway:
+        raise TokenValidationError("Signature has expired.")
+
+    nbf = claims.get("nbf")
+    if isinstance(nbf, (int, float)) and nbf > now + leeway:
+        raise TokenValidationError("The token is not yet valid (nbf)")
+
+    if audience is not None:
+        aud = claims.get("aud")
+        audiences = aud if isinstance(aud, list) else [aud]
+        if audience not in audiences:
+            raise TokenValidationError("Invalid audience")
 
-    def get_jwks(self):
-        if self.jwks is None:
-            self.jwks = self._fetch_jwks()
-        return self.jwks
+    if issuer is not None and claims.get("iss") != issuer:
+        raise TokenValidationError("Invalid issuer")
 
-    def _fetch_jwks(self):
-        response = requests.get(
-            f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/certs"
+
+def certs_url(issuer_base: str) -> str:
+    return f"{issuer_base}/protocol/openid-connect/certs"
+
+
+def load_realm_clients(path: str) -> dict[str, tuple[str, str]]:
+    # bootstrap_realms.py --secrets-out 형식 ({realm: {clientId: secret}}) -> realm별 (client_id, secret)
+    if not path:
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    clients = {}
+    for realm, secrets in data.items():
+        if settings.KEYCLOAK_CLIENT_ID in secrets:
+            clients[realm] = (settings.KEYCLOAK_CLIENT_ID, secrets[settings.KEYCLOAK_CLIENT_ID])
+        elif len(secrets) == 1:
+            clients[realm] = next(iter(secrets.items()))
+    return clients
+
+
+class RealmVerifier:
+    # realm(issuer)별 서명 키 캐시와 token/logout 호출에 쓸 client. issuer가 None이면 issuer 검증 안 함
+    def __init__(
+        self,
+        issuer: str | None,
+        base_url: str,
+        backend: JWTBackend,
+        client_id: str = settings.KEYCLOAK_CLIENT_ID,
+        client_secret: str = settings.KEYCLOAK_CLIENT_SECRET,
+    ):
+        self.issuer = issuer
+        self.base_url = base_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.jwks_cache = JWKSCache(certs_url(base_url), key_loader=backend.load_key)
+
+    def oidc_url(self, path: str) -> str:
+        return f"{self.base_url}/protocol/openid-connect/{path}"
+
+
+batch_executor = ThreadPoolExecutor(
+    max_workers=TOKEN_BATCH_WORKERS, thread_name_prefix="jwt-verify"
+)
+
+
+class TokenVerifier:
+    def __init__(
+        self,
+        backend: JWTBackend | None = None,
+        trusted_issuers: list[str] = KEYCLOAK_TRUSTED_ISSUERS,
+        max_realms: int = KEYCLOAK_MAX_REALMS,
+        realm_clients: dict[str, tuple[str, str]] | None = None,
+    ):
+        self.backend = backend or get_jwt_backend()
+        default_issuer = JWT_EXPECTED_ISSUER or f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}"
+        self.issuer = default_issuer if JWT_VERIFY_ISSUER else None
+        self.default_realm = RealmVerifier(
+            self.issuer,
+            f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}",
+            self.backend,
         )
-        response.raise_for_status()
-        return response.json()
+        self.jwks_cache = self.default_realm.jwks_cache
 
-    def decode_token(self, token: str, audience="account") -> dict:
+        # 허용 issuer -> Keycloak 기본 URL. realm 이름만 적으면 기본 issuer와 같은 호스트의 realm,
+        # 키 조회와 token/logout 호출은 내부 KEYCLOAK_URL로
+        issuer_host = default_issuer.rsplit("/realms/", 1)[0]
+        self.trusted_issuers: dict[str, str] = {}
+        for entry in trusted_issuers:
+            if "://" in entry:
+                self.trusted_issuers[entry] = entry
+            else:
+                self.trusted_issuers[f"{issuer_host}/realms/{entry}"] = (
+                    f"{settings.KEYCLOAK_URL}/realms/{entry}"
+                )
+        self.trusted_issuers.pop(default_issuer, None)
+        self.realm_clients = realm_clients if realm_clients is not None else load_realm_clients(
+            KEYCLOAK_REALM_CLIENTS_FILE
+        )
+        self.max_realms = max_realms
+        # 처음 쓰일 때 만들고, 오래 안 쓰인 realm부터 제거
+        self._realms: OrderedDict[str, RealmVerifier] = OrderedDict()
+        self._decode_duration = JWT_DECODE_DURATION.labels(self.backend.name)
+        self.refresh_flight = SingleFlight(
+            "refresh_flight",
+            grace=REFRESH_COALESCE_GRACE,
+            use_redis=REFRESH_COALESCE_REDIS,
+            lock_ttl=REFRESH_COALESCE_LOCK_TTL,
+            wait_timeout=REFRESH_COALESCE_WAIT_TIMEOUT,
+        )
+
+    async def get_jwks(self) -> dict:
+        return await self.jwks_cache.get_jwks()
+
+    def _unverified_issuer(self, token: str) -> str | None:
         try:
-            return jwt.decode(
-                token,
-                self.get_jwks(),
-                algorithms=["RS256"],
-                audience=audience,
-                options={"verify_aud": True},
-            )
-        except JWTError as e:
+            claims = json.loads(_b64url_decode(token.split(".")[1]))
+        except (IndexError, ValueError, binascii.Error) as e:
+            raise HTTPException(status_code=401, detail=f"INVALID_TOKEN: Error decoding payload. {e}")
+        return claims.get("iss") if isinstance(claims, dict) else None
+
+    def realm_for(self, token: str) -> RealmVerifier:
+        # 서명 검증 전의 iss로 realm을 고르고, 서명 검증 후 같은 issuer인지 다시 확인
+        if not self.trusted_issuers:
+            return self.default_realm
+        return self.realm_for_issuer(self._unverified_issuer(token))
+
+    def realm_for_issuer(self, issuer: str | None) -> RealmVerifier:
+        if not self.trusted_issuers:
+            return self.default_realm
+        realm = self._realms.get(issuer)
+        if realm is not None:
+            self._realms.move_to_end(issuer)
+            return realm
+        if issuer not in self.trusted_issuers:
+            if self.issuer is None or issuer == self.issuer:
+                return self.default_realm
+            raise HTTPException(status_code=401, detail="INVALID_TOKEN: Untrusted issuer")
+
+        base_url = self.trusted_issuers[issuer]
+        client = self.realm_clients.get(base_url.rsplit("/realms/", 1)[1], ())
+        realm = self._realms[issuer] = RealmVerifier(issuer, base_url, self.backend, *client)
+        while len(self._realms) > self.max_realms:
+            self._realms.popitem(last=False)
+        return realm
+
+    def is_default_realm(self, claims: dict) -> bool:
+        # 검증된 claims의 iss 기준. 기본 realm에서만 동작하는 API(탈퇴 등)에서 사용
+        try:
+            return self.realm_for_issuer(claims.get("iss")) is self.default_realm
+        except HTTPException:
+            return False
+
+    async def refresh_stale_keys(self) -> None:
+        # 스케줄러용: 로드된 realm마다 독립적으로 JWKS 갱신
+        realms = [self.default_realm, *self._realms.values()]
+        await asyncio.gather(*(realm.jwks_cache.refresh_if_stale() for realm in realms))
+
+    async def resolve_key(self, token: str) -> tuple[object, str | None]:
+        # (서명 키, 기대하는 issuer)
+        realm = self.realm_for(token)
+        try:
+            kid = self.backend.get_unverified_header(token).get("kid")
+        except TokenValidationError as e:
+            raise HTTPException(status_code=401, detail=f"INVALID_TOKEN: {str(e)}")
+        if not kid:
+            raise HTTPException(status_code=401, detail="INVALID_TOKEN: Missing kid")
+
+        key = await realm.jwks_cache.get_key(kid)
+        if key is None:
+            raise HTTPException(status_code=401, detail="INVALID_TOKEN: Unknown kid")
+        return key, realm.issuer
+
+    def decode_token(self, token: str, resolved: tuple[object, str | None], audience="account") -> dict:
+        key, issuer = resolved
+        started = time.perf_counter()
+        try:
+            claims = self.backend.verify_signature(token, key)
+            validate_claims(claims, audience, issuer)
+        except TokenValidationError as e:
             raise HTTPException(status_code=401, detail=f"INVALID_TOKEN: {str(e)}")
+        finally:
+            self._decode_duration.observe(time.perf_counter() - started)
+
+        self.check_not_revoked(claims)
+        token_cache.put(token, audience, claims)
+        return claims
+
+    def check_not_revoked(self, claims: dict) -> None:
+        if revocation_index.is_revoked(claims):
+            raise HTTPException(status_code=401, detail="TOKEN_REVOKED")
+
+    async def verify(self, token: str, audience="account") -> dict:
+        # 이미 검증된 토큰이면 서명 검증(RSA) 없이 캐시된 claims 반환
+        claims = token_cache.get(token, audience)
+        if claims is not None:
+            self.check_not_revoked(claims)
+            return claims
+
+        resolved = await self.resolve_key(token)
+        return self.decode_token(token, resolved, audience)
+
+    async def _resolve_key_or_error(self, token: str):
+        try:
+            return await self.resolve_key(token)
+        except HTTPException as e:
+            return e
 
-    def try_refresh(self, refresh_token: str) -> dict:
-        response = requests.post(
-            f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/token",
+    def _decode_chunk(self, chunk: list[tuple[str, tuple]], audience: str) -> list:
+        results = []
+        for token, resolved in chunk:
+            try:
+                results.append(self.decode_token(token, resolved, audience))
+            except HTTPException as e:
+                results.append(e)
+        return results
+
+    async def verify_many(
+        self, tokens: list[str], audience="account", parallel: bool = True
+    ) -> list[dict | HTTPException]:
+        results: list[dict | HTTPException | None] = [None] * len(tokens)
+
+        pending = []
+        for i, token in enumerate(tokens):
+            claims = token_cache.get(token, audience)
+            if claims is None:
+                pending.append(i)
+                continue
+            try:
+                self.check_not_revoked(claims)
+                results[i] = claims
+            except HTTPException as e:
+                results[i] = e
+
+        # 같은 kid는 JWKS 캐시에서 한 번만 조회됨
+        keys = await asyncio.gather(
+            *(self._resolve_key_or_error(tokens[i]) for i in pending)
+        )
+        indexes, work = [], []
+        for i, key in zip(pending, keys):
+            if isinstance(key, HTTPException):
+                results[i] = key
+            else:
+                indexes.append(i)
+                work.append((tokens[i], key))
+
+        if parallel and len(work) >= TOKEN_BATCH_PARALLEL_THRESHOLD:
+            # 서명 검증(CPU)을 스레드 풀로 넘겨 이벤트 루프를 막지 않음
+            size = -(-len(work) // TOKEN_BATCH_WORKERS)
+            chunks = [work[n : n + size] for n in range(0, len(work), size)]
+            loop = asyncio.get_running_loop()
+            decoded = await asyncio.gather(
+                *(
+                    loop.run_in_executor(batch_executor, self._decode_chunk, chunk, audience)
+                    for chunk in chunks
+                )
+            )
+            decoded = [result for chunk in decoded for result in chunk]
+        else:
+            decoded = self._decode_chunk(work, audience)
+
+        for i, result in zip(indexes, decoded):
+            results[i] = result
+        return results
+
+    async def try_refresh(self, refresh_token: str) -> dict:
+        # 같은 refresh token으로 동시에 들어온 요청은 Keycloak 호출 하나를 공유
+        TOKEN_REFRESH_REQUESTS.inc()
+        return await self.refresh_flight.do(
+            refresh_token, lambda: self._request_refresh(refresh_token)
+        )
+
+    async def _request_refresh(self, refresh_token: str) -> dict:
+        # refresh token을 발급한 realm의 token 엔드포인트와 client로 갱신
+        realm = self.realm_for(refresh_token)
+        response = await keycloak_http.request(
+            "refresh",
+            "POST",
+            realm.oidc_url("token"),
             data={
                 "grant_type": "refresh_token",
-                "client_id": settings.KEYCLOAK_CLIENT_ID,
-                "client_secret": settings.KEYCLOAK_CLIENT_SECRET,
+                "client_id": realm.client_id,
+                "client_secret": realm.client_secret,
                 "refresh_token": refresh_token,
             },
         )
@@ -52,32 +462,85 @@ class TokenVerifier:
         if actual_username != expected_username:
             raise HTTPException(status_code=401, detail="USERNAME_MISMATCH")
 
-    def refresh_if_valid(self, refresh_token: str, response: Response) -> dict:
+    async def refresh_if_valid(self, refresh_token: str, response: Response) -> dict:
         if not refresh_token:
             raise HTTPException(status_code=401, detail="NO_REFRESH_TOKEN")
 
-        new_tokens = self.try_refresh(refresh_token)
+        new_tokens = await self.try_refresh(refresh_token)
+        self.set_token_cookies(response, new_tokens)
+        return new_tokens
 
+    def set_token_cookies(self, response: Response, tokens: dict) -> None:
         response.set_cookie(
             key="access_token",
-            value=new_tokens["access_token"],
+            value=tokens["access_token"],
             httponly=True,
             secure=True,
             samesite="Lax",
         )
         response.set_cookie(
             key="refresh_token",
-            value=new_tokens["refresh_token"],
+            value=tokens["refresh_token"],
             httponly=True,
             secure=True,
             samesite="Lax",
         )
 
-        return new_tokens
+    async def _refresh_session_key(self, key: str) -> None:
+        try:
+            record = await session_store.get_by_key(key)
+            if record is None or revocation_index.is_revoked(record["claims"]):
+                return
+            new_tokens = await self.try_refresh(record["refresh_token"])
+            claims = await self.verify(new_tokens["access_token"])
+            await session_store.update_by_key(key, new_tokens, claims)
+        except (HTTPException, RedisError) as e:
+            # 실패하면 만료 시점의 요청 경로에서 다시 갱신
+            print(f"[refresh-ahead session failed] {getattr(e, 'detail', e)}")
+
+    async def refresh_due_sessions(self) -> None:
+        # 세션 모드: 만료 REFRESH_AHEAD_WINDOW초 전에 도달한 세션을 백그라운드에서 갱신
+        try:
+            keys = await session_store.claim_due(REFRESH_AHEAD_BATCH_SIZE)
+        except RedisError as e:
+            print(f"[refresh-ahead claim failed] {e}")
+            return
+        await asyncio.gather(*(self._refresh_session_key(key) for key in keys))
+
+    async def refresh_session(self, session_id: str, force: bool = False) -> dict:
+        # 다른 워커가 이미 갱신했을 수 있으므로 로컬 캐시를 건너뛰고 다시 읽음
+        latest = await session_store.get(session_id, use_local=False)
+        if latest is None:
+            raise HTTPException(status_code=401, detail="SESSION_EXPIRED")
+        self.check_not_revoked(latest["claims"])
+        if not force and latest["claims"].get("exp", 0) > time.time():
+            return latest
+
+        new_tokens = await self.try_refresh(latest["refresh_token"])
+        claims = await self.verify(new_tokens["access_token"])
+        return await session_store.update(session_id, new_tokens, claims)
+
+    async def get_session_payload(self, session_id: str) -> dict:
+        # 세션 모드: JWT 파싱 없이 로컬 캐시 또는 Redis GET 한 번으로 claims 반환
+        record = await session_store.get(session_id)
+        if record is None:
+            raise HTTPException(status_code=401, detail="SESSION_EXPIRED")
+
+        claims = record["claims"]
+        self.check_not_revoked(claims)
+        if claims.get("exp", 0) > time.time():
+            return claims
+
+        record = await self.refresh_session(session_id)
+        return record["claims"]
 
     async def get_valid_token_payload(
         self, request: Request, response: Response
     ) -> dict:
+        session_id = request.cookies.get(SESSION_COOKIE_NAME)
+        if session_mode_enabled() and session_id:
+            return await self.get_session_payload(session_id)
+
         access_token = request.cookies.get("access_token")
         if not access_token:
             raise HTTPException(status_code=401, detail="NO_ACCESS_TOKEN")
@@ -85,10 +548,29 @@ class TokenVerifier:
         refresh_token: Optional[str] = request.cookies.get("refresh_token")
 
         try:
-            return self.decode_token(access_token)
+            claims = await self.verify(access_token)
         except HTTPException as e:
-            new_tokens = self.refresh_if_valid(refresh_token, response)
-            return self.decode_token(new_tokens["access_token"])
+            # 로그아웃된 세션은 refresh로 되살리지 않음
+            if e.detail == "TOKEN_REVOKED":
+                raise
+            # 백그라운드에서 이미 갱신했다면 회전된 refresh token을 다시 쓰지 않고 그 결과를 사용
+            pending = (
+                await refresh_ahead.get_pending(refresh_token, wait=True) if refresh_token else None
+            )
+            if pending is not None:
+                self.set_token_cookies(response, pending)
+                return await self.verify(pending["access_token"])
+            new_tokens = await self.refresh_if_valid(refresh_token, response)
+            return await self.verify(new_tokens["access_token"])
+
+        # 만료가 가까우면 백그라운드 갱신을 예약하고, 준비된 새 토큰이 있으면 이번 응답에서 쿠키 교체
+        if refresh_token and refresh_ahead.is_due(claims):
+            pending = await refresh_ahead.get_pending(refresh_token)
+            if pending is not None:
+                self.set_token_cookies(response, pending)
+                return await self.verify(pending["access_token"])
+            refresh_ahead.schedule(refresh_token, self.try_refresh)
+        return claims
 
 
 token_verifier = TokenVerifier()
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import httpx
+from config.keycloak import settings
+from config.fastapi import KEYCLOAK_ADMIN_TOKEN_REFRESH_MARGIN
+from services.keycloak_http import keycloak_http
+
+
+class KeycloakAdminError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AsyncKeycloakAdmin:
+    def __init__(self, realm: str = settings.KEYCLOAK_REALM):
+        self.realm = realm
+        self.base_url = f"{settings.KEYCLOAK_URL}/admin/realms/{realm}"
+        self.token_url = f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/token"
+        self._access_token: str | None = None
+        self._refresh_token: str | None = None
+        self._access_expires_at = 0.0
+        self._refresh_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._realm_roles: dict[str, dict] = {}
+
+    def _token_is_fresh(self) -> bool:
+        return (
+            self._access_token is not None
+            and time.monotonic() < self._access_expires_at - KEYCLOAK_ADMIN_TOKEN_REFRESH_MARGIN
+        )
+
+    async def _request_token(self, data: dict) -> httpx.Response:
+        return await keycloak_http.request(
+            "admin_token", "POST", self.token_url, data={"client_id": "admin-cli", **data}
+        )
+
+    async def _obtain_token(self) -> None:
+        response = None
+        if self._refresh_token and time.monotonic() < self._refresh_expires_at:
+            response = await self._request_token(
+                {"grant_type": "refresh_token", "refresh_token": self._refresh_token}
+            )
+        if response is None or response.status_code != 200:
+            response = await self._request_token(
+                {
+                    "grant_type": "password",
+                    "username": settings.KEYCLOAK_ADMIN_USERNAME,
+                    "password": settings.KEYCLOAK_ADMIN_PASSWORD,
+                }
+            )
+        if response.status_code != 200:
+            raise KeycloakAdminError(response.status_code, "ADMIN_AUTH_FAILED")
+
+        token = response.json()
+        now = time.monotonic()
+        self._access_token = token["access_token"]
+        self._access_expires_at = now + token.get("expires_in", 60)
+        self._refresh_token = token.get("refresh_token")
+        self._refresh_expires_at = now + token.get("refresh_expires_in", 0)
+
+    async def get_access_token(self) -> str:
+        # 만료 직전에 미리 갱신하고, 동시에 들어온 요청은 한 번만 갱신
+        if not self._token_is_fresh():
+            async with self._token_lock:
+                if not self._token_is_fresh():
+                    await self._obtain_token()
+        return self._access_token
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        for attempt in range(2):
+            token = await self.get_access_token()
+            response = await keycloak_http.request(
+                "admin",
+                method,
+                f"{self.base_url}{path}",
+                headers={"Authorization": f"Bearer {token}"},
+                **kwargs,
+            )
+            if response.status_code != 401 or attempt:
+                break
+            # 서버 쪽에서 세션이 끊긴 경우 토큰을 버리고 한 번만 재시도
+            self._access_token = None
+        if response.status_code >= 400:
+            raise KeycloakAdminError(response.status_code, response.text)
+        return response
+
+    async def create_user(self, payload: dict) -> str:
+        response = await self._request("POST", "/users", json=payload)
+        return response.headers["Location"].rstrip("/").rsplit("/", 1)[-1]
+
+    async def get_realm_role(self, role_name: str) -> dict:
+        # 역할 정보는 바뀌지 않으므로 한 번만 조회
+        role = self._realm_roles.get(role_name)
+        if role is None:
+            response = await self._request("GET", f"/roles/{role_name}")
+            role = self._realm_roles[role_name] = response.json()
+        return role
+
+    async def assign_realm_roles(self, user_id: str, roles: list[dict]) -> None:
+        await self._request("POST", f"/users/{user_id}/role-mappings/realm", json=roles)
+
+    async def get_users(self, query: dict) -> list[dict]:
+        response = await self._request("GET", "/users", params=query)
+        return response.json()
+
+    async def find_user_id(self, username: str) -> str | None:
+        # 기본 검색은 부분 일치 + 페이지네이션이라 대규모 realm에서 느림
+        users = await self.get_users({"username": username, "exact": "true", "max": 1})
+        return users[0]["id"] if users else None
+
+    async def update_user(self, user_id: str, payload: dict) -> None:
+        await self._request("PUT", f"/users/{user_id}", json=payload)
+
+    async def delete_user(self, user_id: str) -> None:
+        await self._request("DELETE", f"/users/{user_id}")
+
+    async def partial_import(self, payload: dict) -> dict:
+        # 여러 사용자를 역할 매핑과 함께 한 번의 요청으로 생성
+        response = await self._request("POST", "/partialImport", json=payload)
+        return response.json()
+
+
+keycloak_admin_async = AsyncKeycloakAdmin()
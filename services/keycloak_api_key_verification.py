@@ -1,7 +1,37 @@
+import hmac
 from fastapi import Header, HTTPException
 from config.keycloak import settings
+from services.api_keys import ApiKey, api_key_registry, hash_api_key, SCOPE_ALL
 
+# .env의 KEYCLOAK_API_KEY는 모든 scope를 가진 키로 계속 허용
+LEGACY_API_KEY = ApiKey(
+    key_hash=hash_api_key(settings.KEYCLOAK_API_KEY),
+    name="legacy",
+    scopes=frozenset({SCOPE_ALL}),
+    quota=None,
+)
 
-def verify_api_key(x_api_key: str = Header(...)):
-    if x_api_key != settings.KEYCLOAK_API_KEY:
-        raise HTTPException(status_code=403, detail="Invalid API Key")
\ No newline at end of file
+
+def _lookup(api_key: str) -> ApiKey | None:
+    if hmac.compare_digest(api_key.encode(), settings.KEYCLOAK_API_KEY.encode()):
+        return LEGACY_API_KEY
+    return api_key_registry.lookup(api_key)
+
+
+def require_api_key(scope: str | None = None):
+    async def dependency(x_api_key: str = Header(...)) -> ApiKey:
+        record = _lookup(x_api_key)
+        if record is None:
+            raise HTTPException(status_code=403, detail="Invalid API Key")
+        if not record.allows(scope):
+            raise HTTPException(status_code=403, detail="API_KEY_SCOPE_DENIED")
+        retry_after = api_key_registry.record_usage(record)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="API_KEY_QUOTA_EXCEEDED",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.5)))},
+            )
+        return record
+
+    return dependency
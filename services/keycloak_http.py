@@ -0,0 +1,86 @@
+import time
+import httpx
+from config.fastapi import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_POOL_TIMEOUT,
+)
+from config.keycloak import settings
+from services.metrics import KEYCLOAK_REQUEST_DURATION
+from services.resilience import call_async
+
+
+class KeycloakOIDCError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def oidc_url(path: str) -> str:
+    # token, logout, userinfo 등 기본 realm의 openid-connect 엔드포인트
+    return f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/{path}"
+
+
+class KeycloakHttpClient:
+    def __init__(self):
+        self._client: httpx.AsyncClient | None = None
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                HTTP_READ_TIMEOUT,
+                connect=HTTP_CONNECT_TIMEOUT,
+                pool=HTTP_POOL_TIMEOUT,
+            ),
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # lifespan 밖(스크립트 등)에서 사용될 때를 위해 지연 생성
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def _send(
+        self, endpoint: str, method: str, url: str, timeout: float, **kwargs
+    ) -> httpx.Response:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await self.client.request(method, url, timeout=timeout, **kwargs)
+            if response.status_code < 500:
+                outcome = "ok"
+            return response
+        finally:
+            KEYCLOAK_REQUEST_DURATION.labels(endpoint, outcome).observe(
+                time.perf_counter() - started
+            )
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        # endpoint: 메트릭 라벨이자 timeout/재시도 정책 키 (certs, refresh, admin 등)
+        return await call_async(
+            endpoint,
+            method,
+            lambda timeout: self._send(endpoint, method, url, timeout, **kwargs),
+        )
+
+    async def start(self) -> None:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+keycloak_http = KeycloakHttpClient()
@@ -0,0 +1,134 @@
+import os
+import time
+from contextlib import contextmanager
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from services.token_cache import token_cache
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+FAST_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+KEYCLOAK_REQUEST_DURATION = Histogram(
+    "keycloak_request_duration_seconds",
+    "Outbound Keycloak call latency",
+    ["endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_roundtrip_duration_seconds",
+    "Redis round-trip latency by operation",
+    ["operation"],
+    buckets=FAST_BUCKETS,
+)
+JWT_DECODE_DURATION = Histogram(
+    "jwt_decode_duration_seconds",
+    "Signature and claims verification time",
+    ["backend"],
+    buckets=FAST_BUCKETS,
+)
+JWKS_CACHE_LOOKUPS = Counter(
+    "jwks_cache_lookups_total", "JWKS key lookups by kid", ["result"]
+)
+TOKEN_REFRESH_REQUESTS = Counter(
+    "token_refresh_requests_total", "Refresh requests before coalescing"
+)
+KEYCLOAK_CIRCUIT_STATE = Gauge(
+    "keycloak_circuit_state",
+    "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["breaker"],
+    multiprocess_mode="max",
+)
+KEYCLOAK_CIRCUIT_REJECTIONS = Counter(
+    "keycloak_circuit_rejections_total", "Calls rejected while the circuit is open", ["endpoint"]
+)
+KEYCLOAK_RETRIES = Counter(
+    "keycloak_retries_total", "Retried Keycloak calls", ["endpoint"]
+)
+KEYCLOAK_HEDGED_REQUESTS = Counter(
+    "keycloak_hedged_requests_total", "Hedged (duplicate) Keycloak requests sent", ["endpoint"]
+)
+PROVISIONED_ROWS = Counter(
+    "provisioning_rows_total", "Bulk provisioning rows by mode and result", ["mode", "status"]
+)
+
+# 요청 경로에서 라벨 조회를 피하기 위해 미리 생성
+JWKS_CACHE_HIT = JWKS_CACHE_LOOKUPS.labels("hit")
+JWKS_CACHE_MISS = JWKS_CACHE_LOOKUPS.labels("miss")
+
+
+@contextmanager
+def observe_redis(operation: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        REDIS_COMMAND_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+
+class TokenCacheCollector:
+    def collect(self):
+        stats = token_cache.stats()
+        for name in ("hits", "misses", "evictions", "expirations"):
+            yield CounterMetricFamily(
+                f"token_cache_{name}", f"Verified-token cache {name}", value=stats[name]
+            )
+        yield GaugeMetricFamily("token_cache_size", "Verified-token cache entries", value=stats["size"])
+
+
+REGISTRY.register(TokenCacheCollector())
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 라우팅 후 scope에 설정되는 route 템플릿을 라벨로 사용 (경로 파라미터로 라벨이 늘어나지 않도록)
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> bytes:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
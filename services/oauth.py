@@ -1,17 +1,108 @@
-from keycloak import KeycloakOpenID
-from config.keycloak import keycloak_openid
+import asyncio
+from urllib.parse import urlencode
+from fastapi import HTTPException
+from config.keycloak import settings
+from config.fastapi import (
+    JWT_EXPECTED_ISSUER,
+    OAUTH_PROFILE_SOURCE,
+    OAUTH_EXTRA_USERINFO_CLAIMS,
+)
+from services.keycloak_http import keycloak_http, oidc_url, KeycloakOIDCError
+from services.jwt_verification import token_verifier
+from services.oauth_state import code_challenge
+
+# id_token에서 사용자 프로필로 옮기는 표준 claim
+PROFILE_CLAIMS = (
+    "sub",
+    "preferred_username",
+    "email",
+    "email_verified",
+    "name",
+    "given_name",
+    "family_name",
+)
+
+
+def _client_form(**fields) -> dict:
+    return {
+        "client_id": settings.KEYCLOAK_CLIENT_ID,
+        "client_secret": settings.KEYCLOAK_CLIENT_SECRET,
+        **fields,
+    }
+
+
+def _json_or_raise(response) -> dict:
+    if response.status_code != 200:
+        raise KeycloakOIDCError(response.status_code, response.text)
+    return response.json()
+
 
 class KeycloakOAuthService:
-    def exchange_code_for_token(self, code: str, redirect_uri: str) -> dict:
-        token = keycloak_openid.token(code=code, redirect_uri=redirect_uri)
-        return token
+    def authorization_url(self, state: dict, idp_hint: str | None = None) -> str:
+        # 브라우저가 접근하는 주소이므로 외부 issuer 기준 (JWT_EXPECTED_ISSUER가 있으면 그 값)
+        issuer = JWT_EXPECTED_ISSUER or f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}"
+        params = {
+            "client_id": settings.KEYCLOAK_CLIENT_ID,
+            "response_type": "code",
+            "scope": "openid profile email",
+            "redirect_uri": state["redirect_uri"],
+            "state": state["state"],
+            "nonce": state["nonce"],
+            "code_challenge": code_challenge(state["code_verifier"]),
+            "code_challenge_method": "S256",
+        }
+        if idp_hint:
+            # 소셜 로그인 IdP(google 등)로 바로 이동
+            params["kc_idp_hint"] = idp_hint
+        return f"{issuer}/protocol/openid-connect/auth?{urlencode(params)}"
+
+    async def exchange_code_for_token_async(
+        self, code: str, redirect_uri: str, code_verifier: str | None = None
+    ) -> dict:
+        form = _client_form(grant_type="authorization_code", code=code, redirect_uri=redirect_uri)
+        if code_verifier:
+            form["code_verifier"] = code_verifier
+        response = await keycloak_http.request("token", "POST", oidc_url("token"), data=form)
+        return _json_or_raise(response)
+
+    async def _verify_id_token(self, id_token: str, nonce: str) -> dict:
+        # 캐시된 JWKS로 로컬 검증. id_token의 aud는 client_id
+        claims = await token_verifier.verify(id_token, audience=settings.KEYCLOAK_CLIENT_ID)
+        if claims.get("nonce") != nonce:
+            raise HTTPException(status_code=401, detail="INVALID_TOKEN: Nonce mismatch")
+        return claims
+
+    async def complete_login_async(self, code: str, state: dict) -> tuple[dict, dict]:
+        # (토큰 응답, 사용자 프로필)
+        token = await self.exchange_code_for_token_async(
+            code, state["redirect_uri"], state["code_verifier"]
+        )
+        id_token = token.get("id_token")
+        if OAUTH_PROFILE_SOURCE == "userinfo" or not id_token:
+            return token, await self.get_user_info_async(token["access_token"])
 
-    def get_user_info(self, access_token: str) -> dict:
-        user_info = keycloak_openid.userinfo(access_token)
-        return user_info
+        if not OAUTH_EXTRA_USERINFO_CLAIMS:
+            claims = await self._verify_id_token(id_token, state["nonce"])
+            return token, {name: claims[name] for name in PROFILE_CLAIMS if name in claims}
 
-    def refresh_token(self, refresh_token: str) -> dict:
-        return keycloak_openid.refresh_token(refresh_token)
+        # 추가 claim이 필요하면 id_token 검증과 userinfo 호출을 동시에 진행
+        claims, user_info = await asyncio.gather(
+            self._verify_id_token(id_token, state["nonce"]),
+            self.get_user_info_async(token["access_token"]),
+        )
+        if user_info.get("sub") != claims["sub"]:
+            raise HTTPException(status_code=401, detail="INVALID_TOKEN: userinfo subject mismatch")
+        profile = {name: claims[name] for name in PROFILE_CLAIMS if name in claims}
+        profile.update(
+            {name: user_info[name] for name in OAUTH_EXTRA_USERINFO_CLAIMS if name in user_info}
+        )
+        return token, profile
 
-    def logout(self, refresh_token: str) -> None:
-        keycloak_openid.logout(refresh_token)
\ No newline at end of file
+    async def get_user_info_async(self, access_token: str) -> dict:
+        response = await keycloak_http.request(
+            "userinfo",
+            "GET",
+            oidc_url("userinfo"),
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        return _json_or_raise(response)
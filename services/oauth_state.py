@@ -0,0 +1,42 @@
+import base64
+import hashlib
+import json
+import secrets
+from config.fastapi import OAUTH_STATE_TTL
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+
+def code_challenge(code_verifier: str) -> str:
+    # PKCE S256
+    digest = hashlib.sha256(code_verifier.encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class OAuthStateStore:
+    def __init__(self, ttl: int = OAUTH_STATE_TTL):
+        self.ttl = ttl
+
+    def _key(self, state: str) -> str:
+        return f"oauth_state:{hashlib.sha256(state.encode()).hexdigest()}"
+
+    async def create(self, redirect_uri: str) -> dict:
+        # authorize 요청마다 새 state, PKCE code_verifier, id_token nonce 발급
+        state = secrets.token_urlsafe(32)
+        record = {
+            "redirect_uri": redirect_uri,
+            "code_verifier": secrets.token_urlsafe(64),
+            "nonce": secrets.token_urlsafe(24),
+        }
+        with observe_redis("oauth_state_set"):
+            await async_redis.set(self._key(state), json.dumps(record), ex=self.ttl)
+        return {"state": state, **record}
+
+    async def consume(self, state: str) -> dict | None:
+        # GETDEL: 같은 state로 콜백을 두 번 처리하지 못하도록 조회와 삭제를 한 번에
+        with observe_redis("oauth_state_consume"):
+            raw = await async_redis.getdel(self._key(state))
+        return json.loads(raw) if raw else None
+
+
+oauth_state_store = OAuthStateStore()
@@ -0,0 +1,373 @@
+import asyncio
+import csv
+import json
+from typing import AsyncIterator
+import httpx
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+from config.fastapi import (
+    PROVISIONING_BATCH_SIZE,
+    PROVISIONING_CHECKPOINT_EVERY,
+    PROVISIONING_CHECKPOINT_TTL,
+    PROVISIONING_DEFAULT_ROLES,
+)
+from schemas.provisioning import ProvisionUserRow
+from services.keycloak_admin_client import keycloak_admin_async, KeycloakAdminError
+from services.redis_client import async_redis
+from services.resilience import CircuitOpenError
+from services.admin_index import admin_id_index, USER
+from services.metrics import PROVISIONED_ROWS, observe_redis
+
+MODE_USERS = "users"
+MODE_PARTIAL_IMPORT = "partial-import"
+
+# on_conflict 값 -> partialImport의 ifResourceExists
+CONFLICT_POLICIES = {"skip": "SKIP", "overwrite": "OVERWRITE", "fail": "FAIL"}
+
+CREATED = "created"
+EXISTS = "exists"
+OVERWRITTEN = "overwritten"
+INVALID = "invalid"
+FAILED = "failed"
+# Keycloak 장애 등 다시 시도하면 성공할 수 있는 실패. 체크포인트가 이 행을 넘어가지 않음
+ERROR = "error"
+
+IMPORT_ACTIONS = {"ADDED": CREATED, "SKIPPED": EXISTS, "OVERWRITTEN": OVERWRITTEN}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def parse_rows(
+    lines: AsyncIterator[str], fmt: str
+) -> AsyncIterator[tuple[dict | None, str | None]]:
+    # (행, 오류) 단위로 반환. CSV는 첫 줄이 헤더이고 한 줄에 한 사용자 (필드 안 줄바꿈 미지원)
+    header = None
+    async for line in lines:
+        if not line.strip():
+            continue
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield None, f"EXPECTED_{len(header)}_COLUMNS"
+                continue
+            yield dict(zip(header, values)), None
+        else:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                yield None, "INVALID_JSON"
+                continue
+            if not isinstance(row, dict):
+                yield None, "INVALID_JSON"
+                continue
+            yield row, None
+
+
+def _checkpoint_key(job_id: str) -> str:
+    return f"provisioning:checkpoint:{job_id}"
+
+
+async def load_checkpoint(job_id: str) -> int:
+    try:
+        with observe_redis("provisioning_checkpoint_get"):
+            value = await async_redis.get(_checkpoint_key(job_id))
+    except RedisError as e:
+        print(f"[provisioning checkpoint unavailable] {e}")
+        return 0
+    return int(value or 0)
+
+
+async def save_checkpoint(job_id: str, checkpoint: int) -> None:
+    try:
+        with observe_redis("provisioning_checkpoint_set"):
+            await async_redis.set(
+                _checkpoint_key(job_id), checkpoint, ex=PROVISIONING_CHECKPOINT_TTL
+            )
+    except RedisError as e:
+        print(f"[provisioning checkpoint unavailable] {e}")
+
+
+def _pending_key(job_id: str) -> str:
+    return f"provisioning:pending_roles:{job_id}"
+
+
+async def mark_pending_roles(job_id: str, username: str) -> bool:
+    # 생성 직전에 기록하고 역할 할당이 끝나면 지움. 이미 기록돼 있었다면 이전 시도가 생성 도중 중단된 행
+    try:
+        async with async_redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(_pending_key(job_id), username)
+            pipe.expire(_pending_key(job_id), PROVISIONING_CHECKPOINT_TTL)
+            with observe_redis("provisioning_pending_mark"):
+                added, _ = await pipe.execute()
+    except RedisError as e:
+        print(f"[provisioning pending roles unavailable] {e}")
+        return False
+    return added == 0
+
+
+async def clear_pending_roles(job_id: str, username: str) -> None:
+    try:
+        with observe_redis("provisioning_pending_clear"):
+            await async_redis.srem(_pending_key(job_id), username)
+    except RedisError as e:
+        print(f"[provisioning pending roles unavailable] {e}")
+
+
+def _user_representation(user: ProvisionUserRow) -> dict:
+    representation = {
+        "username": user.username,
+        "firstName": user.first_name,
+        "lastName": user.last_name,
+        "enabled": user.enabled,
+        "emailVerified": user.email_verified,
+        "requiredActions": [],
+    }
+    if user.email:
+        representation["email"] = user.email
+    if user.password:
+        representation["credentials"] = [
+            {"type": "password", "value": user.password, "temporary": False}
+        ]
+    else:
+        # 비밀번호 없이 등록된 사용자는 첫 로그인 때 설정
+        representation["requiredActions"] = ["UPDATE_PASSWORD"]
+    return representation
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+class ProvisioningJob:
+    def __init__(
+        self,
+        mode: str = MODE_USERS,
+        on_conflict: str = "skip",
+        concurrency: int = 16,
+        skip: int = 0,
+        job_id: str | None = None,
+        admin=keycloak_admin_async,
+    ):
+        self.mode = mode
+        self.on_conflict = on_conflict
+        self.concurrency = concurrency
+        self.skip = skip
+        self.job_id = job_id
+        self.admin = admin
+        self.batch_size = PROVISIONING_BATCH_SIZE if mode == MODE_PARTIAL_IMPORT else 1
+        # 앞에서부터 빠짐없이 처리가 끝난 행 수. 재개 시 이 값만큼 건너뜀
+        self.checkpoint = skip
+        self.counts = {"skipped": 0}
+        self._settled: set[int] = set()
+        self._abort = asyncio.Event()
+
+    def _roles(self, user: ProvisionUserRow) -> list[str]:
+        return list(dict.fromkeys(PROVISIONING_DEFAULT_ROLES + user.roles))
+
+    def _result(self, index: int, username: str | None, status: str, **extra) -> dict:
+        return {"row": index, "username": username, "status": status, **extra}
+
+    def _error(self, index: int, username: str, error: Exception) -> dict:
+        if isinstance(error, CircuitOpenError):
+            self._abort.set()
+            return self._result(index, username, ERROR, error="KEYCLOAK_UNAVAILABLE")
+        if isinstance(error, KeycloakAdminError):
+            if error.status_code in (401, 403):
+                # 관리자 인증 문제는 모든 행이 실패하므로 중단
+                self._abort.set()
+            if error.status_code in (401, 403, 429) or error.status_code >= 500:
+                return self._result(index, username, ERROR, error=f"KEYCLOAK_{error.status_code}")
+            return self._result(index, username, FAILED, error=error.detail[:200])
+        return self._result(index, username, ERROR, error=type(error).__name__)
+
+    async def _assign_roles(self, user_id: str, roles: list[str]) -> None:
+        if roles:
+            representations = [await self.admin.get_realm_role(role) for role in roles]
+            await self.admin.assign_realm_roles(user_id=user_id, roles=representations)
+
+    async def _create_user(self, index: int, user: ProvisionUserRow) -> dict:
+        if not self.job_id:
+            return await self._provision_user(index, user, interrupted=False)
+        interrupted = await mark_pending_roles(self.job_id, user.username)
+        result = await self._provision_user(index, user, interrupted)
+        # error 행은 재시도 대상이므로 기록을 남겨 둠
+        if result["status"] != ERROR:
+            await clear_pending_roles(self.job_id, user.username)
+        return result
+
+    async def _provision_user(self, index: int, user: ProvisionUserRow, interrupted: bool) -> dict:
+        representation = _user_representation(user)
+        try:
+            try:
+                user_id = await self.admin.create_user(representation)
+                status = CREATED
+            except KeycloakAdminError as e:
+                if e.status_code != 409:
+                    raise
+                if self.on_conflict == "fail":
+                    return self._result(index, user.username, FAILED, error="USER_EXISTS")
+                user_id = await self.admin.find_user_id(user.username)
+                if user_id is None:
+                    # username이 아닌 email이 겹친 경우
+                    return self._result(index, user.username, FAILED, error="EMAIL_EXISTS")
+                status = EXISTS
+                if self.on_conflict == "overwrite":
+                    await self.admin.update_user(user_id, representation)
+                    status = OVERWRITTEN
+            # 이미 있던 사용자의 역할은 건드리지 않음. 같은 job의 이전 시도가 생성 도중 중단한 사용자만 마저 할당
+            if status != EXISTS or interrupted:
+                await self._assign_roles(user_id, self._roles(user))
+        except (KeycloakAdminError, CircuitOpenError, httpx.HTTPError) as e:
+            return self._error(index, user.username, e)
+        await admin_id_index.remember_async(USER, {user.username: user_id})
+        return self._result(index, user.username, status, user_id=user_id)
+
+    async def _import_batch(self, batch: list[tuple[int, ProvisionUserRow]]) -> list[dict]:
+        users = [
+            {**_user_representation(user), "realmRoles": self._roles(user)} for _, user in batch
+        ]
+        try:
+            response = await self.admin.partial_import(
+                {"ifResourceExists": CONFLICT_POLICIES[self.on_conflict], "users": users}
+            )
+        except (KeycloakAdminError, CircuitOpenError, httpx.HTTPError) as e:
+            # 배치 단위 요청이므로 배치 전체가 같은 결과
+            return [self._error(index, user.username, e) for index, user in batch]
+
+        # Keycloak은 username을 소문자로 저장
+        results = {
+            item["resourceName"].lower(): item
+            for item in response.get("results", [])
+            if item.get("resourceType") == "USER"
+        }
+        await admin_id_index.remember_async(
+            USER, {item["resourceName"]: item["id"] for item in results.values() if item.get("id")}
+        )
+        rows = []
+        for index, user in batch:
+            item = results.get(user.username.lower())
+            if item is None or item.get("action") not in IMPORT_ACTIONS:
+                rows.append(self._result(index, user.username, FAILED, error="NOT_IMPORTED"))
+            else:
+                rows.append(
+                    self._result(
+                        index, user.username, IMPORT_ACTIONS[item["action"]], user_id=item.get("id")
+                    )
+                )
+        return rows
+
+    async def _handle(self, batch: list[tuple[int, ProvisionUserRow]]) -> list[dict]:
+        if self.mode == MODE_PARTIAL_IMPORT:
+            return await self._import_batch(batch)
+        return [await self._create_user(index, user) for index, user in batch]
+
+    def _settle(self, result: dict) -> None:
+        status = result["status"]
+        self.counts[status] = self.counts.get(status, 0) + 1
+        PROVISIONED_ROWS.labels(self.mode, status).inc()
+        if status == ERROR:
+            return
+        self._settled.add(result["row"])
+        while self.checkpoint + 1 in self._settled:
+            self.checkpoint += 1
+            self._settled.discard(self.checkpoint)
+
+    async def run(
+        self, rows: AsyncIterator[tuple[dict | None, str | None]]
+    ) -> AsyncIterator[dict]:
+        # 행별 결과를 완료되는 순서대로 반환. 중간중간 {"checkpoint": n}, 마지막에 {"summary": ...}
+        work: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def produce() -> None:
+            batch = []
+            index = 0
+            try:
+                async for row, error in rows:
+                    index += 1
+                    if index <= self.skip:
+                        self.counts["skipped"] += 1
+                        continue
+                    if self._abort.is_set():
+                        break
+                    if error is not None:
+                        results.put_nowait(self._result(index, None, INVALID, error=error))
+                        continue
+                    try:
+                        user = ProvisionUserRow.model_validate(row)
+                    except ValidationError as e:
+                        results.put_nowait(
+                            self._result(index, row.get("username"), INVALID, error=_validation_message(e))
+                        )
+                        continue
+                    batch.append((index, user))
+                    if len(batch) >= self.batch_size:
+                        # 작업 큐가 차 있으면 입력 읽기를 멈춤 (backpressure)
+                        await work.put(batch)
+                        batch = []
+                if batch:
+                    await work.put(batch)
+            finally:
+                for _ in range(self.concurrency):
+                    await work.put(None)
+
+        async def consume() -> None:
+            while (batch := await work.get()) is not None:
+                if self._abort.is_set():
+                    continue
+                for result in await self._handle(batch):
+                    results.put_nowait(result)
+
+        async def finish() -> None:
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                results.put_nowait(None)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(consume()) for _ in range(self.concurrency)]
+        waiter = asyncio.create_task(finish())
+        last_saved = self.checkpoint
+        input_error = None
+        try:
+            while (result := await results.get()) is not None:
+                self._settle(result)
+                yield result
+                if self.checkpoint - last_saved >= PROVISIONING_CHECKPOINT_EVERY:
+                    last_saved = self.checkpoint
+                    if self.job_id:
+                        await save_checkpoint(self.job_id, self.checkpoint)
+                    yield {"checkpoint": self.checkpoint}
+            try:
+                await waiter
+            except (ValueError, csv.Error) as e:
+                input_error = f"INVALID_INPUT: {e}"
+        finally:
+            for task in tasks + [waiter]:
+                task.cancel()
+            if self.job_id:
+                await save_checkpoint(self.job_id, self.checkpoint)
+
+        if input_error:
+            yield {"error": input_error}
+        yield {
+            "summary": {
+                **self.counts,
+                "checkpoint": self.checkpoint,
+                "aborted": self._abort.is_set(),
+            }
+        }
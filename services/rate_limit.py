@@ -0,0 +1,206 @@
+import math
+import threading
+import time
+from typing import Callable, NamedTuple
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+from config.fastapi import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_TRUST_PROXY,
+    RATE_LIMIT_LOGIN_IP,
+    RATE_LIMIT_LOGIN_USERNAME,
+    RATE_LIMIT_SEND_CODE_IP,
+    RATE_LIMIT_SEND_CODE_EMAIL,
+    RATE_LIMIT_VERIFY_CODE_IP,
+    RATE_LIMIT_VERIFY_CODE_EMAIL,
+)
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+# 여러 버킷(IP, 사용자명 등)을 한 번의 왕복으로 검사
+# 모든 버킷에 토큰이 있을 때만 하나씩 차감
+# ARGV: now(ms), capacity1, rate1(토큰/ms), capacity2, rate2, ...
+# 반환값: {허용 여부(1/0), 재시도까지 남은 ms}
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local states = {}
+local retry_after = 0
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    local state = redis.call('HMGET', KEYS[i], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    states[i] = tokens
+    if tokens < 1 then
+        retry_after = math.max(retry_after, math.ceil((1 - tokens) / rate))
+    end
+end
+local allowed = 0
+if retry_after == 0 then
+    allowed = 1
+end
+for i = 1, #KEYS do
+    local capacity = tonumber(ARGV[2 * i])
+    local rate = tonumber(ARGV[2 * i + 1])
+    redis.call('HSET', KEYS[i], 'tokens', tostring(states[i] - allowed), 'ts', now)
+    redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate))
+end
+return {allowed, retry_after}
+"""
+
+
+class RateLimitPolicy(NamedTuple):
+    name: str
+    limit: int
+    window: int
+
+    @property
+    def rate_per_ms(self) -> float:
+        return self.limit / (self.window * 1000)
+
+
+def parse_policy(name: str, spec: str) -> RateLimitPolicy:
+    limit, window = spec.split("/", 1)
+    return RateLimitPolicy(name, int(limit), int(window))
+
+
+KeyFunc = Callable[[Request, dict | None], str | None]
+
+
+class RateLimitRule(NamedTuple):
+    policy: RateLimitPolicy
+    key_func: KeyFunc
+
+
+def client_ip(request: Request) -> str | None:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else None
+
+
+def by_ip(request: Request, body: dict | None) -> str | None:
+    return client_ip(request)
+
+
+def by_body_field(field: str) -> KeyFunc:
+    def key_func(request: Request, body: dict | None) -> str | None:
+        value = body.get(field) if isinstance(body, dict) else None
+        return str(value).strip().lower() if value else None
+
+    return key_func
+
+
+class RateLimiter:
+    LOCAL_MAX_BUCKETS = 100_000
+
+    def __init__(self):
+        self._script = async_redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self._local: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket_key(self, policy: RateLimitPolicy, key: str) -> str:
+        return f"rate_limit:{policy.name}:{key}"
+
+    async def hit(self, buckets: list[tuple[RateLimitPolicy, str]]) -> tuple[bool, int]:
+        now = int(time.time() * 1000)
+        keys = [self._bucket_key(policy, key) for policy, key in buckets]
+        args = [now]
+        for policy, _ in buckets:
+            args.extend([policy.limit, repr(policy.rate_per_ms)])
+
+        try:
+            with observe_redis("rate_limit"):
+                allowed, retry_after = await self._script(keys=keys, args=args)
+            return bool(allowed), int(retry_after)
+        except RedisError as e:
+            print(f"[rate limit redis unavailable, using local buckets] {e}")
+            return self._hit_local(buckets, keys, now)
+
+    def _hit_local(
+        self, buckets: list[tuple[RateLimitPolicy, str]], keys: list[str], now: int
+    ) -> tuple[bool, int]:
+        # Redis 장애 시 워커 단위로만 제한 (스크립트와 같은 알고리즘)
+        with self._lock:
+            if len(self._local) > self.LOCAL_MAX_BUCKETS:
+                self._local.clear()
+
+            states = []
+            retry_after = 0
+            for (policy, _), key in zip(buckets, keys):
+                tokens, ts = self._local.get(key, (policy.limit, now))
+                tokens = min(policy.limit, tokens + max(0, now - ts) * policy.rate_per_ms)
+                states.append(tokens)
+                if tokens < 1:
+                    retry_after = max(
+                        retry_after, math.ceil((1 - tokens) / policy.rate_per_ms)
+                    )
+
+            allowed = retry_after == 0
+            for key, tokens in zip(keys, states):
+                self._local[key] = (tokens - 1 if allowed else tokens, now)
+            return allowed, retry_after
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(*rules: RateLimitRule):
+    async def dependency(request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        body = None
+        if any(rule.key_func is not by_ip for rule in rules):
+            try:
+                body = await request.json()
+            except ValueError:
+                body = None
+
+        buckets = []
+        for rule in rules:
+            key = rule.key_func(request, body)
+            if key:
+                buckets.append((rule.policy, key))
+        if not buckets:
+            return
+
+        allowed, retry_after_ms = await rate_limiter.hit(buckets)
+        if not allowed:
+            retry_after = max(1, math.ceil(retry_after_ms / 1000))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "code": "RATE_LIMITED",
+                    "message": "Too many requests. Please try again later.",
+                    "retry_after": retry_after,
+                },
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    return dependency
+
+
+login_rate_limit = rate_limit(
+    RateLimitRule(parse_policy("login_ip", RATE_LIMIT_LOGIN_IP), by_ip),
+    RateLimitRule(
+        parse_policy("login_username", RATE_LIMIT_LOGIN_USERNAME), by_body_field("username")
+    ),
+)
+
+send_code_rate_limit = rate_limit(
+    RateLimitRule(parse_policy("send_code_ip", RATE_LIMIT_SEND_CODE_IP), by_ip),
+    RateLimitRule(
+        parse_policy("send_code_email", RATE_LIMIT_SEND_CODE_EMAIL), by_body_field("email")
+    ),
+)
+
+verify_code_rate_limit = rate_limit(
+    RateLimitRule(parse_policy("verify_code_ip", RATE_LIMIT_VERIFY_CODE_IP), by_ip),
+    RateLimitRule(
+        parse_policy("verify_code_email", RATE_LIMIT_VERIFY_CODE_EMAIL), by_body_field("email")
+    ),
+)
@@ -0,0 +1,465 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, NamedTuple
+import httpx
+
+try:
+    import yaml
+except ImportError:  # YAML 스펙은 PyYAML이 설치된 경우에만 지원
+    yaml = None
+
+# realm 스펙에서 realm 속성이 아닌 키
+NESTED_KEYS = ("roles", "clients", "users")
+# 사용자 스펙에서 비교/수정 대상이 아닌 키. password는 생성할 때만 사용
+USER_SPEC_KEYS = ("password", "realmRoles", "clientRoles", "credentials")
+
+
+class BootstrapError(Exception):
+    # 스펙이 realm에 없는 클라이언트/역할을 참조하는 경우. 해당 realm만 실패로 기록
+    pass
+
+
+def load_spec(path: str) -> list[dict]:
+    # {"realms": [...]}, [...], 또는 realm 하나
+    with open(path) as f:
+        text = f.read()
+    if path.endswith((".yaml", ".yml")):
+        if yaml is None:
+            raise RuntimeError("PyYAML is required for YAML specs (pip install pyyaml)")
+        spec = yaml.safe_load(text)
+    else:
+        spec = json.loads(text)
+    if isinstance(spec, dict) and "realms" in spec:
+        return spec["realms"]
+    return spec if isinstance(spec, list) else [spec]
+
+
+def _same(desired: Any, current: Any) -> bool:
+    # 스펙에 적힌 키만 비교. 목록은 Keycloak이 순서를 보장하지 않으므로 순서 무시
+    if isinstance(desired, dict) and isinstance(current, dict):
+        return all(_same(value, current.get(key)) for key, value in desired.items())
+    if isinstance(desired, list) and isinstance(current, list):
+        return sorted(json.dumps(item, sort_keys=True) for item in desired) == sorted(
+            json.dumps(item, sort_keys=True) for item in current
+        )
+    return desired == current
+
+
+def _changed_fields(desired: dict, current: dict) -> list[str]:
+    return [key for key, value in desired.items() if not _same(value, current.get(key))]
+
+
+def _role_spec(role: str | dict) -> dict:
+    return {"name": role} if isinstance(role, str) else role
+
+
+def _user_fields(user: dict) -> dict:
+    return {key: value for key, value in user.items() if key not in USER_SPEC_KEYS}
+
+
+def _user_comparable(user: dict) -> dict:
+    # Keycloak은 username/email을 소문자로 저장하므로 비교할 때도 소문자로
+    fields = _user_fields(user)
+    for key in ("username", "email"):
+        if isinstance(fields.get(key), str):
+            fields[key] = fields[key].lower()
+    return fields
+
+
+def _user_import(user: dict) -> dict:
+    # realm 생성/partialImport용 표현: 역할 매핑과 초기 비밀번호 포함
+    representation = {"enabled": True, **_user_fields(user)}
+    for key in ("realmRoles", "clientRoles"):
+        if user.get(key):
+            representation[key] = user[key]
+    if user.get("password"):
+        representation["credentials"] = [
+            {"type": "password", "value": user["password"], "temporary": False}
+        ]
+    return representation
+
+
+class Change(NamedTuple):
+    # 같은 stage의 변경은 동시에 적용, stage 순서대로 진행
+    stage: int
+    description: str
+    apply: Callable[[], Awaitable[None]]
+
+
+class AdminSession:
+    # 모든 realm이 공유하는 연결 풀 + master realm 관리자 토큰
+    def __init__(
+        self,
+        keycloak_url: str,
+        username: str,
+        password: str,
+        max_connections: int = 20,
+        timeout: float = 30,
+    ):
+        self.keycloak_url = keycloak_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self._client = httpx.AsyncClient(
+            base_url=self.keycloak_url,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            # 동시 요청이 풀을 기다리는 시간은 제한하지 않음
+            timeout=httpx.Timeout(timeout, pool=None),
+        )
+        self._token: str | None = None
+        self._token_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AdminSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+
+    async def _obtain_token(self, stale: str | None) -> str:
+        async with self._token_lock:
+            # 다른 요청이 이미 새 토큰을 받아 왔으면 재사용
+            if self._token is None or self._token == stale:
+                response = await self._client.post(
+                    "/realms/master/protocol/openid-connect/token",
+                    data={
+                        "grant_type": "password",
+                        "client_id": "admin-cli",
+                        "username": self.username,
+                        "password": self.password,
+                    },
+                )
+                response.raise_for_status()
+                self._token = response.json()["access_token"]
+            return self._token
+
+    async def request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        token = self._token or await self._obtain_token(None)
+        response = await self._client.request(
+            method, f"/admin{path}", headers={"Authorization": f"Bearer {token}"}, **kwargs
+        )
+        if response.status_code == 401:
+            # master 토큰 수명이 짧으므로 만료 시 한 번 재발급
+            token = await self._obtain_token(token)
+            response = await self._client.request(
+                method, f"/admin{path}", headers={"Authorization": f"Bearer {token}"}, **kwargs
+            )
+        return response
+
+    async def get(self, path: str, **params) -> Any:
+        # 404는 None
+        response = await self.request("GET", path, params=params or None)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def send(self, method: str, path: str, payload: Any = None) -> httpx.Response:
+        response = await self.request(method, path, json=payload)
+        response.raise_for_status()
+        return response
+
+
+class RealmBootstrap:
+    def __init__(self, session: AdminSession, spec: dict):
+        self.session = session
+        self.spec = spec
+        self.name = spec["realm"]
+        self.path = f"/realms/{self.name}"
+        self.realm_fields = {"enabled": True, **{k: v for k, v in spec.items() if k not in NESTED_KEYS}}
+        self.role_specs = [_role_spec(role) for role in spec.get("roles", [])]
+        self.client_specs = spec.get("clients", [])
+        self.user_specs = spec.get("users", [])
+        # 조회 결과 캐시: 적용 단계에서 다시 조회하지 않음
+        self.realm: dict | None = None
+        self.roles: dict[str, dict] = {}
+        self.clients: dict[str, dict | None] = {}
+        self.users: dict[str, dict | None] = {}
+        self.mappings: dict[str, dict] = {}
+        self._client_roles: dict[tuple[str, str], dict] = {}
+
+    def _referenced_clients(self) -> set[str]:
+        referenced = {client["clientId"] for client in self.client_specs}
+        for user in self.user_specs:
+            referenced.update(user.get("clientRoles", {}))
+        return referenced
+
+    async def _find_client(self, client_id: str) -> dict | None:
+        clients = await self.session.get(f"{self.path}/clients", clientId=client_id)
+        return clients[0] if clients else None
+
+    async def _find_user(self, username: str) -> dict | None:
+        users = await self.session.get(f"{self.path}/users", username=username, exact="true")
+        return next(
+            (user for user in users or [] if user["username"].lower() == username.lower()), None
+        )
+
+    async def read(self) -> None:
+        self.realm = await self.session.get(self.path)
+        if self.realm is None:
+            return
+
+        # 서로 독립적인 조회는 동시에
+        client_ids = sorted(self._referenced_clients())
+        usernames = [user["username"] for user in self.user_specs]
+        roles, clients, users = await asyncio.gather(
+            self.session.get(f"{self.path}/roles", briefRepresentation="false"),
+            asyncio.gather(*(self._find_client(client_id) for client_id in client_ids)),
+            asyncio.gather(*(self._find_user(username) for username in usernames)),
+        )
+        self.roles = {role["name"]: role for role in roles}
+        self.clients = dict(zip(client_ids, clients))
+        self.users = dict(zip(usernames, users))
+
+        # 역할을 지정한 기존 사용자만 현재 역할 매핑 조회
+        with_roles = [
+            user["username"]
+            for user in self.user_specs
+            if self.users[user["username"]] and (user.get("realmRoles") or user.get("clientRoles"))
+        ]
+        mappings = await asyncio.gather(
+            *(
+                self.session.get(f"{self.path}/users/{self.users[username]['id']}/role-mappings")
+                for username in with_roles
+            )
+        )
+        self.mappings = dict(zip(with_roles, mappings))
+
+    async def _realm_role(self, name: str) -> dict:
+        if name not in self.roles:
+            role = await self.session.get(f"{self.path}/roles/{name}")
+            if role is None:
+                raise BootstrapError(f"realm role '{name}' not found in realm '{self.name}'")
+            self.roles[name] = role
+        return self.roles[name]
+
+    async def _client_uuid(self, client_id: str) -> str:
+        if not self.clients.get(client_id):
+            self.clients[client_id] = await self._find_client(client_id)
+        if not self.clients[client_id]:
+            raise BootstrapError(f"client '{client_id}' not found in realm '{self.name}'")
+        return self.clients[client_id]["id"]
+
+    async def _client_role(self, client_id: str, name: str) -> dict:
+        key = (client_id, name)
+        if key not in self._client_roles:
+            uuid = await self._client_uuid(client_id)
+            role = await self.session.get(f"{self.path}/clients/{uuid}/roles/{name}")
+            if role is None:
+                raise BootstrapError(f"role '{name}' of client '{client_id}' not found in realm '{self.name}'")
+            self._client_roles[key] = role
+        return self._client_roles[key]
+
+    def _create_realm(self) -> Change:
+        representation = {
+            **self.realm_fields,
+            "realm": self.name,
+            "roles": {"realm": self.role_specs},
+            "clients": self.client_specs,
+            "users": [_user_import(user) for user in self.user_specs],
+        }
+
+        async def apply():
+            await self.session.send("POST", "/realms", representation)
+
+        return Change(0, f"create realm '{self.name}' with {len(self.role_specs)} roles, "
+                         f"{len(self.client_specs)} clients, {len(self.user_specs)} users", apply)
+
+    def _role_mapping_changes(self, user: dict) -> list[Change]:
+        username = user["username"]
+        user_id = self.users[username]["id"]
+        current = self.mappings.get(username, {})
+        changes = []
+
+        have = {role["name"] for role in current.get("realmMappings", [])}
+        missing = [name for name in user.get("realmRoles", []) if name not in have]
+        if missing:
+            async def assign_realm(missing=missing):
+                roles = await asyncio.gather(*(self._realm_role(name) for name in missing))
+                await self.session.send("POST", f"{self.path}/users/{user_id}/role-mappings/realm", list(roles))
+
+            changes.append(Change(3, f"add realm roles {missing} to user '{username}'", assign_realm))
+
+        client_mappings = current.get("clientMappings", {})
+        for client_id, names in user.get("clientRoles", {}).items():
+            have = {role["name"] for role in client_mappings.get(client_id, {}).get("mappings", [])}
+            missing = [name for name in names if name not in have]
+            if missing:
+                async def assign_client(client_id=client_id, missing=missing):
+                    uuid = await self._client_uuid(client_id)
+                    roles = await asyncio.gather(*(self._client_role(client_id, name) for name in missing))
+                    await self.session.send(
+                        "POST", f"{self.path}/users/{user_id}/role-mappings/clients/{uuid}", list(roles)
+                    )
+
+                changes.append(
+                    Change(3, f"add {client_id} roles {missing} to user '{username}'", assign_client)
+                )
+        return changes
+
+    def _check_references(self) -> None:
+        # 아무것도 적용하기 전에 없는 역할/클라이언트 참조를 찾아 realm 단위로 실패
+        roles = set(self.roles) | {role["name"] for role in self.role_specs}
+        clients = {client_id for client_id, client in self.clients.items() if client}
+        clients.update(client["clientId"] for client in self.client_specs)
+        for user in self.user_specs:
+            missing_roles = [name for name in user.get("realmRoles", []) if name not in roles]
+            if missing_roles:
+                raise BootstrapError(
+                    f"user '{user['username']}' references realm roles {missing_roles} "
+                    f"not found in realm '{self.name}'"
+                )
+            missing_clients = [
+                client_id for client_id in user.get("clientRoles", {}) if client_id not in clients
+            ]
+            if missing_clients:
+                raise BootstrapError(
+                    f"user '{user['username']}' references clients {missing_clients} "
+                    f"not found in realm '{self.name}'"
+                )
+
+    def diff(self) -> list[Change]:
+        if self.realm is None:
+            # 새 realm은 전체 표현으로 한 번에 생성. 참조 검증은 Keycloak의 import에 맡김
+            return [self._create_realm()]
+
+        self._check_references()
+        changes = []
+        fields = _changed_fields(self.realm_fields, self.realm)
+        if fields:
+            payload = {key: self.realm_fields[key] for key in fields}
+            changes.append(
+                Change(
+                    0,
+                    f"update realm {fields}",
+                    lambda payload=payload: self.session.send("PUT", self.path, payload),
+                )
+            )
+
+        # 없는 역할/클라이언트/사용자는 partialImport 한 번으로 생성
+        new_roles = [role for role in self.role_specs if role["name"] not in self.roles]
+        new_clients = [client for client in self.client_specs if not self.clients.get(client["clientId"])]
+        new_users = [user for user in self.user_specs if not self.users.get(user["username"])]
+        if new_roles or new_clients or new_users:
+            payload = {
+                "ifResourceExists": "SKIP",
+                "roles": {"realm": new_roles},
+                "clients": new_clients,
+                "users": [_user_import(user) for user in new_users],
+            }
+            description = ", ".join(
+                f"create {kind} {names}"
+                for kind, names in (
+                    ("roles", [role["name"] for role in new_roles]),
+                    ("clients", [client["clientId"] for client in new_clients]),
+                    ("users", [user["username"] for user in new_users]),
+                )
+                if names
+            )
+            changes.append(
+                Change(
+                    1,
+                    description,
+                    lambda payload=payload: self.session.send("POST", f"{self.path}/partialImport", payload),
+                )
+            )
+
+        for role in self.role_specs:
+            current = self.roles.get(role["name"])
+            if current and _changed_fields(role, current):
+                changes.append(
+                    Change(
+                        2,
+                        f"update role '{role['name']}'",
+                        lambda role=role: self.session.send("PUT", f"{self.path}/roles/{role['name']}", role),
+                    )
+                )
+
+        for client in self.client_specs:
+            current = self.clients.get(client["clientId"])
+            fields = current and _changed_fields(client, current)
+            if fields:
+                changes.append(
+                    Change(
+                        2,
+                        f"update client '{client['clientId']}' {fields}",
+                        lambda client=client, current=current: self.session.send(
+                            "PUT", f"{self.path}/clients/{current['id']}", {**current, **client}
+                        ),
+                    )
+                )
+
+        for user in self.user_specs:
+            current = self.users.get(user["username"])
+            if not current:
+                continue
+            fields = _changed_fields(_user_comparable(user), current)
+            if fields:
+                payload = {key: user[key] for key in fields}
+                changes.append(
+                    Change(
+                        2,
+                        f"update user '{user['username']}' {fields}",
+                        lambda current=current, payload=payload: self.session.send(
+                            "PUT", f"{self.path}/users/{current['id']}", payload
+                        ),
+                    )
+                )
+            changes.extend(self._role_mapping_changes(user))
+        return changes
+
+    async def apply(self, changes: list[Change]) -> None:
+        for stage in sorted({change.stage for change in changes}):
+            await asyncio.gather(*(change.apply() for change in changes if change.stage == stage))
+
+    async def client_secrets(self) -> dict[str, str]:
+        confidential = [
+            client["clientId"] for client in self.client_specs if not client.get("publicClient", False)
+        ]
+
+        async def secret(client_id: str) -> str:
+            uuid = await self._client_uuid(client_id)
+            return (await self.session.get(f"{self.path}/clients/{uuid}/client-secret"))["value"]
+
+        secrets = await asyncio.gather(*(secret(client_id) for client_id in confidential))
+        return dict(zip(confidential, secrets))
+
+    async def run(self, dry_run: bool = False, with_secrets: bool = False) -> dict:
+        await self.read()
+        changes = self.diff()
+        result = {
+            "realm": self.name,
+            "created": self.realm is None,
+            "changes": [change.description for change in changes],
+        }
+        if not dry_run:
+            await self.apply(changes)
+            if with_secrets:
+                if self.realm is None:
+                    # 생성 직후에는 클라이언트 UUID를 모르므로 다시 조회
+                    self.clients = {}
+                result["client_secrets"] = await self.client_secrets()
+        return result
+
+
+async def bootstrap(
+    specs: list[dict],
+    keycloak_url: str,
+    username: str,
+    password: str,
+    dry_run: bool = False,
+    with_secrets: bool = False,
+    parallel: int = 4,
+) -> list[dict]:
+    # 여러 realm(테넌트)을 하나의 세션으로 동시에 처리. 실패한 realm은 결과에 error로 기록
+    semaphore = asyncio.Semaphore(parallel)
+
+    async with AdminSession(keycloak_url, username, password) as session:
+        async def run(spec: dict) -> dict:
+            async with semaphore:
+                try:
+                    return await RealmBootstrap(session, spec).run(dry_run, with_secrets)
+                except (httpx.HTTPError, BootstrapError) as e:
+                    return {"realm": spec.get("realm"), "error": str(e)}
+
+        return await asyncio.gather(*(run(spec) for spec in specs))
@@ -0,0 +1,38 @@
+from redis import Redis, BlockingConnectionPool
+from redis.asyncio import Redis as AsyncRedis, BlockingConnectionPool as AsyncBlockingConnectionPool
+from config.fastapi import (
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_SOCKET_TIMEOUT,
+    REDIS_POOL_TIMEOUT,
+)
+
+# 연결이 모두 사용 중이면 바로 실패하지 않고 REDIS_POOL_TIMEOUT까지 대기
+# 동기 핸들러용
+redis_client = Redis(
+    connection_pool=BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=int(REDIS_PORT),
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        decode_responses=True,
+    )
+)
+
+# async 핸들러용, main.py lifespan에서 종료
+async_redis = AsyncRedis(
+    connection_pool=AsyncBlockingConnectionPool(
+        host=REDIS_HOST,
+        port=int(REDIS_PORT),
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        decode_responses=True,
+    )
+)
+
+
+async def close_async_redis() -> None:
+    await async_redis.aclose(close_connection_pool=True)
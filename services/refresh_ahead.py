@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable
+from fastapi import HTTPException
+from jose import jwt, JWTError
+from redis.exceptions import RedisError
+from config.fastapi import (
+    REFRESH_AHEAD_ENABLED,
+    REFRESH_AHEAD_WINDOW,
+    REFRESH_AHEAD_PENDING_TTL,
+)
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+
+# 갱신 중임을 표시하는 값. 결과가 저장되기 전까지 pending 키에 들어 있음
+IN_PROGRESS = "in-progress"
+
+
+class RefreshAhead:
+    POLL_INTERVAL = 0.05
+    WAIT_TIMEOUT = 5
+    STORE_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        enabled: bool = REFRESH_AHEAD_ENABLED,
+        window: int = REFRESH_AHEAD_WINDOW,
+        pending_ttl: int = REFRESH_AHEAD_PENDING_TTL,
+    ):
+        self.enabled = enabled
+        self.window = window
+        self.pending_ttl = pending_ttl
+        # 진행 중인 백그라운드 갱신. 태스크가 GC되지 않도록 참조 유지
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def _key(self, refresh_token: str) -> str:
+        return f"refresh_ahead:pending:{hashlib.sha256(refresh_token.encode()).hexdigest()}"
+
+    def is_due(self, claims: dict) -> bool:
+        exp = claims.get("exp")
+        return self.enabled and isinstance(exp, (int, float)) and exp - time.time() <= self.window
+
+    def _ttl(self, refresh_token: str) -> int:
+        # 회전 전 refresh token이 만료될 때까지 보관. 그 전에 돌아온 클라이언트도 새 토큰을 받음
+        try:
+            exp = jwt.get_unverified_claims(refresh_token).get("exp")
+        except JWTError:
+            exp = None
+        if not isinstance(exp, (int, float)):
+            return self.pending_ttl
+        return max(1, int(exp - time.time()))
+
+    async def get_pending(self, refresh_token: str, wait: bool = False) -> dict | None:
+        # 다른 요청(또는 다른 워커)이 미리 받아 둔 새 토큰. 다음 응답에서 쿠키를 교체
+        # wait=True: 갱신이 진행 중이면 결과를 기다림 (회전 중인 refresh token을 다시 쓰지 않도록)
+        deadline = time.monotonic() + self.WAIT_TIMEOUT
+        while True:
+            try:
+                with observe_redis("refresh_ahead_get"):
+                    raw = await async_redis.get(self._key(refresh_token))
+            except RedisError as e:
+                print(f"[refresh-ahead redis unavailable] {e}")
+                return None
+            if raw != IN_PROGRESS:
+                return json.loads(raw) if raw else None
+            if not wait or time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.POLL_INTERVAL)
+
+    async def _store(self, key: str, tokens: dict) -> None:
+        # 이미 회전했으므로 저장에 실패하면 새 토큰이 사라짐. 몇 번 더 시도
+        for attempt in range(self.STORE_ATTEMPTS):
+            try:
+                with observe_redis("refresh_ahead_put"):
+                    await async_redis.set(key, json.dumps(tokens), keepttl=True)
+                return
+            except RedisError as e:
+                print(f"[refresh-ahead store failed] {e}")
+                await asyncio.sleep(self.POLL_INTERVAL * 2**attempt)
+
+    async def _refresh(
+        self, refresh_token: str, refresh: Callable[[str], Awaitable[dict]]
+    ) -> None:
+        # 결과를 저장할 자리를 먼저 잡음. Redis에 쓸 수 없거나 다른 워커가 갱신 중이면 회전하지 않음
+        key = self._key(refresh_token)
+        try:
+            with observe_redis("refresh_ahead_claim"):
+                claimed = await async_redis.set(
+                    key, IN_PROGRESS, nx=True, ex=self._ttl(refresh_token)
+                )
+        except RedisError as e:
+            print(f"[refresh-ahead redis unavailable] {e}")
+            return
+        if not claimed:
+            return
+
+        try:
+            tokens = await refresh(refresh_token)
+        except HTTPException as e:
+            print(f"[refresh-ahead failed] {e.detail}")
+            try:
+                await async_redis.delete(key)
+            except RedisError as e:
+                print(f"[refresh-ahead redis unavailable] {e}")
+            return
+        await self._store(key, tokens)
+
+    def schedule(self, refresh_token: str, refresh: Callable[[str], Awaitable[dict]]) -> None:
+        hashed = self._key(refresh_token)
+        if hashed in self._tasks:
+            return
+        task = asyncio.create_task(self._refresh(refresh_token, refresh))
+        self._tasks[hashed] = task
+        task.add_done_callback(lambda _: self._tasks.pop(hashed, None))
+
+    async def stop(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks = {}
+
+
+refresh_ahead = RefreshAhead()
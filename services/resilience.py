@@ -0,0 +1,198 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, NamedTuple
+import httpx
+from config.fastapi import (
+    KEYCLOAK_ENDPOINT_TIMEOUTS,
+    KEYCLOAK_DEFAULT_TIMEOUT,
+    KEYCLOAK_RETRY_MAX,
+    KEYCLOAK_RETRY_BASE_DELAY,
+    KEYCLOAK_RETRY_MAX_DELAY,
+    KEYCLOAK_HEDGE_ENDPOINTS,
+    KEYCLOAK_HEDGE_DELAY,
+    KEYCLOAK_BREAKER_FAILURE_THRESHOLD,
+    KEYCLOAK_BREAKER_RECOVERY_TIMEOUT,
+    KEYCLOAK_BREAKER_HALF_OPEN_CALLS,
+)
+from services.metrics import (
+    KEYCLOAK_CIRCUIT_STATE,
+    KEYCLOAK_CIRCUIT_REJECTIONS,
+    KEYCLOAK_RETRIES,
+    KEYCLOAK_HEDGED_REQUESTS,
+)
+
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+    STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = KEYCLOAK_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = KEYCLOAK_BREAKER_RECOVERY_TIMEOUT,
+        half_open_calls: int = KEYCLOAK_BREAKER_HALF_OPEN_CALLS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+        # 동기 호출은 threadpool에서 실행되므로 lock으로 보호
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._set_state(self.CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        KEYCLOAK_CIRCUIT_STATE.labels(self.name).set(self.STATE_VALUES[state])
+        if state != self.CLOSED:
+            print(f"[circuit {self.name}] {state}")
+
+    def _retry_after(self) -> float:
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self, endpoint: str) -> None:
+        with self._lock:
+            if self._state == self.OPEN and self._retry_after() <= 0:
+                # 복구 대기 시간이 지나면 일부 호출만 통과시켜 상태 확인
+                self._set_state(self.HALF_OPEN)
+                self._probes = 0
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            retry_after = self._retry_after()
+
+        KEYCLOAK_CIRCUIT_REJECTIONS.labels(endpoint).inc()
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._failures = 0
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        # 결과를 판단할 수 없이 끝난 시험 호출(취소 등)의 자리를 반환
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_after": round(self._retry_after(), 1) if self._state == self.OPEN else 0,
+            }
+
+
+class EndpointPolicy(NamedTuple):
+    timeout: float
+    retries: int
+    hedge_delay: float
+
+
+def policy_for(endpoint: str, method: str = "POST", idempotent: bool | None = None) -> EndpointPolicy:
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    return EndpointPolicy(
+        timeout=KEYCLOAK_ENDPOINT_TIMEOUTS.get(endpoint, KEYCLOAK_DEFAULT_TIMEOUT),
+        # refresh token 회전, 사용자 생성 등 멱등이 아닌 호출은 재시도하지 않음
+        retries=KEYCLOAK_RETRY_MAX if idempotent else 0,
+        hedge_delay=KEYCLOAK_HEDGE_DELAY if idempotent and endpoint in KEYCLOAK_HEDGE_ENDPOINTS else 0,
+    )
+
+
+def backoff_delay(attempt: int) -> float:
+    # full jitter: 여러 워커의 재시도가 같은 순간에 몰리지 않도록 분산
+    return random.uniform(0, min(KEYCLOAK_RETRY_MAX_DELAY, KEYCLOAK_RETRY_BASE_DELAY * 2**attempt))
+
+
+async def _hedged(
+    endpoint: str, policy: EndpointPolicy, send: Callable[[float], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    first = asyncio.ensure_future(send(policy.timeout))
+    done, _ = await asyncio.wait({first}, timeout=policy.hedge_delay)
+    if done:
+        return first.result()
+
+    # 첫 요청이 hedge_delay 안에 끝나지 않으면 같은 요청을 하나 더 보내고 먼저 온 응답을 사용
+    KEYCLOAK_HEDGED_REQUESTS.labels(endpoint).inc()
+    pending = {first, asyncio.ensure_future(send(policy.timeout))}
+    fallback: httpx.Response | None = None
+    error: Exception | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif task.result().status_code < 500:
+                    return task.result()
+                else:
+                    fallback = task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+    if fallback is not None:
+        return fallback
+    raise error
+
+
+async def call_async(
+    endpoint: str, method: str, send: Callable[[float], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    # send(timeout): 한 번의 HTTP 시도
+    policy = policy_for(endpoint, method)
+    for attempt in range(policy.retries + 1):
+        keycloak_breaker.allow(endpoint)
+        try:
+            if policy.hedge_delay > 0:
+                response = await _hedged(endpoint, policy, send)
+            else:
+                response = await send(policy.timeout)
+        except httpx.TransportError:
+            keycloak_breaker.record_failure()
+            if attempt == policy.retries:
+                raise
+        except BaseException:
+            keycloak_breaker.release()
+            raise
+        else:
+            if response.status_code < 500:
+                keycloak_breaker.record_success()
+                return response
+            keycloak_breaker.record_failure()
+            if attempt == policy.retries:
+                return response
+        KEYCLOAK_RETRIES.labels(endpoint).inc()
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+keycloak_breaker = CircuitBreaker("keycloak")
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from jose import jwt, JWTError
+from redis.exceptions import RedisError
+from config.fastapi import REVOCATION_DEFAULT_TTL
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+REVOKED_KEY = "revoked_tokens"
+REVOKED_CHANNEL = "revoked_tokens"
+REVOKED_KINDS = ("sid", "jti", "sub")
+
+
+class RevocationIndex:
+    def __init__(self):
+        # "sid:<값>" -> 만료 시각(epoch). 검증 경로에서는 이 dict만 조회
+        self._revoked: dict[str, float] = {}
+        self._listener: asyncio.Task | None = None
+
+    def is_revoked(self, claims: dict) -> bool:
+        if not self._revoked:
+            return False
+        now = time.time()
+        for kind in REVOKED_KINDS:
+            value = claims.get(kind)
+            if value:
+                expires_at = self._revoked.get(f"{kind}:{value}")
+                if expires_at is not None and expires_at > now:
+                    return True
+        return False
+
+    async def revoke(self, kind: str, value: str, expires_at: float | None = None) -> None:
+        if kind not in REVOKED_KINDS:
+            raise ValueError(f"Unknown revocation kind: {kind}")
+        member = f"{kind}:{value}"
+        expires_at = expires_at or time.time() + REVOCATION_DEFAULT_TTL
+        self._revoked[member] = expires_at
+
+        async with async_redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(REVOKED_KEY, {member: expires_at})
+            pipe.publish(REVOKED_CHANNEL, f"{member}|{expires_at}")
+            with observe_redis("revoke"):
+                await pipe.execute()
+
+    async def revoke_refresh_token_session(self, refresh_token: str) -> None:
+        # Keycloak 로그아웃이 성공한 뒤에만 호출. refresh token 서명은 realm 비밀키라 검증 없이 sid만 읽음
+        try:
+            claims = jwt.get_unverified_claims(refresh_token)
+        except JWTError:
+            return
+        sid = claims.get("sid")
+        if sid:
+            exp = claims.get("exp")
+            await self.revoke("sid", sid, float(exp) if isinstance(exp, (int, float)) else None)
+
+    async def sync(self) -> None:
+        now = time.time()
+        async with async_redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", now)
+            pipe.zrange(REVOKED_KEY, 0, -1, withscores=True)
+            _, entries = await pipe.execute()
+        self._revoked = {member: score for member, score in entries}
+
+    async def sync_quietly(self) -> None:
+        try:
+            await self.sync()
+        except RedisError as e:
+            print(f"[revocation sync failed] {e}")
+
+    def _apply_message(self, data: str) -> None:
+        member, _, expires_at = data.rpartition("|")
+        try:
+            self._revoked[member] = float(expires_at)
+        except ValueError:
+            pass
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with async_redis.pubsub() as pubsub:
+                    await pubsub.subscribe(REVOKED_CHANNEL)
+                    # 구독 이후 전체 동기화해서 끊겨 있던 동안의 변경을 놓치지 않음
+                    await self.sync()
+                    while True:
+                        # listen()은 socket_timeout에 걸려 끊기므로 짧은 timeout으로 polling
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None:
+                            self._apply_message(message["data"])
+            except RedisError as e:
+                print(f"[revocation listener error] {e}")
+                await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+
+revocation_index = RevocationIndex()
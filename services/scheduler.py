@@ -0,0 +1,4 @@
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+# 주기 작업(JWKS 갱신 등)을 위한 공유 스케줄러, main.py lifespan에서 시작/종료
+scheduler = AsyncIOScheduler()
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Response
+from config.fastapi import (
+    SESSION_MODE,
+    SESSION_COOKIE_NAME,
+    SESSION_IDLE_TTL,
+    SESSION_LOCAL_CACHE_SIZE,
+    SESSION_LOCAL_CACHE_TTL,
+    REFRESH_AHEAD_ENABLED,
+    REFRESH_AHEAD_WINDOW,
+)
+from services.redis_client import async_redis
+from services.metrics import observe_redis
+
+REFRESH_DUE_KEY = "session:refresh_due"
+
+# 갱신 시각이 지난 세션을 꺼내면서 ZSET에서 제거해 여러 워커가 같은 세션을 중복 갱신하지 않도록 함
+CLAIM_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+def session_mode_enabled() -> bool:
+    return SESSION_MODE == "session"
+
+
+class SessionStore:
+    def __init__(
+        self,
+        idle_ttl: int = SESSION_IDLE_TTL,
+        local_cache_size: int = SESSION_LOCAL_CACHE_SIZE,
+        local_cache_ttl: float = SESSION_LOCAL_CACHE_TTL,
+    ):
+        self.idle_ttl = idle_ttl
+        self.local_cache_size = local_cache_size
+        self.local_cache_ttl = local_cache_ttl
+        # 세션 키 -> (세션 레코드, 로컬 캐시 만료 시각). 다른 워커의 변경은 local_cache_ttl 안에 반영
+        self._local: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._claim_due_script = async_redis.register_script(CLAIM_DUE_SCRIPT)
+
+    def _key(self, session_id: str) -> str:
+        # Redis에는 세션 ID 원문 대신 해시만 저장
+        return f"session:{hashlib.sha256(session_id.encode()).hexdigest()}"
+
+    def _ttl(self, record: dict) -> int:
+        remaining = int(record["refresh_expires_at"] - time.time())
+        return max(1, min(self.idle_ttl, remaining))
+
+    def _record(self, tokens: dict, claims: dict) -> dict:
+        now = time.time()
+        return {
+            "access_token": tokens["access_token"],
+            "refresh_token": tokens["refresh_token"],
+            "refresh_expires_at": now + int(tokens.get("refresh_expires_in") or self.idle_ttl),
+            "claims": claims,
+        }
+
+    def _cache_get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            record, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return record
+
+    def _cache_put(self, key: str, record: dict) -> None:
+        if self.local_cache_size <= 0:
+            return
+        with self._lock:
+            self._local[key] = (record, time.monotonic() + self.local_cache_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_cache_size:
+                self._local.popitem(last=False)
+
+    def _cache_drop(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _queue_write(self, pipe, key: str, record: dict, keep_ttl: bool = False) -> None:
+        if keep_ttl:
+            pipe.set(key, json.dumps(record), keepttl=True)
+        else:
+            pipe.set(key, json.dumps(record), ex=self._ttl(record))
+        exp = record["claims"].get("exp")
+        if REFRESH_AHEAD_ENABLED and isinstance(exp, (int, float)):
+            pipe.zadd(REFRESH_DUE_KEY, {key: exp - REFRESH_AHEAD_WINDOW})
+
+    async def _write(self, key: str, record: dict, keep_ttl: bool = False) -> None:
+        async with async_redis.pipeline(transaction=False) as pipe:
+            self._queue_write(pipe, key, record, keep_ttl)
+            with observe_redis("session_write"):
+                await pipe.execute()
+        self._cache_put(key, record)
+
+    async def create(self, tokens: dict, claims: dict) -> str:
+        session_id = secrets.token_urlsafe(32)
+        await self._write(self._key(session_id), self._record(tokens, claims))
+        return session_id
+
+    async def get(self, session_id: str, use_local: bool = True) -> dict | None:
+        key = self._key(session_id)
+        if use_local:
+            record = self._cache_get(key)
+            if record is not None:
+                return record
+
+        # GETEX로 조회와 sliding 만료 연장을 한 번에 처리
+        with observe_redis("session_get"):
+            raw = await async_redis.getex(key, ex=self.idle_ttl)
+        if raw is None:
+            self._cache_drop(key)
+            return None
+
+        record = json.loads(raw)
+        if record["refresh_expires_at"] <= time.time():
+            await self.delete(session_id)
+            return None
+        self._cache_put(key, record)
+        return record
+
+    async def update(self, session_id: str, tokens: dict, claims: dict) -> dict:
+        record = self._record(tokens, claims)
+        await self._write(self._key(session_id), record)
+        return record
+
+    async def get_by_key(self, key: str) -> dict | None:
+        # 백그라운드 갱신용: idle 만료를 연장하지 않음
+        with observe_redis("session_get"):
+            raw = await async_redis.get(key)
+        return json.loads(raw) if raw else None
+
+    async def update_by_key(self, key: str, tokens: dict, claims: dict) -> dict:
+        record = self._record(tokens, claims)
+        await self._write(key, record, keep_ttl=True)
+        return record
+
+    async def claim_due(self, limit: int) -> list[str]:
+        with observe_redis("session_claim_due"):
+            return await self._claim_due_script(
+                keys=[REFRESH_DUE_KEY], args=[time.time(), limit]
+            )
+
+    async def delete(self, session_id: str) -> dict | None:
+        key = self._key(session_id)
+        self._cache_drop(key)
+        async with async_redis.pipeline(transaction=False) as pipe:
+            pipe.getdel(key)
+            pipe.zrem(REFRESH_DUE_KEY, key)
+            with observe_redis("session_delete"):
+                raw, _ = await pipe.execute()
+        return json.loads(raw) if raw else None
+
+    def set_cookie(self, response: Response, session_id: str, max_age: int | None = None) -> None:
+        # TODO Need to change secure and samesite settings when you publish
+        response.set_cookie(
+            key=SESSION_COOKIE_NAME,
+            value=session_id,
+            httponly=True,
+            secure=False,
+            samesite="Lax",
+            max_age=max_age,
+        )
+
+    def delete_cookie(self, response: Response) -> None:
+        response.delete_cookie(SESSION_COOKIE_NAME)
+
+
+session_store = SessionStore()
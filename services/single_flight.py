@@ -0,0 +1,150 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import secrets
+import time
+from typing import Awaitable, Callable
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from redis.exceptions import RedisError
+from services.redis_client import async_redis
+
+# 내가 잡은 락일 때만 해제 (TTL이 지나 다른 워커가 잡은 락은 건드리지 않음)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        namespace: str,
+        grace: float,
+        use_redis: bool = False,
+        lock_ttl: float = 10,
+        wait_timeout: float = 5,
+    ):
+        self.namespace = namespace
+        self.grace = grace
+        self.use_redis = use_redis
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._results: dict[str, tuple[dict, float]] = {}
+        self._release_script = async_redis.register_script(RELEASE_LOCK_SCRIPT)
+
+    def _hash(self, key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _cipher(self, key: str) -> AESGCM:
+        # Redis에 공유하는 결과(토큰)는 키 원문(refresh token)에서 만든 키로 암호화.
+        # Redis에는 키의 해시만 있으므로 같은 refresh token을 가진 요청만 복호화 가능
+        return AESGCM(hashlib.sha256(f"{self.namespace}:{key}".encode()).digest())
+
+    def _encrypt(self, cipher: AESGCM, result: dict) -> str:
+        nonce = os.urandom(12)
+        sealed = nonce + cipher.encrypt(nonce, json.dumps(result).encode(), None)
+        return base64.b64encode(sealed).decode()
+
+    def _decrypt(self, cipher: AESGCM, value: str) -> dict | None:
+        try:
+            sealed = base64.b64decode(value)
+            return json.loads(cipher.decrypt(sealed[:12], sealed[12:], None))
+        except (InvalidTag, ValueError, binascii.Error):
+            return None
+
+    def _get_cached(self, hashed: str) -> dict | None:
+        cached = self._results.get(hashed)
+        if cached is None:
+            return None
+        result, expires_at = cached
+        if time.monotonic() >= expires_at:
+            self._results.pop(hashed, None)
+            return None
+        return result
+
+    def _store(self, hashed: str, result: dict) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self._results.items() if exp <= now]:
+            del self._results[key]
+        self._results[hashed] = (result, now + self.grace)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        hashed = self._hash(key)
+        cached = self._get_cached(hashed)
+        if cached is not None:
+            return cached
+
+        future = self._inflight.get(hashed)
+        if future is None:
+            future = asyncio.ensure_future(self._run(hashed, key, fn))
+            self._inflight[hashed] = future
+            future.add_done_callback(lambda _: self._inflight.pop(hashed, None))
+        # 먼저 온 요청이 취소되어도 공유 작업은 계속 진행
+        return await asyncio.shield(future)
+
+    async def _run(self, hashed: str, key: str, fn: Callable[[], Awaitable[dict]]) -> dict:
+        if self.use_redis:
+            try:
+                result = await self._run_distributed(hashed, key, fn)
+            except RedisError as e:
+                # fn() 호출 전(락 획득, 대기) 오류일 때만 여기로 옴
+                print(f"[single-flight redis unavailable] {e}")
+                result = await fn()
+        else:
+            result = await fn()
+
+        self._store(hashed, result)
+        return result
+
+    async def _run_distributed(
+        self, hashed: str, key: str, fn: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        r = async_redis
+        lock_key = f"{self.namespace}:lock:{hashed}"
+        result_key = f"{self.namespace}:result:{hashed}"
+        cipher = self._cipher(key)
+
+        cached = await r.get(result_key)
+        if cached and (result := self._decrypt(cipher, cached)) is not None:
+            return result
+
+        owner = secrets.token_hex(16)
+        if await r.set(lock_key, owner, nx=True, px=int(self.lock_ttl * 1000)):
+            # fn()이 끝난 뒤의 Redis 오류는 여기서 처리. 호출자에게 전파되면 fn()을 다시 호출해
+            # 같은 refresh token을 두 번 쓰게 됨 (다른 워커는 락 TTL 후 직접 호출)
+            try:
+                result = await fn()
+                try:
+                    await r.set(
+                        result_key, self._encrypt(cipher, result), px=int(self.grace * 1000)
+                    )
+                except RedisError as e:
+                    print(f"[single-flight result store failed] {e}")
+                return result
+            finally:
+                try:
+                    await self._release_script(keys=[lock_key], args=[owner])
+                except RedisError as e:
+                    print(f"[single-flight lock release failed] {e}")
+
+        # 다른 워커가 같은 키를 처리 중: 결과가 올라올 때까지 대기
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            async with r.pipeline(transaction=False) as pipe:
+                cached, locked = await pipe.get(result_key).exists(lock_key).execute()
+            if cached and (result := self._decrypt(cipher, cached)) is not None:
+                return result
+            if not locked:
+                break
+
+        return await fn()
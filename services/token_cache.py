@@ -0,0 +1,80 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from config.fastapi import TOKEN_CACHE_ENABLED, TOKEN_CACHE_MAX_SIZE
+
+
+class TokenCache:
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE, enabled: bool = TOKEN_CACHE_ENABLED):
+        self.max_size = max_size
+        self.enabled = enabled and max_size > 0
+        self._entries: OrderedDict[tuple[str, str], tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _key(self, token: str, audience: str) -> tuple[str, str]:
+        return hashlib.sha256(token.encode()).hexdigest(), audience
+
+    def get(self, token: str, audience: str) -> dict | None:
+        if not self.enabled:
+            return None
+
+        key = self._key(token, audience)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, audience: str, claims: dict) -> None:
+        if not self.enabled:
+            return
+
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp <= time.time():
+            return
+
+        key = self._key(token, audience)
+        with self._lock:
+            self._entries[key] = (claims, float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = TokenCache()
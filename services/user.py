@@ -1,21 +1,43 @@
-from config.keycloak import keycloak_openid
 from config.keycloak import settings
-
-import requests
+from fastapi import HTTPException
+from services.keycloak_http import keycloak_http, oidc_url, KeycloakOIDCError
+from services.jwt_verification import token_verifier
 
 class KeycloakUserService:
     @staticmethod
-    def login(username: str, password: str):
-        token = keycloak_openid.token(username, password)
-        return token
-
-    @staticmethod
-    def logout(refresh_token: str):
-        requests.post(
-            f"{settings.KEYCLOAK_URL}/realms/{settings.KEYCLOAK_REALM}/protocol/openid-connect/logout",
+    async def login_async(username: str, password: str) -> dict:
+        response = await keycloak_http.request(
+            "token",
+            "POST",
+            oidc_url("token"),
             data={
+                "grant_type": "password",
                 "client_id": settings.KEYCLOAK_CLIENT_ID,
                 "client_secret": settings.KEYCLOAK_CLIENT_SECRET,
+                "username": username,
+                "password": password,
+                "scope": "openid",
+            },
+        )
+        if response.status_code != 200:
+            raise KeycloakOIDCError(response.status_code, response.text)
+        return response.json()
+
+    @staticmethod
+    async def logout_async(refresh_token: str) -> bool:
+        # refresh token을 발급한 realm(다중 realm)의 logout 엔드포인트와 client 사용
+        try:
+            realm = token_verifier.realm_for(refresh_token)
+        except HTTPException:
+            return False
+        response = await keycloak_http.request(
+            "logout",
+            "POST",
+            realm.oidc_url("logout"),
+            data={
+                "client_id": realm.client_id,
+                "client_secret": realm.client_secret,
                 "refresh_token": refresh_token,
             },
-        )
\ No newline at end of file
+        )
+        return response.status_code == 204
@@ -0,0 +1,15 @@
+import os
+import sys
+
+# 설정은 import 시점에 읽으므로 앱을 불러오기 전에 테스트용 값 지정
+os.environ.setdefault("KEYCLOAK_URL", "http://keycloak.test")
+os.environ.setdefault("KEYCLOAK_REALM", "main")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "auth-server")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+os.environ.setdefault("KEYCLOAK_ADMIN_USERNAME", "admin")
+os.environ.setdefault("KEYCLOAK_ADMIN_PASSWORD", "admin")
+os.environ.setdefault("KEYCLOAK_API_KEY", "test-api-key")
+os.environ.setdefault("KEYCLOAK_TRUSTED_ISSUERS", "tenant-b")
+os.environ.setdefault("EMAIL_WORKERS", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from services import admin
+from services.keycloak_admin_client import KeycloakAdminError
+
+
+class FakeAdmin:
+    def __init__(self, users):
+        self.users = users
+        self.lookups = []
+
+    async def find_user_id(self, username):
+        self.lookups.append(username)
+        return self.users.get(username)
+
+    async def delete_user(self, user_id):
+        if user_id not in self.users.values():
+            raise KeycloakAdminError(404, "User not found")
+        self.users = {name: uid for name, uid in self.users.items() if uid != user_id}
+
+
+@pytest.fixture
+def keycloak(monkeypatch):
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(admin.admin_id_index, "forget_async", noop)
+    monkeypatch.setattr(admin.admin_id_index, "remember_async", noop)
+    fake = FakeAdmin({"alice": "new-alice-id"})
+    monkeypatch.setattr(admin, "keycloak_admin_async", fake)
+    return fake
+
+
+def test_delete_with_stale_token_sub_does_not_delete_new_account(keycloak):
+    # 토큰의 sub가 가리키는 계정이 사라졌고 같은 username으로 다른 사람이 가입한 경우
+    with pytest.raises(ValueError):
+        asyncio.run(
+            admin.KeycloakAdminService.delete_user_by_username_async("alice", user_id="old-alice-id")
+        )
+
+    assert keycloak.users == {"alice": "new-alice-id"}
+    assert keycloak.lookups == []
+
+
+def test_delete_with_stale_index_entry_looks_up_again(keycloak, monkeypatch):
+    async def resolve(kind, name, fetch):
+        return "old-alice-id"
+
+    monkeypatch.setattr(admin.admin_id_index, "resolve_async", resolve)
+
+    asyncio.run(admin.KeycloakAdminService.delete_user_by_username_async("alice"))
+
+    assert keycloak.users == {}
+    assert keycloak.lookups == ["alice"]
@@ -0,0 +1,38 @@
+import json
+import pytest
+from services import api_keys
+
+
+class FakeRedis:
+    def __init__(self, entries):
+        self.entries = entries
+
+    def hgetall(self, key):
+        return self.entries
+
+
+def make_entries(*names):
+    return {
+        f"{i:x}" * 64: json.dumps({"name": name, "scopes": []})
+        for i, name in enumerate(names, start=10)
+    }
+
+
+def test_revoke_lookup_needs_full_id_or_exact_name(monkeypatch):
+    entries = make_entries("billing", "reports")
+    monkeypatch.setattr(api_keys, "redis_client", FakeRedis(entries))
+    billing, reports = entries
+
+    assert api_keys.find_api_key_hash(billing[:12]) == billing
+    assert api_keys.find_api_key_hash("reports") == reports
+    assert api_keys.find_api_key_hash(billing[:1]) is None
+    assert api_keys.find_api_key_hash(billing[:11]) is None
+    assert api_keys.find_api_key_hash("bill") is None
+
+
+@pytest.mark.parametrize("name_or_id", ["", "billing"])
+def test_revoke_lookup_rejects_empty_and_ambiguous_input(monkeypatch, name_or_id):
+    monkeypatch.setattr(api_keys, "redis_client", FakeRedis(make_entries("billing", "billing")))
+
+    with pytest.raises(ValueError):
+        api_keys.find_api_key_hash(name_or_id)
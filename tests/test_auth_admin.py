@@ -0,0 +1,82 @@
+import pytest
+from redis.exceptions import RedisError
+from fastapi.testclient import TestClient
+import main
+from api import auth_admin
+from services.jwt_verification import token_verifier
+from config.fastapi import SESSION_COOKIE_NAME
+
+
+@pytest.fixture
+def client(monkeypatch):
+    deleted = []
+
+    async def delete_user(username, user_id=None):
+        deleted.append((username, user_id))
+
+    async def revoke(kind, value):
+        pass
+
+    monkeypatch.setattr(auth_admin.KeycloakAdminService, "delete_user_by_username_async", delete_user)
+    monkeypatch.setattr(auth_admin.revocation_index, "revoke", revoke)
+    client = TestClient(main.app)
+    client.deleted = deleted
+    return client
+
+
+def login_as(monkeypatch, issuer, username, sub):
+    async def payload(request, response):
+        return {"iss": issuer, "preferred_username": username, "sub": sub}
+
+    monkeypatch.setattr(token_verifier, "get_valid_token_payload", payload)
+
+
+def test_delete_rejects_token_from_other_realm(client, monkeypatch):
+    # tenant-b의 "alice"가 기본 realm의 "alice"를 삭제하지 못해야 함
+    login_as(monkeypatch, "http://keycloak.test/realms/tenant-b", "alice", "tenant-b-sub")
+
+    response = client.delete("/api/v1/auth/alice")
+
+    assert response.status_code == 403
+    assert response.json()["detail"] == "REALM_NOT_ALLOWED"
+    assert client.deleted == []
+
+
+def test_delete_own_account_in_default_realm(client, monkeypatch):
+    login_as(monkeypatch, "http://keycloak.test/realms/main", "alice", "main-sub")
+
+    response = client.delete("/api/v1/auth/alice")
+
+    assert response.status_code == 200
+    assert client.deleted == [("alice", "main-sub")]
+
+
+def test_delete_succeeds_when_revoke_fails(client, monkeypatch):
+    # 삭제가 끝난 뒤 Redis 오류로 500을 돌려주면 클라이언트가 재시도해도 복구할 수 없음
+    async def revoke(kind, value):
+        raise RedisError("connection refused")
+
+    monkeypatch.setattr(auth_admin.revocation_index, "revoke", revoke)
+    login_as(monkeypatch, "http://keycloak.test/realms/main", "alice", "main-sub")
+
+    response = client.delete("/api/v1/auth/alice")
+
+    assert response.status_code == 200
+    assert client.deleted == [("alice", "main-sub")]
+
+
+def test_delete_clears_session(client, monkeypatch):
+    dropped = []
+
+    async def delete_session(session_id):
+        dropped.append(session_id)
+
+    monkeypatch.setattr(auth_admin.session_store, "delete", delete_session)
+    login_as(monkeypatch, "http://keycloak.test/realms/main", "alice", "main-sub")
+    client.cookies.set(SESSION_COOKIE_NAME, "sid-1")
+
+    response = client.delete("/api/v1/auth/alice")
+
+    assert response.status_code == 200
+    assert dropped == ["sid-1"]
+    assert f'{SESSION_COOKIE_NAME}=""' in response.headers.get_list("set-cookie")[0]
@@ -0,0 +1,99 @@
+import base64
+import json
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from services.jwt_verification import JWT_BACKENDS, TokenValidationError
+
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+HASHES = {"RS256": hashes.SHA256, "RS384": hashes.SHA384, "RS512": hashes.SHA512}
+
+
+def b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def jwk_data(**extra) -> dict:
+    numbers = PRIVATE_KEY.public_key().public_numbers()
+    return {
+        "kty": "RSA",
+        "kid": "k1",
+        "n": b64(numbers.n.to_bytes(256, "big")),
+        "e": b64(numbers.e.to_bytes(3, "big")),
+        **extra,
+    }
+
+
+def sign(alg: str, claims: dict | None = None) -> str:
+    header = b64(json.dumps({"alg": alg, "kid": "k1"}).encode())
+    payload = b64(json.dumps(claims or {"sub": "alice"}).encode())
+    signature = PRIVATE_KEY.sign(f"{header}.{payload}".encode(), padding.PKCS1v15(), HASHES[alg]())
+    return f"{header}.{payload}.{b64(signature)}"
+
+
+@pytest.mark.parametrize("name", sorted(JWT_BACKENDS))
+def test_backends_accept_only_allowed_algorithms(name):
+    backend = JWT_BACKENDS[name](["RS256"])
+    keys = backend.load_key(jwk_data())
+
+    assert backend.verify_signature(sign("RS256"), keys) == {"sub": "alice"}
+    with pytest.raises(TokenValidationError):
+        backend.verify_signature(sign("RS512"), keys)
+
+
+@pytest.mark.parametrize("name", sorted(JWT_BACKENDS))
+def test_backends_follow_jwk_alg(name):
+    # 허용 목록에 있어도 JWK가 선언한 알고리즘이 아니면 거부
+    backend = JWT_BACKENDS[name](["RS256", "RS384"])
+    keys = backend.load_key(jwk_data(alg="RS384"))
+
+    assert backend.verify_signature(sign("RS384"), keys) == {"sub": "alice"}
+    with pytest.raises(TokenValidationError):
+        backend.verify_signature(sign("RS256"), keys)
+
+
+def malformed_tokens(claims: dict | None = None) -> list[str]:
+    header, payload, signature = sign("RS256", claims).split(".")
+    return [
+        f"{header}.é.{signature}",
+        f"{header}.{payload}.é.{signature}",
+        f"{header}.{payload}.é",
+        f"{b64(b'[1]')}.{payload}.{signature}",
+        f"{header}.{b64(b'[1]')}.{signature}",
+        "x.y.z",
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(JWT_BACKENDS))
+@pytest.mark.parametrize("token", malformed_tokens())
+def test_backends_reject_malformed_segments(name, token):
+    # ASCII가 아닌 문자나 객체가 아닌 header/payload도 500이 아닌 검증 실패로 처리
+    backend = JWT_BACKENDS[name](["RS256"])
+    keys = backend.load_key(jwk_data())
+
+    with pytest.raises(TokenValidationError):
+        backend.verify_signature(token, keys)
+
+
+def test_batch_reports_malformed_tokens_individually(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+    from services.jwt_verification import token_verifier
+
+    keys = token_verifier.backend.load_key(jwk_data())
+
+    async def get_key(kid):
+        return keys
+
+    monkeypatch.setattr(token_verifier.default_realm.jwks_cache, "get_key", get_key)
+    # issuer 확인을 통과해야 서명 검증 단계까지 도달
+    tokens = malformed_tokens({"sub": "alice", "iss": token_verifier.issuer})
+
+    response = TestClient(main.app).post(
+        "/api/v1/token/verify/batch",
+        json={"tokens": tokens, "parallel": False},
+        headers={"X-API-Key": "test-api-key"},
+    )
+
+    assert response.status_code == 200
+    assert [item["valid"] for item in response.json()["results"]] == [False] * len(tokens)
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from services import provisioning
+from services.keycloak_admin_client import KeycloakAdminError
+from schemas.provisioning import ProvisionUserRow
+
+
+class FakeAdmin:
+    def __init__(self, users):
+        self.users = users
+        self.assigned = {}
+
+    async def create_user(self, representation):
+        if representation["username"] in self.users:
+            raise KeycloakAdminError(409, "User exists with same username")
+        user_id = f"{representation['username']}-id"
+        self.users[representation["username"]] = user_id
+        return user_id
+
+    async def find_user_id(self, username):
+        return self.users.get(username)
+
+    async def update_user(self, user_id, representation):
+        pass
+
+    async def get_realm_role(self, role):
+        return {"name": role}
+
+    async def assign_realm_roles(self, user_id, roles):
+        self.assigned[user_id] = [role["name"] for role in roles]
+
+
+@pytest.fixture
+def keycloak(monkeypatch):
+    async def noop(*args):
+        pass
+
+    monkeypatch.setattr(provisioning.admin_id_index, "remember_async", noop)
+    return FakeAdmin({"bob": "bob-id"})
+
+
+def provision(keycloak, on_conflict, *usernames):
+    job = provisioning.ProvisioningJob(on_conflict=on_conflict, admin=keycloak)
+    rows = [
+        (index, ProvisionUserRow(username=name, roles=["admin"]))
+        for index, name in enumerate(usernames, start=1)
+    ]
+    return [asyncio.run(job._create_user(index, user)) for index, user in rows]
+
+
+def test_skip_does_not_grant_roles_to_existing_user(keycloak):
+    # 업로드 파일의 roles로 기존 사용자의 권한을 올릴 수 없어야 함
+    results = provision(keycloak, "skip", "alice", "bob")
+
+    assert [result["status"] for result in results] == ["created", "exists"]
+    assert keycloak.assigned == {"alice-id": ["user", "admin"]}
+
+
+def test_overwrite_grants_roles_to_existing_user(keycloak):
+    results = provision(keycloak, "overwrite", "bob")
+
+    assert results[0]["status"] == "overwritten"
+    assert keycloak.assigned == {"bob-id": ["user", "admin"]}
@@ -0,0 +1,74 @@
+import asyncio
+from services import realm_bootstrap
+
+
+class FakeAdminSession:
+    # realm마다 역할 user, 클라이언트 app, 사용자 alice가 있는 Keycloak
+    def __init__(self, *args, **kwargs):
+        self.sent = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def get(self, path, **params):
+        parts = path.strip("/").split("/")
+        realm = parts[1]
+        if len(parts) == 2:
+            return {"realm": realm, "enabled": True}
+        resource = parts[2:]
+        if resource == ["roles"]:
+            return [{"name": "user"}]
+        if resource == ["clients"]:
+            return [{"id": "app-uuid", "clientId": "app"}] if params["clientId"] == "app" else []
+        if resource == ["users"]:
+            return [{"id": "alice-id", "username": "alice", "email": "alice@example.com", "enabled": True}]
+        if resource[-1] == "role-mappings":
+            return {"realmMappings": [{"name": "user"}], "clientMappings": {}}
+        return None
+
+    async def send(self, method, path, payload=None):
+        self.sent.append((method, path, payload))
+
+
+def run_bootstrap(monkeypatch, specs, dry_run=False):
+    sessions = []
+
+    def make_session(*args, **kwargs):
+        sessions.append(FakeAdminSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(realm_bootstrap, "AdminSession", make_session)
+    results = asyncio.run(
+        realm_bootstrap.bootstrap(specs, "http://keycloak.test", "admin", "admin", dry_run=dry_run)
+    )
+    return results, sessions[0].sent
+
+
+def test_existing_user_with_mixed_case_username_is_unchanged(monkeypatch):
+    spec = {
+        "realm": "main",
+        "users": [{"username": "Alice", "email": "Alice@Example.com", "realmRoles": ["user"]}],
+    }
+
+    results, _ = run_bootstrap(monkeypatch, [spec], dry_run=True)
+
+    assert results == [{"realm": "main", "created": False, "changes": []}]
+
+
+def test_missing_client_or_role_fails_only_that_realm(monkeypatch):
+    specs = [
+        {"realm": "no-client", "users": [{"username": "alice", "clientRoles": {"ghost": ["admin"]}}]},
+        {"realm": "no-role", "users": [{"username": "alice", "clientRoles": {"app": ["ghost"]}}]},
+        {"realm": "ok", "users": [{"username": "alice", "enabled": False}]},
+    ]
+
+    results, sent = run_bootstrap(monkeypatch, specs)
+
+    assert [result["realm"] for result in results] == ["no-client", "no-role", "ok"]
+    assert "ghost" in results[0]["error"]
+    assert "ghost" in results[1]["error"]
+    assert "error" not in results[2]
+    assert sent == [("PUT", "/realms/ok/users/alice-id", {"enabled": False})]
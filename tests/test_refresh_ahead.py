@@ -0,0 +1,105 @@
+import asyncio
+import time
+import pytest
+from jose import jwt
+from redis.exceptions import RedisError
+from services import refresh_ahead as refresh_ahead_module
+from services.refresh_ahead import RefreshAhead
+
+
+class FakeRedis:
+    def __init__(self, fail_writes=0):
+        self.values = {}
+        self.ttls = {}
+        self.fail_writes = fail_writes
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, ex=None, keepttl=False):
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise RedisError("connection reset")
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        if not keepttl:
+            self.ttls[key] = ex
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def refresh_token(lifetime: int) -> str:
+    return jwt.encode({"exp": int(time.time()) + lifetime, "sid": "s1"}, "secret", algorithm="HS256")
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def refresh(calls):
+    async def refresh(token):
+        calls.append(token)
+        return {"access_token": "new-access", "refresh_token": "new-refresh"}
+
+    return refresh
+
+
+def test_does_not_rotate_when_redis_is_unavailable(monkeypatch, calls, refresh):
+    # 결과를 저장할 수 없으면 회전하지 않아야 클라이언트의 refresh token이 계속 유효
+    monkeypatch.setattr(refresh_ahead_module, "async_redis", FakeRedis(fail_writes=1))
+    token = refresh_token(1800)
+
+    asyncio.run(RefreshAhead()._refresh(token, refresh))
+
+    assert calls == []
+
+
+def test_keeps_pending_tokens_until_old_refresh_token_expires(monkeypatch, calls, refresh):
+    redis = FakeRedis()
+    monkeypatch.setattr(refresh_ahead_module, "async_redis", redis)
+    ahead = RefreshAhead(pending_ttl=120)
+    token = refresh_token(1800)
+
+    asyncio.run(ahead._refresh(token, refresh))
+
+    assert calls == [token]
+    assert 1790 <= redis.ttls[ahead._key(token)] <= 1800
+    assert asyncio.run(ahead.get_pending(token))["refresh_token"] == "new-refresh"
+
+
+def test_concurrent_refresh_is_claimed_once(monkeypatch, calls, refresh):
+    monkeypatch.setattr(refresh_ahead_module, "async_redis", FakeRedis())
+    ahead = RefreshAhead()
+    token = refresh_token(1800)
+
+    async def both():
+        await asyncio.gather(ahead._refresh(token, refresh), ahead._refresh(token, refresh))
+
+    asyncio.run(both())
+
+    assert calls == [token]
+
+
+def test_expired_request_waits_for_running_refresh(monkeypatch):
+    # 회전 중인 refresh token으로 다시 갱신하지 않고 진행 중인 결과를 기다림
+    redis = FakeRedis()
+    monkeypatch.setattr(refresh_ahead_module, "async_redis", redis)
+    ahead = RefreshAhead()
+    token = refresh_token(1800)
+    redis.values[ahead._key(token)] = refresh_ahead_module.IN_PROGRESS
+
+    async def finish_later():
+        await asyncio.sleep(0.1)
+        redis.values[ahead._key(token)] = '{"refresh_token": "new-refresh"}'
+
+    async def run():
+        pending, _ = await asyncio.gather(ahead.get_pending(token, wait=True), finish_later())
+        return pending
+
+    assert asyncio.run(run()) == {"refresh_token": "new-refresh"}
+    assert asyncio.run(ahead.get_pending(token)) == {"refresh_token": "new-refresh"}
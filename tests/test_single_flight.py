@@ -0,0 +1,42 @@
+import asyncio
+from redis.exceptions import RedisError
+from services import single_flight
+
+
+class FailingStoreRedis:
+    # 락은 잡히지만 결과 저장과 락 해제는 실패하는 Redis
+    def __init__(self):
+        self.values = {}
+
+    def register_script(self, script):
+        async def release(keys, args):
+            raise RedisError("connection reset")
+
+        return release
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, nx=False, px=None):
+        if not nx:
+            raise RedisError("connection reset")
+        if key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+def test_refresh_runs_once_when_result_store_fails(monkeypatch):
+    monkeypatch.setattr(single_flight, "async_redis", FailingStoreRedis())
+    flight = single_flight.SingleFlight("refresh", grace=10, use_redis=True)
+    calls = []
+
+    async def refresh():
+        calls.append(1)
+        return {"access_token": "new"}
+
+    result = asyncio.run(flight.do("refresh-token", refresh))
+
+    # 이미 Keycloak에서 교체된 refresh token을 다시 보내면 재사용 탐지로 세션이 끊김
+    assert result == {"access_token": "new"}
+    assert calls == [1]